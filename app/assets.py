@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+
+from app.encoding import compress_variants
+
+logger = logging.getLogger(__name__)
+
+ASSETS_PREFIX = "/assets/"
+# Content-hashed URLs never change meaning, so browsers may keep them for a year
+IMMUTABLE = "public, max-age=31536000, immutable"
+# References to rewrite in index.html, e.g. href="/static/styles.css"
+STATIC_REFERENCE = re.compile(r"""(?P<attr>\b(?:href|src)=["'])/static/(?P<name>[^"'?#]+)""")
+BOOTSTRAP_ID = "flavors-bootstrap"
+
+
+class Asset:
+    """A file held in memory with its precompressed variants"""
+
+    def __init__(self, body, media_type):
+        self.media_type = media_type
+        self.variants = compress_variants(body)
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+class AssetPipeline:
+    """Fingerprints the files in ``static_dir`` and renders index.html to point at them.
+
+    Every file other than index.html is served as ``/assets/<name>.<hash><ext>``. The pipeline
+    is built once, on first use or at startup; restart the app to pick up changed files.
+    """
+
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self._assets = None
+        self._urls = {}
+        self._index = None
+        self._rendered = (None, None)
+        self._lock = threading.Lock()
+
+    def build(self):
+        with self._lock:
+            if self._assets is not None:
+                return
+            assets = {}
+            urls = {}
+            index = None
+            if os.path.isdir(self.static_dir):
+                for name in sorted(os.listdir(self.static_dir)):
+                    path = os.path.join(self.static_dir, name)
+                    if not os.path.isfile(path):
+                        continue
+                    with open(path, "rb") as f:
+                        body = f.read()
+                    if name == "index.html":
+                        index = body
+                        continue
+                    hashed = _hashed_name(name, body)
+                    assets[hashed] = Asset(body, _media_type(name))
+                    urls[name] = ASSETS_PREFIX + hashed
+            if index is not None:
+                index = Asset(
+                    _rewrite_references(index.decode("utf-8"), urls).encode(),
+                    "text/html; charset=utf-8",
+                )
+            self._urls = urls
+            self._index = index
+            self._assets = assets
+            logger.info(f"Built {len(assets)} fingerprinted static asset(s)")
+
+    def get(self, hashed_name):
+        """The fingerprinted asset, or None"""
+        self.build()
+        return self._assets.get(hashed_name)
+
+    def index(self):
+        """index.html with its static references rewritten, or None if there isn't one"""
+        self.build()
+        return self._index
+
+    def index_for(self, snapshot):
+        """index.html with today's flavors embedded, rendered once per snapshot.
+
+        The snapshot's JSON goes into an inline ``application/json`` script that script.js reads
+        on load, so the first paint needs no request to /api/flavors. Its ``data-etag`` lets the
+        page tell whether a snapshot event is news.
+        """
+        index = self.index()
+        if index is None or snapshot is None:
+            return index
+        rendition = snapshot.rendition()
+        key, rendered = self._rendered
+        if key != rendition["etag"]:
+            html = index.variants["identity"]
+            # "<" is escaped so the data can't close the script tag early
+            data = rendition["identity"].replace(b"<", b"\\u003c")
+            bootstrap = (
+                f'<script id="{BOOTSTRAP_ID}" type="application/json" '
+                f"data-etag='{rendition['etag']}'>".encode() + data + b"</script>\n"
+            )
+            position = html.rfind(b"</body>")
+            position = len(html) if position == -1 else position
+            rendered = Asset(html[:position] + bootstrap + html[position:], index.media_type)
+            self._rendered = (rendition["etag"], rendered)
+        return rendered
+
+    def url_for(self, name):
+        """Fingerprinted URL for a file in ``static_dir``"""
+        self.build()
+        return self._urls.get(name, f"/static/{name}")
+
+
+def _hashed_name(name, body):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:10]}{ext}"
+
+
+def _media_type(name):
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type in ("application/javascript", "image/svg+xml"):
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _rewrite_references(html, urls):
+    def replace(match):
+        url = urls.get(match.group("name"))
+        return match.group("attr") + url if url else match.group(0)
+
+    return STATIC_REFERENCE.sub(replace, html)
@@ -0,0 +1,53 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # Optional; responses fall back to gzip
+    brotli = None
+
+# Appended to a resource's ETag for each encoding it is served in
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+def compress_variants(body):
+    """``body`` under ``"identity"`` plus its ``"gzip"`` and (if installed) ``"br"`` encodings"""
+    variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def choose_encoding(accept_encoding, available):
+    """Best pre-compressed body the client accepts: brotli, then gzip, then identity"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    for encoding in ("br", "gzip"):
+        quality = accepted.get(encoding, accepted.get("*", 0))
+        if encoding in available and quality > 0:
+            return encoding
+    return "identity"
+
+
+def encoded_etag(etag, encoding):
+    """Strong ``etag`` of one encoding of a resource, e.g. ``"v1-abc-gz"`` for its gzip bytes.
+
+    Each encoding is a different byte sequence, so strong validators must differ between them.
+    """
+    return f'{etag[:-1]}{ETAG_SUFFIXES[encoding]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison, as If-None-Match requires; the tag of any encoding of ``etag`` matches"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or any(encoded_etag(etag, encoding) in tags for encoding in ETAG_SUFFIXES)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+
+KEEPALIVE_INTERVAL = 15  # Seconds between comments that keep proxies from closing the stream
+# Streams end after this long and EventSource reconnects, so no connection lives forever. It
+# does not bound shutdown: uvicorn waits for open streams until --timeout-graceful-shutdown
+# (set in the Dockerfile) runs out and then cancels them.
+MAX_STREAM_SECONDS = 15 * 60
+RETRY_MS = 10_000  # Reconnect delay suggested to clients
+
+
+class SnapshotBroadcaster:
+    """Fans snapshot notifications out to Server-Sent Event subscribers.
+
+    ``publish`` is a SnapshotStore listener and runs on whichever thread published; events are
+    handed to each subscriber's event loop with ``call_soon_threadsafe``. A subscriber only
+    needs the latest snapshot, so an unread event is replaced rather than queued behind.
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Register a queue on the running loop that receives snapshot events"""
+        queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = {(loop, q) for loop, q in self._subscribers if q is not queue}
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, snapshot):
+        event = snapshot_event(snapshot)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:  # Loop already closed
+                self.unsubscribe(queue)
+
+
+def _offer(queue, event):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+def snapshot_event(snapshot):
+    """The small payload clients compare against what they are showing"""
+    return {"version": snapshot.version, "date": snapshot.date, "etag": snapshot.etag()}
+
+
+def format_event(event):
+    return f"event: snapshot\nid: {event['version']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def snapshot_events(request, store, broadcaster, max_seconds=None):
+    """SSE stream: the current snapshot first, then one event per newly published snapshot"""
+    queue = broadcaster.subscribe()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (MAX_STREAM_SECONDS if max_seconds is None else max_seconds)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        snapshot = store.current()
+        if snapshot is not None:
+            yield format_event(snapshot_event(snapshot))
+        while loop.time() < deadline:
+            if await request.is_disconnected():
+                break
+            timeout = min(KEEPALIVE_INTERVAL, max(0, deadline - loop.time()))
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        broadcaster.unsubscribe(queue)
@@ -1,20 +1,61 @@
 # main.py
 
+import asyncio
+import datetime
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import partial
 
 import yaml
 from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, FastAPI, Query, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
-from app.scrapers.bubbas import scrape_bubbas
-from app.scrapers.culvers import scrape_culvers
-from app.scrapers.kopps import scrape_kopps
-from app.scrapers.murfs import scrape_murfs
+from app.assets import ASSETS_PREFIX, IMMUTABLE, AssetPipeline
+from app.encoding import choose_encoding, encoded_etag, etag_matches
+from app.events import SnapshotBroadcaster, snapshot_events
+from app.metrics import API_CACHE_REQUESTS, CONTENT_TYPE, observe_snapshot, registry
+from app.persistence import DEFAULT_HISTORY_LIMIT, FlavorDatabase
+from app.refresh import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REFRESH_BUDGET,
+    DEFAULT_SCRAPER_TIMEOUT,
+    run_scrapers,
+)
+from app.scrapers.async_utils import close_async_client, set_event_loop
+from app.scrapers.browser import browser_pool, undetected_browser_pool
+from app.scrapers.bubbas import scrape_bubbas_async
+from app.scrapers.culvers import configure_culvers, scrape_culvers
+from app.scrapers.kopps import scrape_kopps_async
+from app.scrapers.murfs import scrape_murfs_async
 from app.scrapers.oscars import scrape_oscars
+from app.scrapers.utils import configure_scraping, get_central_date_string
+from app.snapshot import SnapshotStore
+from app.sources import DEFAULT_SCHEDULE, SourceCache, load_policies, next_central_midnight
+from app.tracing import configure_tracing, span, tracer
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+# Single-request scrapers run as coroutines; Culver's and Oscar's use worker threads
+SCRAPERS = [
+    ("culvers", scrape_culvers),
+    ("kopps", scrape_kopps_async),
+    ("murfs", scrape_murfs_async),
+    ("oscars", scrape_oscars),
+    ("bubbas", scrape_bubbas_async),
+]
+
+ISO_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+REFRESH_JOB_ID = "cache_refresh"
+DEFAULT_CHECK_INTERVAL = 60  # Seconds between checks for sources due a scrape
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
 
 
 def load_config():
@@ -29,97 +70,349 @@ def load_config():
     return {}
 
 
-# FastAPI app
-app = FastAPI(title="Daily Flavors API", description="Get daily custard flavors from shops")
+def configure_logging(config):
+    log_level = getattr(logging, config.get("logging", {}).get("root", "INFO").upper())
+    logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s", level=log_level)
+    loggers = config.get("logging", {}).get("loggers", {})
+    for logger_name, logger_level in loggers.items():
+        logging.getLogger(logger_name).setLevel(
+            getattr(logging, logger_level.upper(), logging.INFO)
+        )
 
-# Configure static file serving
-static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
-if os.path.exists(static_dir):
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# Configure logging
-config = load_config()
-log_level = getattr(logging, config.get("logging", {}).get("root", "INFO").upper())
-logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s", level=log_level)
-loggers = config.get("logging", {}).get("loggers", {})
-for logger_name, logger_level in loggers.items():
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(getattr(logging, logger_level.upper(), logging.INFO))
-logger = logging.getLogger(__name__)
-
-
-@app.get("/")
+@router.get("/")
 async def root():
     """Redirect to web UI for easier access"""
-    from fastapi.responses import RedirectResponse
-
     return RedirectResponse(url="/ui")
 
 
-@app.get("/ui")
-async def web_ui():
-    """Serve the web UI"""
-    static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
-    index_file = os.path.join(static_dir, "index.html")
-    if os.path.exists(index_file):
-        return FileResponse(index_file, media_type="text/html")
-    else:
+@router.get("/ui")
+async def web_ui(request: Request):
+    """Serve the web UI with fingerprinted asset URLs and today's flavors embedded"""
+    # Normally rendered when the snapshot was published; compressing it here would block the loop
+    index = await run_in_threadpool(
+        request.app.state.assets.index_for, request.app.state.flavors_store.current()
+    )
+    if index is None:
+        index_file = os.path.join(STATIC_DIR, "index.html")
         return {"message": f"Web UI not found. Looking for: {index_file}"}
+    headers = {"ETag": index.etag, "Cache-Control": "no-cache"}
+    return _encoded_response(request, index.variants, index.media_type, headers)
+
 
+@router.get(ASSETS_PREFIX + "{name}")
+async def static_asset(request: Request, name: str):
+    """Fingerprinted static files; their URLs change whenever their content does"""
+    asset = request.app.state.assets.get(name)
+    if asset is None:
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+    headers = {"ETag": asset.etag, "Cache-Control": IMMUTABLE}
+    return _encoded_response(request, asset.variants, asset.media_type, headers)
 
-# Daily cache for flavors
-flavors_cache = {"date": None, "data": None}  # YYYY-MM-DD string
 
+@router.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "ok"}
 
-@app.get("/api/flavors")
-async def get_flavors():
-    """API endpoint for flavors (alternative to root) with daily cache"""
-    today = datetime.now().strftime("%Y-%m-%d")
-    if flavors_cache["date"] == today and flavors_cache["data"] is not None:
-        return flavors_cache["data"]
-    # Refresh cache
-    data = scrape_all()
-    flavors_cache["date"] = today
-    flavors_cache["data"] = data
-    return data
 
+@router.get("/readyz")
+async def readyz(request: Request):
+    """Readiness probe: ready once a first flavor snapshot has been published"""
+    snapshot = request.app.state.flavors_store.current()
+    if snapshot is None:
+        return JSONResponse({"status": "warming up"}, status_code=503)
+    return {"status": "ready", "date": snapshot.date, "version": snapshot.version}
 
-def scrape_all():
-    flavors = []
-    scrapers = [scrape_culvers, scrape_kopps, scrape_murfs, scrape_oscars, scrape_bubbas]
-    for scraper in scrapers:
-        _safe_add_flavors(flavors, scraper)
-    return flavors
 
+@router.get("/metrics")
+async def metrics(request: Request):
+    """Prometheus metrics for scrapers, upstream fetches and the flavor cache"""
+    observe_snapshot(request.app.state.flavors_store.current(), time.time())
+    return Response(registry.render(), media_type=CONTENT_TYPE)
 
-def _safe_add_flavors(flavors, scraper_fn):
-    """Safely execute a scraper function and add results to flavors list"""
+
+@router.get("/api/flavors")
+async def get_flavors(
+    request: Request,
+    date: str | None = Query(
+        None, pattern=ISO_DATE_PATTERN, description="Day to show (YYYY-MM-DD)"
+    ),
+):
+    """API endpoint for flavors (alternative to root) with daily cache.
+
+    Always answers from the current snapshot; a stale or missing snapshot triggers a single
+    background refresh instead of scraping inside the request. ``date`` selects another day
+    from sources that publish a calendar (Culver's); past days come from the history store.
+    """
+    if not _is_valid_date(date):
+        return _invalid_date(date)
+    store = request.app.state.flavors_store
+    snapshot = store.current()
+    if snapshot is None or snapshot.date != get_central_date_string():
+        API_CACHE_REQUESTS.labels("miss" if snapshot is None else "stale").inc()
+        store.refresh_in_background(request.app.state.refresh)
+    else:
+        API_CACHE_REQUESTS.labels("hit").inc()
+    if snapshot is None:
+        return []
+    database = request.app.state.database
+    if date and date < snapshot.date and database is not None:
+        history = await run_in_threadpool(database.query_history, date, date)
+        return _merge_past(history, snapshot.flavors_for(date))
+    rendition = snapshot.rendition(date)
+    headers = {"ETag": rendition["etag"], "Cache-Control": _cache_control(request.app, snapshot)}
+    return _encoded_response(request, rendition, "application/json", headers)
+
+
+def _is_valid_date(value):
+    """Whether ``value`` (already matching ISO_DATE_PATTERN) is a real day; None is valid"""
     try:
-        flavors.extend(scraper_fn())
-    except Exception as err:
-        logger.error(f"Scraping error in {scraper_fn.__name__}", exc_info=err)
+        return value is None or bool(datetime.date.fromisoformat(value))
+    except ValueError:
+        return False
+
+
+def _invalid_date(value):
+    return JSONResponse({"detail": f"Invalid date {value!r}, expected YYYY-MM-DD"}, 422)
+
+
+def _merge_past(history, calendar):
+    """History for a past day, plus calendar entries for locations history has nothing on"""
+    recorded = {flavor["location"] for flavor in history}
+    return history + [flavor for flavor in calendar if flavor.get("location") not in recorded]
+
 
+def _encoded_response(request, variants, media_type, headers):
+    """Answer with 304 on an ETag match, otherwise the best precompressed variant.
 
-def refresh_flavors_cache():
-    today = datetime.now().strftime("%Y-%m-%d")
-    logger.info(f"Refreshing flavors cache for {today}")
-    data = scrape_all()
-    flavors_cache["date"] = today
-    flavors_cache["data"] = data
+    ``headers["ETag"]`` is the resource's tag; each encoding is sent with its own variant of it.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding"), variants)
+    etag = headers["ETag"]
+    headers = {**headers, "ETag": encoded_etag(etag, encoding), "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(variants[encoding], media_type=media_type, headers=headers)
 
 
-# Preload cache on startup
-refresh_flavors_cache()
+def _cache_control(app, snapshot):
+    """Let clients cache the current snapshot until the next source is due or the day ends"""
+    job = getattr(app.state, "refresh_job", None)
+    now = time.time()
+    next_due = app.state.sources.next_due(now)
+    if (
+        job is None
+        or next_due is None
+        or snapshot.date != get_central_date_string()
+        or app.state.flavors_store.is_refreshing()
+    ):
+        return "no-cache"
+    expires = min(next_due, next_central_midnight(now))
+    return f"public, max-age={max(0, int(expires - now))}"
 
 
-# Schedule daily cache refresh at configured time
-def schedule_cache_refresh():
-    refresh_time = config.get("cache_refresh_time", "08:00")
-    hour, minute = map(int, refresh_time.split(":"))
+@router.get("/api/flavors/events")
+async def flavor_events(request: Request):
+    """Server-Sent Events: one small event per published snapshot, so the UI needn't poll"""
+    state = request.app.state
+    return StreamingResponse(
+        snapshot_events(request, state.flavors_store, state.events),
+        media_type="text/event-stream",
+        # Proxies such as nginx would otherwise hold events back in their buffers
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/api/flavors/history")
+def get_flavor_history(
+    request: Request,
+    start: str | None = Query(None, pattern=ISO_DATE_PATTERN, description="First date (inclusive)"),
+    end: str | None = Query(None, pattern=ISO_DATE_PATTERN, description="Last date (inclusive)"),
+    location: str | None = Query(None, description="Exact location name, e.g. 'Kopps'"),
+    flavor: str | None = Query(None, description="Exact flavor name (case-insensitive)"),
+    limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=5000),
+):
+    """Past flavors from the history store, newest first"""
+    for value in (start, end):
+        if not _is_valid_date(value):
+            return _invalid_date(value)
+    database = request.app.state.database
+    if database is None:
+        return JSONResponse({"detail": "Flavor history requires storage to be configured"}, 503)
+    return database.query_history(start, end, location, flavor, limit)
+
+
+def scrape_all(config, on_late_result=None, scrapers=None):
+    """Run scrapers (default: all) concurrently; return {source: flavors} for those in budget"""
+    refresh_config = config.get("refresh", {})
+    scrapers = SCRAPERS if scrapers is None else scrapers
+    with span("scrape_all", date=get_central_date_string(), scrapers=len(scrapers)):
+        return run_scrapers(
+            scrapers,
+            max_workers=refresh_config.get("max_workers", DEFAULT_MAX_WORKERS),
+            scraper_timeout=refresh_config.get("scraper_timeout", DEFAULT_SCRAPER_TIMEOUT),
+            refresh_budget=refresh_config.get("budget", DEFAULT_REFRESH_BUDGET),
+            on_late_result=on_late_result,
+        )
+
+
+def refresh_flavors_cache(store, sources, config):
+    """Scrape only the sources that are stale or due a retry, then publish the merged snapshot"""
+    today = get_central_date_string()
+    due = sources.due(today)
+    snapshot = store.current()
+    if not due:
+        if snapshot is None or snapshot.date != today:
+            sources.publish(store, today)
+        return
+    logger.info(f"Refreshing {', '.join(due)} for {today}")
+    scrapers = [(name, fn) for name, fn in SCRAPERS if name in due]
+    results = scrape_all(
+        config, on_late_result=partial(_add_late_flavors, store, sources), scrapers=scrapers
+    )
+    for name, _ in scrapers:
+        if results.get(name):
+            sources.record_success(name, results[name], today)
+        else:
+            # Empty, failed, or still running past the budget (a late result is recorded then)
+            sources.record_failure(name)
+    sources.publish(store, today)
+
+
+def warm_flavors_cache(store, sources, database, config):
+    """Serve saved flavors right away; scrape only the sources that are missing or stale"""
+    today = get_central_date_string()
+    if database is not None:
+        for name, (date, flavors, updated_at) in database.load_latest_sources().items():
+            sources.restore(name, flavors, date, updated_at)
+        if sources.sources_for(today):
+            sources.publish(store, today)
+            due = sources.due(today)
+            if not due:
+                logger.info(f"Loaded flavors for {today} from disk, skipping scrape")
+                return
+            logger.info(f"Loaded flavors for {today} from disk, still due: {due}")
+    refresh_flavors_cache(store, sources, config)
+
+
+def refresh_due_sources(store, sources, refresh_fn):
+    """Refresh when a source is due or the snapshot is from an earlier day; otherwise do nothing"""
+    snapshot = store.current()
+    today = get_central_date_string()
+    if sources.due(today) or snapshot is None or snapshot.date != today:
+        store.refresh(refresh_fn)
+
+
+def _add_late_flavors(store, sources, name, flavors):
+    """Fill in the snapshot with results from a scraper that missed the refresh budget"""
+    if not flavors:
+        return
+    today = get_central_date_string()
+    sources.record_success(name, flavors, today)
+    sources.publish(store, today)
+    logger.info(f"Added {len(flavors)} late flavor(s) from {name} to cache")
+
+
+# Check for sources due a scrape (TTL, schedule or retry) at a fixed interval
+def schedule_cache_refresh(store, sources, refresh_fn, config):
+    interval = config.get("refresh", {}).get("check_interval", DEFAULT_CHECK_INTERVAL)
     scheduler = BackgroundScheduler()
-    scheduler.add_job(refresh_flavors_cache, "cron", hour=hour, minute=minute)
+    scheduler.add_job(
+        refresh_due_sources,
+        "interval",
+        args=[store, sources, refresh_fn],
+        seconds=interval,
+        id=REFRESH_JOB_ID,
+    )
     scheduler.start()
-    logger.info(f"Scheduled daily cache refresh at {refresh_time}")
+    logger.info(f"Checking for stale sources every {interval}s")
+    return scheduler
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start cache warmup in the background and own the refresh scheduler"""
+    state = app.state
+    # Coroutine scrapers share the server's event loop
+    set_event_loop(asyncio.get_running_loop())
+    state.flavors_store.refresh_in_background(state.warmup)
+    await run_in_threadpool(state.assets.build)
+    if state.config.get("scraping", {}).get("browser_pool", {}).get("prewarm"):
+        # Launch Chrome before the first Selenium scrape needs it
+        threading.Thread(target=browser_pool.warm, name="browser-warm", daemon=True).start()
+    scheduler = schedule_cache_refresh(
+        state.flavors_store, state.sources, state.refresh, state.config
+    )
+    state.refresh_job = scheduler.get_job(REFRESH_JOB_ID)
+    try:
+        yield
+    finally:
+        state.refresh_job = None
+        scheduler.shutdown(wait=False)
+        set_event_loop(None)
+        await close_async_client()
+        browser_pool.close()
+        undetected_browser_pool.close()
+        if state.database is not None:
+            state.database.close()
+        tracer.shutdown()
+
+
+def create_app(config=None):
+    """Build the FastAPI app; nothing is scraped or scheduled until it starts up"""
+    config = load_config() if config is None else config
+    configure_logging(config)
+    configure_scraping(
+        config.get("scraping", {}),
+        config.get("refresh", {}).get("scraper_timeout", DEFAULT_SCRAPER_TIMEOUT),
+    )
+    configure_culvers(config.get("scraping", {}).get("culvers", {}))
+    configure_tracing(config.get("tracing", {}))
+
+    app = FastAPI(
+        title="Daily Flavors API",
+        description="Get daily custard flavors from shops",
+        lifespan=lifespan,
+    )
+    store = SnapshotStore()
+    # Render /ui with each new snapshot on the publishing thread, ahead of the first request
+    store.add_listener(lambda snapshot: app.state.assets.index_for(snapshot))
+    events = SnapshotBroadcaster()
+    store.add_listener(events.publish)
+    policies = load_policies(
+        [name for name, _ in SCRAPERS],
+        config.get("sources"),
+        config.get("cache_refresh_time", DEFAULT_SCHEDULE),
+    )
+    sources = SourceCache(policies)
+    storage_path = config.get("storage", {}).get("path")
+    database = FlavorDatabase(storage_path) if storage_path else None
+    if database is not None:
+        # Each source is saved with its own fetch time, so restarts know what is still fresh
+        sources.add_listener(
+            lambda name, entry: database.save_snapshot(
+                entry.date, {name: entry.flavors}, entry.fetched_at
+            )
+        )
+        store.add_listener(lambda snapshot: database.save_history(snapshot.date, snapshot.sources))
+    app.state.config = config
+    app.state.assets = AssetPipeline(STATIC_DIR)
+    app.state.flavors_store = store
+    app.state.sources = sources
+    app.state.events = events
+    app.state.database = database
+    app.state.refresh = partial(refresh_flavors_cache, store, sources, config)
+    app.state.warmup = partial(warm_flavors_cache, store, sources, database, config)
+    app.state.refresh_job = None  # Set while the scheduler runs; drives Cache-Control
+
+    # Configure static file serving
+    if os.path.exists(STATIC_DIR):
+        app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+    app.include_router(router)
+    return app
 
 
-schedule_cache_refresh()
+app = create_app()
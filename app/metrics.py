@@ -0,0 +1,241 @@
+import bisect
+import math
+import re
+import threading
+from urllib.parse import urlparse
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Next.js data routes embed the site's build ID, which changes on every deploy
+NEXT_DATA_BUILD_ID = re.compile(r"/_next/data/[^/]+/")
+# Seconds; upstream fetches and scrapes range from tens of milliseconds to minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Registry:
+    """Metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class _Metric:
+    """A named metric with one child per combination of label values.
+
+    Children are created on first use and kept for the life of the process, so label values
+    must come from a small, fixed set (scraper names, configured URLs, status codes).
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=registry):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def labels(self, *values):
+        """The child for these label values, in ``labelnames`` order"""
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self):
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            yield from child.samples(self.name, dict(zip(self.labelnames, values)))
+
+    def _new_child(self):
+        raise NotImplementedError
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        yield f"{name}{_format_labels(labels)} {_format_value(self.value)}"
+
+
+class _GaugeValue(_Value):
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self, name, labels):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            bucket_labels = {**labels, "le": _format_value(bound)}
+            yield f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+        yield f"{name}_sum{_format_labels(labels)} {_format_value(total)}"
+        yield f"{name}_count{_format_labels(labels)} {cumulative}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _new_child(self):
+        return _Value()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def _new_child(self):
+        return _GaugeValue()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=registry
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+SCRAPER_SECONDS = Histogram(
+    "flavors_scraper_duration_seconds",
+    "Time each scraper took, by outcome (ok or error)",
+    ("scraper", "outcome"),
+)
+SCRAPER_FLAVORS = Gauge(
+    "flavors_scraper_flavors",
+    "Flavors returned by each scraper's last successful run",
+    ("scraper",),
+)
+FETCH_ATTEMPTS = Counter(
+    "flavors_fetch_attempts_total",
+    "Upstream GET attempts by URL and status (error when no response arrived)",
+    ("url", "status"),
+)
+FETCH_SECONDS = Histogram(
+    "flavors_fetch_duration_seconds", "Latency of each upstream GET attempt", ("url",)
+)
+FETCH_FORBIDDEN = Counter(
+    "flavors_fetch_forbidden_total", "Upstream GETs answered with 403 Forbidden", ("host",)
+)
+SELENIUM_FALLBACKS = Counter(
+    "flavors_selenium_fallbacks_total",
+    "Pages fetched with Selenium after every plain request failed",
+    ("url",),
+)
+BROWSER_LAUNCH_SECONDS = Histogram(
+    "flavors_browser_launch_seconds",
+    "Time to start a Chrome WebDriver",
+    ("browser",),
+    buckets=(0.5, 1, 2, 3, 5, 10, 20, 30, 60),
+)
+API_CACHE_REQUESTS = Counter(
+    "flavors_api_cache_requests_total",
+    "/api/flavors reads by snapshot state: hit (today's), stale (an earlier day's) or miss (none)",
+    ("result",),
+)
+SNAPSHOT_AGE = Gauge(
+    "flavors_snapshot_age_seconds", "Seconds since the current snapshot was published"
+)
+SNAPSHOT_VERSION = Gauge("flavors_snapshot_version", "Version of the current snapshot")
+
+
+def url_label(url):
+    """``url`` as a metric label: no query string and no build ID, so labels stay bounded"""
+    return NEXT_DATA_BUILD_ID.sub("/_next/data/*/", url.split("?", 1)[0])
+
+
+def observe_fetch(url, status, seconds):
+    """Record one upstream request attempt; ``status`` is None when no response arrived"""
+    url = url_label(url)
+    FETCH_ATTEMPTS.labels(url, "error" if status is None else status).inc()
+    FETCH_SECONDS.labels(url).observe(seconds)
+    if status == 403:
+        FETCH_FORBIDDEN.labels(urlparse(url).netloc).inc()
+
+
+def observe_snapshot(snapshot, now):
+    if snapshot is not None:
+        SNAPSHOT_AGE.set(max(0.0, now - snapshot.published_at))
+        SNAPSHOT_VERSION.set(snapshot.version)
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.snapshot import ISO_DATE
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot_sources (
+    date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    flavors TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (date, source)
+);
+CREATE TABLE IF NOT EXISTS flavor_history (
+    date TEXT NOT NULL,
+    location TEXT NOT NULL COLLATE NOCASE,
+    flavor TEXT NOT NULL COLLATE NOCASE,
+    description TEXT NOT NULL DEFAULT '',
+    url TEXT,
+    source TEXT NOT NULL,
+    PRIMARY KEY (date, location, flavor)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_history_location_date ON flavor_history (location, date);
+CREATE INDEX IF NOT EXISTS idx_history_flavor_date ON flavor_history (flavor, date);
+"""
+
+DEFAULT_HISTORY_LIMIT = 500
+
+
+class FlavorDatabase:
+    """SQLite storage for flavor snapshots, keyed by Central date and source.
+
+    The connection is opened lazily so constructing the object has no side effects.
+    """
+
+    def __init__(self, path):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened flavor database at {self.path}")
+        return self._conn
+
+    def load_snapshot(self, date):
+        """Return {source: flavors} saved for ``date`` (empty if nothing was saved)"""
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT source, flavors FROM snapshot_sources WHERE date = ? ORDER BY rowid",
+                    (date,),
+                )
+                .fetchall()
+            )
+        return {source: json.loads(flavors) for source, flavors in rows}
+
+    def load_latest_sources(self):
+        """Return {source: (date, flavors, updated_at)} for each source's most recent save"""
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT source, date, flavors, updated_at FROM snapshot_sources AS s "
+                    "WHERE updated_at = "
+                    "(SELECT MAX(updated_at) FROM snapshot_sources WHERE source = s.source) "
+                    "ORDER BY rowid"
+                )
+                .fetchall()
+            )
+        return {
+            source: (date, json.loads(flavors), updated) for source, date, flavors, updated in rows
+        }
+
+    def save_snapshot(self, date, sources, updated_at=None):
+        """Store every source of a snapshot in one transaction.
+
+        ``updated_at`` is when the flavors were fetched (default: now).
+        """
+        now = time.time() if updated_at is None else updated_at
+        rows = [(date, name, json.dumps(list(flavors)), now) for name, flavors in sources.items()]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO snapshot_sources (date, source, flavors, updated_at) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (date, source) DO UPDATE SET "
+                    "flavors = excluded.flavors, updated_at = excluded.updated_at",
+                    rows,
+                )
+
+    def save_history(self, date, sources):
+        """Record the flavors of a snapshot served up to its date in the history table.
+
+        Flavors are keyed by their own date when the scraper reported an ISO date, otherwise
+        by the snapshot's date. Calendar entries after the snapshot's date are only plans that
+        may still change, so they are left out.
+        """
+        rows = []
+        for name, flavors in sources.items():
+            for flavor in flavors:
+                if not flavor.get("location") or not flavor.get("flavor"):
+                    continue
+                flavor_date = flavor.get("date")
+                if not (isinstance(flavor_date, str) and ISO_DATE.match(flavor_date)):
+                    flavor_date = date
+                if flavor_date > date:
+                    continue
+                rows.append(
+                    (
+                        flavor_date,
+                        flavor["location"],
+                        flavor["flavor"],
+                        flavor.get("description") or "",
+                        flavor.get("url"),
+                        name,
+                    )
+                )
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO flavor_history (date, location, flavor, description, url, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (date, location, flavor) DO UPDATE SET "
+                    "description = excluded.description, url = excluded.url",
+                    rows,
+                )
+
+    def query_history(
+        self, start=None, end=None, location=None, flavor=None, limit=DEFAULT_HISTORY_LIMIT
+    ):
+        """Return history records, newest first, filtered by date range, location and flavor.
+
+        Location and flavor match exactly (case-insensitive), so every filter is answered from
+        the primary key or one of the history indexes.
+        """
+        sql, params = self._history_query(start, end, location, flavor, limit)
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [
+            {"date": d, "location": loc, "flavor": f, "description": desc, "url": url}
+            for d, loc, f, desc, url in rows
+        ]
+
+    def _history_query(self, start, end, location, flavor, limit):
+        clauses = []
+        params = []
+        if start:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end:
+            clauses.append("date <= ?")
+            params.append(end)
+        if location:
+            clauses.append("location = ?")
+            params.append(location)
+        if flavor:
+            clauses.append("flavor = ?")
+            params.append(flavor)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = (
+            "SELECT date, location, flavor, description, url FROM flavor_history "
+            f"{where}ORDER BY date DESC, location, flavor LIMIT ?"
+        )
+        params.append(limit)
+        return sql, params
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,133 @@
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.metrics import SCRAPER_FLAVORS, SCRAPER_SECONDS
+from app.scrapers.async_utils import submit
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_SCRAPER_TIMEOUT = 120  # seconds
+DEFAULT_REFRESH_BUDGET = 180  # seconds
+POLL_INTERVAL = 0.5  # seconds between deadline checks
+
+
+def run_scrapers(
+    scrapers,
+    max_workers=DEFAULT_MAX_WORKERS,
+    scraper_timeout=DEFAULT_SCRAPER_TIMEOUT,
+    refresh_budget=DEFAULT_REFRESH_BUDGET,
+    on_late_result=None,
+):
+    """Run scrapers concurrently and return whatever finished in time.
+
+    ``scrapers`` is a list of ``(name, scraper_fn)`` pairs. The result maps the name of every
+    scraper that succeeded within its deadline to its flavors, in the order given. Scrapers
+    that exceed ``scraper_timeout`` (measured from when they start) or are still running when
+    ``refresh_budget`` expires are left running in the background; ``on_late_result(name,
+    flavors)`` is called if they eventually succeed.
+
+    Coroutine scrapers run on the scraper event loop instead of taking a pool thread.
+    """
+    started = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scraper")
+    futures = {}
+    for name, scraper_fn in scrapers:
+        if asyncio.iscoroutinefunction(scraper_fn):
+            future = submit(_run_scraper_async(name, scraper_fn, started))
+        else:
+            # Run in a copy of this thread's context so scraper spans nest under the caller's
+            context = contextvars.copy_context()
+            future = executor.submit(context.run, _run_scraper, name, scraper_fn, started)
+        futures[future] = name
+    budget_deadline = time.monotonic() + refresh_budget
+    finished = {}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            for future in list(pending):
+                start = started.get(futures[future])
+                if start is not None and now - start >= scraper_timeout:
+                    logger.warning(
+                        f"Scraper {futures[future]} exceeded {scraper_timeout}s, continuing in background"
+                    )
+                    pending.discard(future)
+                    _defer(future, futures[future], on_late_result)
+            if not pending or now >= budget_deadline:
+                break
+            timeout = min(budget_deadline - now, POLL_INTERVAL)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                name = futures[future]
+                try:
+                    finished[name] = future.result()
+                except Exception as err:
+                    logger.error(f"Scraping error in {name}", exc_info=err)
+    finally:
+        # Don't wait for (or cancel) stragglers; they finish on their own threads
+        executor.shutdown(wait=False)
+    for future in pending:
+        logger.warning(
+            f"Refresh budget of {refresh_budget}s exhausted, {futures[future]} continuing in background"
+        )
+        _defer(future, futures[future], on_late_result)
+    return {name: finished[name] for name, _ in scrapers if name in finished}
+
+
+def _run_scraper(name, scraper_fn, started):
+    started[name] = time.monotonic()
+    outcome = "error"
+    try:
+        with span("scraper", scraper=name):
+            flavors = scraper_fn()
+        outcome = "ok"
+    finally:
+        elapsed = _observe_scraper(name, started[name], outcome)
+    logger.info(f"Scraper {name} finished in {elapsed:.1f}s with {len(flavors)} flavor(s)")
+    SCRAPER_FLAVORS.labels(name).set(len(flavors))
+    return flavors
+
+
+async def _run_scraper_async(name, scraper_fn, started):
+    started[name] = time.monotonic()
+    outcome = "error"
+    try:
+        with span("scraper", scraper=name):
+            flavors = await scraper_fn()
+        outcome = "ok"
+    finally:
+        elapsed = _observe_scraper(name, started[name], outcome)
+    logger.info(f"Scraper {name} finished in {elapsed:.1f}s with {len(flavors)} flavor(s)")
+    SCRAPER_FLAVORS.labels(name).set(len(flavors))
+    return flavors
+
+
+def _observe_scraper(name, start, outcome):
+    elapsed = time.monotonic() - start
+    SCRAPER_SECONDS.labels(name, outcome).observe(elapsed)
+    return elapsed
+
+
+def _defer(future, name, on_late_result):
+    """Hand a straggling scraper's eventual result to ``on_late_result``"""
+
+    def _done(fut):
+        try:
+            flavors = fut.result()
+        except Exception as err:
+            logger.error(f"Late scraping error in {name}", exc_info=err)
+            return
+        if on_late_result is None:
+            return
+        try:
+            on_late_result(name, flavors)
+        except Exception as err:
+            logger.error(f"Failed to apply late results from {name}", exc_info=err)
+
+    future.add_done_callback(_done)
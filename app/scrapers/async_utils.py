@@ -0,0 +1,217 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+from app.metrics import SELENIUM_FALLBACKS, observe_fetch, url_label
+from app.scrapers.http_cache import response_cache
+from app.scrapers.throttle import (
+    SLOW_DOWN_STATUSES,
+    backoff_delay,
+    is_host_failure,
+    parse_retry_after,
+    throttle,
+)
+from app.scrapers.utils import (
+    REQUEST_TIMEOUT,
+    USER_AGENT,
+    _get_request_headers,
+    _is_valid_response,
+    _parse_html,
+    get_html_selenium,
+)
+from app.tracing import span
+
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 30  # seconds
+
+# One client per event loop; httpx clients can't be shared across loops
+_clients = {}
+_clients_lock = threading.Lock()
+
+# Event loop that coroutine scrapers are submitted to
+_event_loop = None
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_async_client():
+    """Return the pooled keep-alive AsyncClient for the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                timeout=REQUEST_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            )
+            _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Close the AsyncClient belonging to the running event loop"""
+    with _clients_lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def get_html_async(url, max_retries=3, use_selenium_fallback=True, parse=None):
+    """Async counterpart of get_html: same retries, limits and headers, without blocking the loop"""
+    with span("get_html", url=url, mode="async"):
+        return await _get_html_async(url, max_retries, use_selenium_fallback, parse)
+
+
+async def _get_html_async(url, max_retries, use_selenium_fallback, parse):
+    breaker = throttle.breaker(url)
+    if not breaker.allow():
+        logging.warning(f"Circuit open for {urlparse(url).netloc}, skipping {url}")
+        return None
+    for attempt in range(max_retries):
+        await _sleep(throttle.bucket(url).reserve(), "rate_limit")
+        start = time.perf_counter()
+        with span("fetch", attempt=attempt + 1) as fetch_span:
+            try:
+                html, status, retry_after = await _get_html_attempt_async(url, attempt, parse)
+            except BaseException:
+                # A parse error or cancellation must not leave a half-open trial running
+                breaker.release()
+                raise
+            fetch_span.set("status", status)
+        observe_fetch(url, status, time.perf_counter() - start)
+        if not is_host_failure(status):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+            if breaker.is_open():
+                logging.warning(f"{urlparse(url).netloc} looks down, not retrying {url}")
+                return None
+        if html is not None:
+            return html
+        if attempt < max_retries - 1:
+            wait_time = backoff_delay(attempt, status, retry_after)
+            if status in SLOW_DOWN_STATUSES:
+                throttle.bucket(url).pause(wait_time)
+            logging.info(f"Retry {attempt + 1} failed, waiting {wait_time:.1f}s")
+            await _sleep(wait_time, "backoff")
+    if use_selenium_fallback:
+        logging.info("All regular requests failed, trying Selenium fallback...")
+        SELENIUM_FALLBACKS.labels(url_label(url)).inc()
+        return await asyncio.to_thread(get_html_selenium, url, parse)
+    return None
+
+
+async def _get_html_attempt_async(url, attempt, parse=None):
+    logging.debug(f"GET {url} (attempt {attempt + 1}, async)")
+    headers = {**_get_request_headers(attempt), **response_cache.validators(url)}
+    try:
+        resp = await get_async_client().get(url, headers=headers)
+    except httpx.HTTPError as e:
+        logging.error(f"Request failed (attempt {attempt + 1}): {e}")
+        return None, None, None
+    logging.debug(f"Response status: {resp.status_code}")
+    cached = response_cache.get(url) if resp.status_code == 304 else None
+    if cached is not None:
+        logging.debug(f"304 Not Modified, reusing cached body for {url}")
+        text = cached.content.decode(cached.encoding or "utf-8", errors="replace")
+        return await asyncio.to_thread(_parse_html, url, text, parse), 304, None
+    response_cache.store(url, resp.status_code, resp.headers, resp.content, resp.encoding)
+    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+    if resp.status_code == 403:
+        logging.warning(f"403 Forbidden on attempt {attempt + 1}")
+        return None, resp.status_code, retry_after
+    elif _is_valid_response(resp):
+        # Hashing and parsing a page takes long enough to stall every other request on the loop
+        html = await asyncio.to_thread(_parse_html, url, resp.text, parse)
+        return html, resp.status_code, None
+    else:
+        logging.error(f"Invalid response: status={resp.status_code}")
+        return None, resp.status_code, retry_after
+
+
+async def post_async(url, **kwargs):
+    """Async counterpart of post: same host limiter, circuit breaker and metrics"""
+    breaker = throttle.breaker(url)
+    if not breaker.allow():
+        raise httpx.HTTPError(f"Circuit open for {urlparse(url).netloc}")
+    with span("post", url=url, mode="async") as post_span:
+        await _sleep(throttle.bucket(url).reserve(), "rate_limit")
+        start = time.perf_counter()
+        try:
+            with span("fetch", attempt=1):
+                resp = await get_async_client().post(url, **kwargs)
+        except httpx.HTTPError:
+            observe_fetch(url, None, time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        observe_fetch(url, resp.status_code, time.perf_counter() - start)
+        post_span.set("status", resp.status_code)
+        if is_host_failure(resp.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return resp
+
+
+def set_event_loop(loop):
+    """Run coroutine scrapers on ``loop`` (e.g. the FastAPI loop); None reverts to a private one"""
+    global _event_loop
+    _event_loop = loop
+
+
+def submit(coro):
+    """Schedule ``coro`` on the scraper event loop from any thread.
+
+    Returns a ``concurrent.futures.Future`` so coroutine scrapers can be awaited alongside
+    thread-pool ones. Falls back to a private background loop when no loop has been set or
+    when called from the configured loop's own thread, which would otherwise deadlock.
+    """
+    loop = _event_loop
+    if loop is None or loop.is_closed() or not loop.is_running() or _in_loop_thread(loop):
+        loop = _get_background_loop()
+    return asyncio.run_coroutine_threadsafe(_run_in_context(coro, contextvars.copy_context()), loop)
+
+
+async def _run_in_context(coro, context):
+    """Await ``coro`` with the submitting thread's context variables (e.g. the current span)"""
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+async def _sleep(seconds, reason):
+    with span("sleep", reason=reason, seconds=seconds):
+        await asyncio.sleep(seconds)
+
+
+def _in_loop_thread(loop):
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _get_background_loop():
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever, name="scraper-loop", daemon=True
+            ).start()
+    return _background_loop
@@ -0,0 +1,302 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from app.metrics import BROWSER_LAUNCH_SECONDS
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Checked before asking Selenium Manager, which can take seconds to resolve a driver
+CHROMEDRIVER_PATHS = ["/usr/local/bin/chromedriver"]
+POOL_SIZE = 1
+MAX_USES = 20
+MAX_MEMORY_MB = 1024
+ACQUIRE_TIMEOUT = 120  # Seconds to wait for a free browser; matches refresh.scraper_timeout
+PAGE_LOAD_TIMEOUT = 30  # Seconds before driver.get gives up on a page that never finishes
+
+_driver_path = None
+_driver_path_resolved = False
+_driver_path_lock = threading.Lock()
+
+
+def _get_chrome_options():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-infobars")
+    options.add_argument("--disable-browser-side-navigation")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    return options
+
+
+def resolve_driver_path():
+    """Return a known chromedriver path, looked up once per process (None = Selenium Manager)"""
+    global _driver_path, _driver_path_resolved
+    with _driver_path_lock:
+        if not _driver_path_resolved:
+            candidates = [shutil.which("chromedriver")] + CHROMEDRIVER_PATHS
+            _driver_path = next((p for p in candidates if p and os.path.exists(p)), None)
+            _driver_path_resolved = True
+            logger.debug(f"Resolved chromedriver: {_driver_path or 'Selenium Manager'}")
+        return _driver_path
+
+
+def _remember_driver_path(driver):
+    """Cache the driver Selenium Manager found so later launches skip the lookup"""
+    global _driver_path
+    path = getattr(getattr(driver, "service", None), "path", None)
+    if isinstance(path, str) and os.path.exists(path):
+        with _driver_path_lock:
+            _driver_path = path
+
+
+def launch_driver():
+    """Start a headless Chrome with the webdriver flag hidden"""
+    options = _get_chrome_options()
+    start = time.monotonic()
+    path = resolve_driver_path()
+    if path:
+        driver = webdriver.Chrome(service=Service(path), options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
+        _remember_driver_path(driver)
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": 'Object.defineProperty(navigator, "webdriver", {get: () => undefined});'},
+    )
+    driver.set_window_size(1920, 1080)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    logger.info(f"Launched Chrome in {time.monotonic() - start:.1f}s")
+    return driver
+
+
+def launch_undetected_driver():
+    """Start Chrome through undetected-chromedriver (raises ImportError if unavailable)"""
+    import undetected_chromedriver as uc
+
+    driver = uc.Chrome(options=_get_chrome_options())
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+def _process_tree_rss_mb(pid):
+    """Resident memory of a process and its descendants, in MB (0 where /proc is unavailable)"""
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                stack.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def _origin(url):
+    """scheme://host[:port] of an http(s) URL, or None for about:, data: and the like"""
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class WebDriverPool:
+    """A pool of warm browsers that are reused between Selenium scrapes.
+
+    Drivers are handed out with a clean context (blank page, no cookies, cache or site storage)
+    and are replaced after ``max_uses`` scrapes, when the browser's memory exceeds
+    ``max_memory_mb``, or when a scrape using them raises.
+    """
+
+    def __init__(
+        self,
+        factory=launch_driver,
+        size=POOL_SIZE,
+        max_uses=MAX_USES,
+        max_memory_mb=MAX_MEMORY_MB,
+        name="chrome",
+        acquire_timeout=ACQUIRE_TIMEOUT,
+    ):
+        self.factory = factory
+        self.name = name
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.acquire_timeout = acquire_timeout
+        self._idle = []
+        self._checked_out = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._keep_warm = False
+
+    def configure(self, size=None, max_uses=None, max_memory_mb=None, acquire_timeout=None):
+        """Change pool limits; only allowed while no driver is checked out"""
+        with self._lock:
+            if size is not None and size != self.size:
+                self.size = size
+                self._slots = threading.BoundedSemaphore(size)
+            if max_uses is not None:
+                self.max_uses = max_uses
+            if max_memory_mb is not None:
+                self.max_memory_mb = max_memory_mb
+            if acquire_timeout is not None:
+                self.acquire_timeout = acquire_timeout
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for the duration of a ``with`` block.
+
+        Raises TimeoutError when every browser stays checked out for ``acquire_timeout``
+        seconds, e.g. by a scrape that was abandoned but is still stuck in its browser.
+        """
+        slots = self._slots
+        if not slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No {self.name} browser became free in {self.acquire_timeout}s")
+        entry = None
+        healthy = False
+        replace = False
+        try:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+                self._checked_out += 1
+            if entry is None:
+                entry = self._launch()
+            yield entry.driver
+            healthy = True
+        finally:
+            if entry is not None:
+                entry.uses += 1
+                if healthy and self._reusable(entry):
+                    with self._lock:
+                        self._idle.append(entry)
+                else:
+                    self._quit(entry)
+                    replace = self._keep_warm
+            with self._lock:
+                self._checked_out -= 1
+            slots.release()
+            if replace:
+                threading.Thread(target=self.warm, name="browser-warm", daemon=True).start()
+
+    def warm(self):
+        """Launch browsers until ``size`` exist, and replace recycled ones from now on.
+
+        Launches hold a checkout slot, so together with the browsers in use there are never
+        more than ``size``.
+        """
+        self._keep_warm = True
+        while True:
+            slots = self._slots
+            if not slots.acquire(blocking=False):
+                return  # Every browser is in use
+            try:
+                with self._lock:
+                    if len(self._idle) + self._checked_out >= self.size:
+                        return
+                try:
+                    entry = self._launch()
+                except Exception as err:
+                    logger.warning(f"Could not pre-launch browser: {err}")
+                    return
+                with self._lock:
+                    self._idle.append(entry)
+            finally:
+                slots.release()
+
+    def close(self):
+        """Quit every idle browser"""
+        self._keep_warm = False
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._quit(entry)
+
+    def _launch(self):
+        start = time.perf_counter()
+        with span("browser.launch", browser=self.name):
+            entry = _PooledDriver(self.factory())
+        BROWSER_LAUNCH_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+        return entry
+
+    def _reusable(self, entry):
+        if entry.uses >= self.max_uses:
+            logger.info(f"Recycling browser after {entry.uses} uses")
+            return False
+        pid = getattr(getattr(getattr(entry.driver, "service", None), "process", None), "pid", None)
+        if isinstance(pid, int):
+            memory_mb = _process_tree_rss_mb(pid)
+            if memory_mb > self.max_memory_mb:
+                logger.info(f"Recycling browser using {memory_mb:.0f}MB")
+                return False
+        return self._reset(entry.driver)
+
+    def _reset(self, driver):
+        """Give the browser a clean context for the next scrape"""
+        try:
+            handles = list(driver.window_handles)
+            origins = set()
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                origins.add(_origin(driver.current_url))
+                if handle != handles[0]:
+                    driver.close()
+            # Cookies and storage are cleared while the visited pages are still loaded; once on
+            # about:blank, WebDriver's delete_all_cookies only sees the blank page's (none)
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            for origin in sorted(filter(None, origins)):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+                )
+            driver.get("about:blank")
+            return True
+        except Exception as err:
+            logger.info(f"Discarding browser that could not be reset: {err}")
+            return False
+
+    def _quit(self, entry):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+
+browser_pool = WebDriverPool()
+undetected_browser_pool = WebDriverPool(factory=launch_undetected_driver, name="undetected")
+
+
+def configure_browser_pool(settings):
+    """Apply the ``scraping.browser_pool`` section of config.yaml"""
+    for pool in (browser_pool, undetected_browser_pool):
+        pool.configure(
+            size=settings.get("size"),
+            max_uses=settings.get("max_uses"),
+            max_memory_mb=settings.get("max_memory_mb"),
+            acquire_timeout=settings.get("acquire_timeout"),
+        )
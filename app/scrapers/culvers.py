@@ -1,9 +1,12 @@
 import json
 import logging
+import threading
 from datetime import datetime
-from zoneinfo import ZoneInfo
+from urllib.parse import urlparse
 
-from app.scrapers.utils import daily_flavor, get_html
+from app.scrapers.parsing import script_text
+from app.scrapers.utils import daily_flavor, fetch_concurrently, get_html, get_json
+from app.tracing import span
 
 CULVERS_LOCATIONS = [
     ("Culvers (Capital)", "https://www.culvers.com/restaurants/brookfield-capitol"),
@@ -14,30 +17,150 @@ CULVERS_LOCATIONS = [
     ("Culvers (124th)", "https://www.culvers.com/restaurants/brookfield-124th"),
 ]
 
+# The calendar lives in the Next.js data script near the top of the page; it is read while
+# streaming and the rest of the page is never downloaded
+NEXT_DATA_PARSE = script_text("__NEXT_DATA__")
+
+# How each location is fetched:
+#   next_data - the compact /_next/data/<buildId>/... JSON route, falling back to the page
+#   stream    - stream the page until __NEXT_DATA__ is complete
+#   html      - download the whole page
+FETCH_MODES = ("next_data", "stream", "html")
+FETCH_MODE = "next_data"
+
+# Next.js build ID shared by every location, learned from the first page fetched
+_build_id = None
+# Set once this refresh's discovery attempt has finished; None until a location starts one
+_discovery = None
+# Guards _build_id and _discovery only; never held while fetching
+_build_id_lock = threading.Lock()
+# How long locations wait for the build ID before loading their own page instead
+BUILD_ID_WAIT = 10  # seconds
+
+
+def configure_culvers(settings):
+    """Apply the ``scraping.culvers`` section of config.yaml"""
+    global FETCH_MODE
+    mode = settings.get("fetch_mode", FETCH_MODE)
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Unknown Culver's fetch_mode {mode!r}, expected one of {FETCH_MODES}")
+    FETCH_MODE = mode
+
 
 def scrape_culvers():
-    """Scrape multiple Culver's locations"""
+    """Scrape multiple Culver's locations.
+
+    Returns every dated entry of each location's flavor calendar, so one scrape covers today and
+    the upcoming days.
+    """
+    global _discovery
     logger = logging.getLogger(__name__)
     logger.info("🚀 CULVERS: Starting scrape of all locations...")
+    with _build_id_lock:
+        _discovery = None  # Allow one new discovery attempt per refresh
     flavors = []
-    for name, url in CULVERS_LOCATIONS:
-        try:
-            logger.info(f"📍 CULVERS: Scraping {name}...")
-            flavor, description, flavor_date = _scrape_culvers_location(url)
+    urls = [url for _, url in CULVERS_LOCATIONS]
+    logger.info(f"📍 CULVERS: Scraping {len(urls)} locations in parallel...")
+    results = fetch_concurrently(_scrape_culvers_location, urls)
+    for (name, url), (result, error) in zip(CULVERS_LOCATIONS, results):
+        if error is not None:
+            logger.error(f"❌ CULVERS: Failed to scrape {name}: {error}")
+            continue
+        if not result:
+            logger.warning(f"⚠️ CULVERS: No calendar entries found for {name}")
+            continue
+        for flavor_date, flavor, description in result:
             flavors.append(daily_flavor(name, flavor, description, flavor_date, url=url))
-            logger.info(f"🍨 CULVERS: {name} - {flavor} ({flavor_date})")
-        except Exception as e:
-            logger.error(f"❌ CULVERS: Failed to scrape {name}: {e}")
-    logger.info(f"✅ CULVERS: Completed - found {len(flavors)} location(s)")
+        first_date, first_flavor, _ = result[0]
+        logger.info(
+            f"🍨 CULVERS: {name} - {first_flavor} ({first_date}), {len(result)} day(s) in calendar"
+        )
+    logger.info(f"✅ CULVERS: Completed - found {len(flavors)} calendar entries")
     return flavors
 
 
 def _scrape_culvers_location(url):
-    html = get_html(url)
-    script_tag = html.find("script", id="__NEXT_DATA__", type="application/json")
-    if not script_tag or not script_tag.string:
+    if FETCH_MODE == "next_data":
+        build_id, discovery = _claim_build_id()
+        if discovery is not None:
+            # This location finds the build ID from its page; the rest wait for it
+            try:
+                return _scrape_culvers_page(url)
+            finally:
+                discovery.set()
+        if build_id is not None:
+            calendar = _scrape_culvers_data_route(url, build_id)
+            if calendar is not None:
+                return calendar
+    return _scrape_culvers_page(url)
+
+
+def _claim_build_id():
+    """Return ``(build_id, discovery)``.
+
+    ``discovery`` is an Event for the caller to set once its page is loaded, when the build ID is
+    unknown and no other location is looking for it yet. Otherwise the caller waits up to
+    BUILD_ID_WAIT for the location that is, and gets None when the ID is still unknown.
+    """
+    global _discovery
+    with _build_id_lock:
+        if _build_id is not None:
+            return _build_id, None
+        if _discovery is None:
+            _discovery = threading.Event()
+            return None, _discovery
+        discovery = _discovery
+    discovery.wait(BUILD_ID_WAIT)
+    with _build_id_lock:
+        return _build_id, None
+
+
+def _scrape_culvers_page(url):
+    next_data = get_html(url, parse=NEXT_DATA_PARSE, stream=FETCH_MODE != "html")
+    if not next_data:
         raise Exception("Could not find Culver's JSON data on the page.")
-    data = json.loads(script_tag.string)
+    with span("parse.json", chars=len(next_data)):
+        data = json.loads(next_data)
+    _remember_build_id(data.get("buildId"))
+    return _parse_culvers_calendar(data)
+
+
+def _scrape_culvers_data_route(url, build_id):
+    """Calendar from the Next.js data route, or None when the route can't be used"""
+    logger = logging.getLogger(__name__)
+    try:
+        page_data = get_json(_data_route_url(url, build_id))
+    except Exception as e:
+        logger.warning(f"⚠️ CULVERS: Data route failed for {url}: {e}")
+        return None
+    if page_data is None:
+        logger.info(f"CULVERS: Build {build_id} is no longer served, reloading the page")
+        _forget_build_id(build_id)
+        return None
+    return _parse_culvers_calendar({"props": page_data})
+
+
+def _data_route_url(url, build_id):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}/_next/data/{build_id}{parsed.path.rstrip('/')}.json"
+
+
+def _remember_build_id(build_id):
+    global _build_id
+    if build_id and FETCH_MODE == "next_data":
+        with _build_id_lock:
+            _build_id = build_id
+
+
+def _forget_build_id(build_id):
+    global _build_id
+    with _build_id_lock:
+        if _build_id == build_id:
+            _build_id = None
+
+
+def _parse_culvers_calendar(data):
+    """Return ``(date, flavor, description)`` for every dated calendar entry, oldest first"""
     # Try all plausible locations for the flavors array
     flavors = None
     pageProps = data.get("props", {}).get("pageProps", {})
@@ -62,45 +185,23 @@ def _scrape_culvers_location(url):
             break
     if not flavors:
         # Log available keys for debugging
-        import logging
-
         logger = logging.getLogger(__name__)
         logger.warning(f"CULVERS: Could not find flavors. pageProps keys: {list(pageProps.keys())}")
-        return "", "", None
-    # Use US/Central timezone for 'today'
-    tz = ZoneInfo("America/Chicago")
-    now_central = datetime.now(tz)
-    today = now_central.date()
+        return []
     # Collect all entries with valid dates
-    dated_entries = []
+    dated_entries = {}
     for entry in flavors:
         date_str = entry.get("onDate") or entry.get("calendarDate")
         if not date_str:
             continue
         try:
             date = datetime.strptime(date_str[:10], "%Y-%m-%d").date()
-            dated_entries.append((date, entry))
         except Exception:
             continue
-    if not dated_entries:
-        return "", "", None
+        flavor = entry.get("title") or entry.get("name") or ""
+        if not flavor or date in dated_entries:
+            continue
+        description = entry.get("description") or ""
+        dated_entries[date] = (date.isoformat(), flavor, description)
     # Sort by date ascending
-    dated_entries.sort()
-    # Try to find today's flavor
-    for date, entry in dated_entries:
-        if date == today:
-            flavor = entry.get("title") or entry.get("name") or ""
-            description = entry.get("description") or ""
-            date_str = (entry.get("onDate") or entry.get("calendarDate") or "")[:10]
-            return flavor, description, date_str
-    # Try to find the next future flavor
-    for date, entry in dated_entries:
-        if date > today:
-            flavor = entry.get("title") or entry.get("name") or ""
-            description = entry.get("description") or ""
-            date_str = (entry.get("onDate") or entry.get("calendarDate") or "")[:10]
-            return flavor, description, date_str
-    flavor = entry.get("title") or entry.get("name") or ""
-    description = entry.get("description") or ""
-    date_str = (entry.get("onDate") or entry.get("calendarDate") or "")[:10]
-    return flavor, description, date_str
+    return [dated_entries[date] for date in sorted(dated_entries)]
@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 256
+
+
+class _Entry:
+    def __init__(self, etag, last_modified, content, headers, encoding):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding
+
+
+class ResponseCache:
+    """Bodies and validators (ETag / Last-Modified) of recent GET responses, by URL"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validators(self, url):
+        """Conditional request headers for ``url`` (empty if nothing is cached)"""
+        entry = self.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def store(self, url, status, headers, content, encoding=None):
+        """Remember a 200 response that carries a validator"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if status != 200 or not (etag or last_modified):
+            return
+        entry = _Entry(etag, last_modified, content, dict(headers), encoding)
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that revalidates cached GETs and turns a 304 back into the cached 200.
+
+    Streamed requests pass straight through, since their body is not read up front.
+    """
+
+    def __init__(self, cache, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+        for name, value in self.cache.validators(request.url).items():
+            request.headers.setdefault(name, value)
+        resp = super().send(request, stream=stream, **kwargs)
+        if resp.status_code == 304:
+            entry = self.cache.get(request.url)
+            if entry is not None:
+                logger.debug(f"304 Not Modified, reusing cached body for {request.url}")
+                resp.close()
+                return self._cached_response(request, entry)
+        self.cache.store(request.url, resp.status_code, resp.headers, resp.content, resp.encoding)
+        return resp
+
+    def _cached_response(self, request, entry):
+        resp = Response()
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp._content = entry.content
+        resp.encoding = entry.encoding
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        resp.from_cache = True
+        return resp
+
+
+class ParseCache:
+    """Parsed documents keyed by (url, parser), reused while the body's hash is unchanged.
+
+    Catches servers that ignore validators and resend identical pages. Cached documents are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, url, parser_name, content, parse_fn):
+        """Return ``parse_fn(content)``, or the previous result if ``content`` is unchanged"""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        key = (url, parser_name)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == digest:
+                self._entries.move_to_end(key)
+                logger.debug(f"Unchanged body, skipping parse of {url}")
+                return cached[1]
+        result = parse_fn(content)
+        with self._lock:
+            self._entries[key] = (digest, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+parse_cache = ParseCache()
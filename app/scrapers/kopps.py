@@ -1,16 +1,33 @@
 import logging
 
+from app.scrapers.async_utils import get_html_async
+from app.scrapers.parsing import strained
 from app.scrapers.utils import daily_flavor, get_html
 
 logger = logging.getLogger(__name__)
 
 KOPPS_URL = "https://www.kopps.com/"
+# Only today's flavors block is built; the rest of the page is skipped while parsing
+KOPPS_PARSE = strained("div", class_="wp-block-todays-flavors")
 
 
 def scrape_kopps():
     """Scrape Kopp's Frozen Custard"""
     logger.info("🚀 KOPPS: Starting scrape...")
-    html = get_html(KOPPS_URL)
+    return _parse_kopps(get_html(KOPPS_URL, parse=KOPPS_PARSE))
+
+
+async def scrape_kopps_async():
+    """Scrape Kopp's Frozen Custard on the event loop"""
+    logger.info("🚀 KOPPS: Starting async scrape...")
+    return _parse_kopps(await get_html_async(KOPPS_URL, parse=KOPPS_PARSE))
+
+
+def _parse_kopps(html):
+    if html is None:
+        # get_html gives up without a page when the host's circuit is open
+        logger.warning("⚠️ KOPPS: No page to parse, skipping")
+        return []
     flavors = []
     flavors_section = html.find("div", class_="wp-block-todays-flavors")
     if not flavors_section:
@@ -2,18 +2,46 @@ import datetime
 import logging
 from zoneinfo import ZoneInfo
 
+from app.scrapers.async_utils import get_html_async
+from app.scrapers.parsing import strained
 from app.scrapers.utils import daily_flavor, get_html
 
 logger = logging.getLogger(__name__)
 
 MURFS_URL = "https://www.murfsfrozencustard.com/flavorForecast"
+MURFS_PARSE = strained(
+    "span", class_=["subDateSpan", "flavorOfDayWhiteSpan", "flavorDescriptionSpan"]
+)
 
 
 def scrape_murfs():
     """Scrape Murf's Frozen Custard"""
     logger.info("🚀 MURFS: Starting scrape...")
     try:
-        html = get_html(MURFS_URL)
+        html = get_html(MURFS_URL, parse=MURFS_PARSE)
+    except Exception as e:
+        logger.error(f"❌ MURFS: Failed to fetch page: {e}")
+        return []
+    return _parse_murfs(html)
+
+
+async def scrape_murfs_async():
+    """Scrape Murf's Frozen Custard on the event loop"""
+    logger.info("🚀 MURFS: Starting async scrape...")
+    try:
+        html = await get_html_async(MURFS_URL, parse=MURFS_PARSE)
+    except Exception as e:
+        logger.error(f"❌ MURFS: Failed to fetch page: {e}")
+        return []
+    return _parse_murfs(html)
+
+
+def _parse_murfs(html):
+    if html is None:
+        # get_html gives up without a page when the host's circuit is open
+        logger.warning("⚠️ MURFS: No page to parse, skipping")
+        return []
+    try:
         # Find the date string in the subDateSpan (e.g., 'Sunday, Jul. 06')
         date_span = html.find("span", {"class": "subDateSpan"})
         flavor_date = None
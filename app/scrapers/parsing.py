@@ -0,0 +1,95 @@
+import importlib.util
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml builds the tree in C and is several times faster than the pure-Python parser
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+# Characters kept from the previous chunk while looking for a tag that may span two chunks
+STREAM_LOOKBEHIND = 512
+
+
+class ParseStep:
+    """Turns a fetched page's text into what a scraper needs.
+
+    ``key`` names the step in the parse cache, so two steps over the same URL don't share
+    results. Steps that can work on a partial download also provide ``stream``, which takes an
+    iterator of decoded text chunks and returns as soon as it has its result.
+    """
+
+    def __init__(self, key, fn, stream=None):
+        self.key = key
+        self.fn = fn
+        self.stream = stream
+
+    def __call__(self, text):
+        return self.fn(text)
+
+    def __repr__(self):
+        return f"ParseStep({self.key!r})"
+
+
+def full_document(parser=None):
+    """The whole page as a BeautifulSoup document (the default)"""
+    parser = parser or HTML_PARSER
+    return ParseStep(f"document:{parser}", lambda text: BeautifulSoup(text, parser))
+
+
+def strained(name=None, parser=None, **attrs):
+    """Only the elements matching a SoupStrainer (and their children) are built"""
+    parser = parser or HTML_PARSER
+    strainer = SoupStrainer(name, **attrs)
+    return ParseStep(
+        f"strained:{parser}:{name}:{sorted(attrs.items())}",
+        lambda text: BeautifulSoup(text, parser, parse_only=strainer),
+    )
+
+
+def css_subtree(selector, name=None, parser=None, **attrs):
+    """The first element matching a CSS selector, or None.
+
+    ``name``/``attrs`` optionally narrow the parse with a strainer first.
+    """
+    parser = parser or HTML_PARSER
+    strainer = SoupStrainer(name, **attrs) if name or attrs else None
+
+    def parse(text):
+        return BeautifulSoup(text, parser, parse_only=strainer).select_one(selector)
+
+    return ParseStep(f"css:{parser}:{selector}:{name}:{sorted(attrs.items())}", parse)
+
+
+def script_text(script_id):
+    """Contents of ``<script id="...">`` found with a regex, without building a tree (or None)"""
+    pattern = re.compile(
+        rf"<script\b[^>]*\bid=[\"']{re.escape(script_id)}[\"'][^>]*>(.*?)</script>",
+        re.DOTALL | re.IGNORECASE,
+    )
+    start_pattern = re.compile(
+        rf"<script\b[^>]*\bid=[\"']{re.escape(script_id)}[\"'][^>]*>", re.IGNORECASE
+    )
+
+    def parse(text):
+        match = pattern.search(text)
+        return match.group(1) if match else None
+
+    def stream(chunks):
+        # Before the tag starts only a short tail is kept, in case the tag spans two chunks
+        buffer = ""
+        start = None
+        for chunk in chunks:
+            buffer += chunk
+            if start is None:
+                match = start_pattern.search(buffer)
+                if not match:
+                    buffer = buffer[-STREAM_LOOKBEHIND:]
+                    continue
+                buffer = buffer[match.end() :]
+                start = 0
+            end = buffer.find("</script", start)
+            if end != -1:
+                return buffer[:end]
+            start = max(0, len(buffer) - len("</script"))
+        return None
+
+    return ParseStep(f"script:{script_id}", parse, stream)
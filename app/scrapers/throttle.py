@@ -0,0 +1,184 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+RATE_PER_SECOND = 2.0  # Sustained requests per second to one host
+BURST = 4  # Requests allowed back to back before the rate applies
+BASE_BACKOFF = 0.5  # Seconds; doubled on every retry
+MAX_BACKOFF = 30
+FAILURE_THRESHOLD = 5  # Consecutive failures that open a host's circuit
+RESET_TIMEOUT = 60  # Seconds an open circuit waits before letting one request through
+
+# Statuses that mean "slow down" rather than "broken", so the host's bucket is paused too
+SLOW_DOWN_STATUSES = {403, 429}
+
+
+class TokenBucket:
+    """Token-bucket rate limiter.
+
+    ``reserve()`` takes a token and returns how long the caller must wait before using it, so
+    the same bucket works for threads (``time.sleep``) and coroutines (``asyncio.sleep``).
+    """
+
+    def __init__(self, rate=RATE_PER_SECOND, burst=BURST, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds):
+        """Hold every request to this host for ``seconds`` (e.g. after a 429)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class CircuitBreaker:
+    """Fails fast while a host is down.
+
+    Opens after ``failure_threshold`` consecutive failures. Once ``reset_timeout`` has passed a
+    single trial request is allowed through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, clock=time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial_running = True
+            return True
+
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None and (
+                self._trial_running or self._clock() - self._opened_at < self.reset_timeout
+            )
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def release(self):
+        """End a trial that raised before it had an outcome, so a later request can try again"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Circuit opened after {self._failures} consecutive failures")
+                self._opened_at = self._clock()
+                self._trial_running = False
+
+
+class HostThrottle:
+    """Per-host rate limiters and circuit breakers, shared by the sync and async fetchers"""
+
+    def __init__(self):
+        self.configure()
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        rate=RATE_PER_SECOND,
+        burst=BURST,
+        failure_threshold=FAILURE_THRESHOLD,
+        reset_timeout=RESET_TIMEOUT,
+    ):
+        """Set limits for hosts seen from now on"""
+        self.rate = rate
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def breaker(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, status=None, retry_after=None):
+    """Exponential backoff with full jitter; Retry-After and slow-down statuses raise the floor"""
+    ceiling = min(MAX_BACKOFF, BASE_BACKOFF * 2**attempt)
+    delay = random.uniform(0, ceiling)
+    if status in SLOW_DOWN_STATUSES:
+        delay = max(delay, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, MAX_BACKOFF))
+    return delay
+
+
+def is_host_failure(status):
+    """Connection errors and 5xx count against a host's circuit; 4xx mean it is up"""
+    return status is None or status >= 500
+
+
+throttle = HostThrottle()
+
+
+def configure_throttle(settings):
+    """Apply the ``scraping.throttle`` section of config.yaml"""
+    throttle.configure(
+        rate=settings.get("rate_per_second", RATE_PER_SECOND),
+        burst=settings.get("burst", BURST),
+        failure_threshold=settings.get("failure_threshold", FAILURE_THRESHOLD),
+        reset_timeout=settings.get("reset_timeout", RESET_TIMEOUT),
+    )
@@ -1,24 +1,56 @@
+import codecs
+import contextvars
 import datetime
 import logging
-import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
+from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
 import requests
-from bs4 import BeautifulSoup
 from requests.exceptions import RequestException
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+
+from app.metrics import SELENIUM_FALLBACKS, observe_fetch, url_label
+from app.scrapers.browser import browser_pool, configure_browser_pool, undetected_browser_pool
+from app.scrapers.http_cache import CachingAdapter, parse_cache, response_cache
+from app.scrapers.parsing import full_document
+from app.scrapers.throttle import (
+    SLOW_DOWN_STATUSES,
+    backoff_delay,
+    configure_throttle,
+    is_host_failure,
+    parse_retry_after,
+    throttle,
+)
+from app.tracing import span
 
 # Constants (moved from main.py)
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
 REQUEST_TIMEOUT = 30
 SELENIUM_WAIT_TIMEOUT = 10
+MAX_CONCURRENT_PER_HOST = 2
+STREAM_CHUNK_SIZE = 16 * 1024
 
 # Session (moved from main.py)
 session = requests.Session()
 session.headers.update({"User-Agent": USER_AGENT})
+# Revalidate repeated GETs with ETag / Last-Modified instead of downloading them again
+session.mount("https://", CachingAdapter(response_cache))
+session.mount("http://", CachingAdapter(response_cache))
+
+
+def configure_scraping(settings, scraper_timeout=None):
+    """Apply the ``scraping`` section of config.yaml.
+
+    Unless ``browser_pool.acquire_timeout`` is set, a scrape waits for a browser no longer than
+    ``scraper_timeout``, after which the refresh has stopped waiting for it anyway.
+    """
+    global MAX_CONCURRENT_PER_HOST
+    MAX_CONCURRENT_PER_HOST = settings.get("max_concurrent_per_host", MAX_CONCURRENT_PER_HOST)
+    configure_browser_pool({"acquire_timeout": scraper_timeout, **settings.get("browser_pool", {})})
+    configure_throttle(settings.get("throttle", {}))
 
 
 def get_central_time():
@@ -39,28 +71,155 @@ def daily_flavor(location, flavor, description=None, date=None, url=None):
     }
 
 
-def get_html(url, max_retries=3, use_selenium_fallback=True):
-    """Get HTML with retry logic, varying strategies, and optional Selenium fallback"""
+def get_html(url, max_retries=3, use_selenium_fallback=True, parse=None, stream=False):
+    """Get HTML with retry logic, varying strategies, and optional Selenium fallback.
+
+    ``parse`` is a step from app.scrapers.parsing that decides what is built from the page
+    (the full document by default). With ``stream=True`` and a step that supports it, the body
+    is read chunk by chunk and the download stops as soon as the step has what it needs.
+
+    Requests are paced by the host's rate limiter and retried with exponential backoff. While
+    the host's circuit breaker is open the URL fails fast, without the Selenium fallback.
+    """
+    with span("get_html", url=url):
+        return _get_html(url, max_retries, use_selenium_fallback, parse, stream)
+
+
+def _get_html(url, max_retries, use_selenium_fallback, parse, stream):
+    breaker = throttle.breaker(url)
+    if not breaker.allow():
+        logging.warning(f"Circuit open for {urlparse(url).netloc}, skipping {url}")
+        return None
     for attempt in range(max_retries):
-        html = _get_html_attempt(url, attempt)
+        _sleep(throttle.bucket(url).reserve(), "rate_limit")
+        start = time.perf_counter()
+        with span("fetch", attempt=attempt + 1) as fetch_span:
+            try:
+                html, status, retry_after = _get_html_attempt(url, attempt, parse, stream)
+            except BaseException:
+                # e.g. the parse step raised: no outcome to record, but free a half-open trial
+                breaker.release()
+                raise
+            fetch_span.set("status", status)
+        observe_fetch(url, status, time.perf_counter() - start)
+        if not is_host_failure(status):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+            if breaker.is_open():
+                logging.warning(f"{urlparse(url).netloc} looks down, not retrying {url}")
+                return None
         if html is not None:
             return html
         if attempt < max_retries - 1:
-            wait_time = random.uniform(1, 3)
+            wait_time = backoff_delay(attempt, status, retry_after)
+            if status in SLOW_DOWN_STATUSES:
+                throttle.bucket(url).pause(wait_time)
             logging.info(f"Retry {attempt + 1} failed, waiting {wait_time:.1f}s")
-            time.sleep(wait_time)
+            _sleep(wait_time, "backoff")
     # If all regular attempts failed and Selenium fallback is enabled, try Selenium
     if use_selenium_fallback:
         logging.info("All regular requests failed, trying Selenium fallback...")
-        return get_html_selenium(url)
+        SELENIUM_FALLBACKS.labels(url_label(url)).inc()
+        return get_html_selenium(url, parse)
     return None
 
 
-def _get_html_attempt(url, attempt):
+def get_json(url):
+    """GET a JSON document through the shared session and host limiter.
+
+    Returns None on 404 and raises for other errors, so callers can fall back to the HTML page.
+    """
+    breaker = throttle.breaker(url)
+    if not breaker.allow():
+        raise RequestException(f"Circuit open for {urlparse(url).netloc}")
+    with span("get_json", url=url) as json_span:
+        _sleep(throttle.bucket(url).reserve(), "rate_limit")
+        start = time.perf_counter()
+        try:
+            with span("fetch", attempt=1):
+                resp = session.get(
+                    url,
+                    headers={"Accept": "application/json", "User-Agent": USER_AGENT},
+                    timeout=REQUEST_TIMEOUT,
+                )
+        except RequestException:
+            observe_fetch(url, None, time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+        observe_fetch(url, resp.status_code, time.perf_counter() - start)
+        json_span.set("status", resp.status_code)
+        with closing(resp):
+            if is_host_failure(resp.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if resp.status_code == 404:
+                return None
+            resp.raise_for_status()
+            with span("parse.json", bytes=len(resp.content)):
+                return resp.json()
+
+
+def post(url, **kwargs):
+    """POST through the shared session, host limiter and circuit breaker; returns the response.
+
+    Raises ``RequestException`` when the host's circuit is open or the request fails.
+    """
+    breaker = throttle.breaker(url)
+    if not breaker.allow():
+        raise RequestException(f"Circuit open for {urlparse(url).netloc}")
+    with span("post", url=url) as post_span:
+        _sleep(throttle.bucket(url).reserve(), "rate_limit")
+        start = time.perf_counter()
+        try:
+            with span("fetch", attempt=1):
+                resp = session.post(url, **kwargs)
+        except RequestException:
+            observe_fetch(url, None, time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        observe_fetch(url, resp.status_code, time.perf_counter() - start)
+        post_span.set("status", resp.status_code)
+        if is_host_failure(resp.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return resp
+
+
+def fetch_concurrently(fetch_fn, urls, max_per_host=None):
+    """Call ``fetch_fn(url)`` for each URL in parallel, limiting concurrent calls per host.
+
+    Returns a list of ``(result, error)`` tuples in the same order as ``urls``. A failure for
+    one URL is captured in its ``error`` and doesn't affect the others.
+    """
+    if not urls:
+        return []
+    limit = max_per_host or MAX_CONCURRENT_PER_HOST
+    semaphores = {urlparse(url).netloc: threading.BoundedSemaphore(limit) for url in urls}
+
+    def fetch(url):
+        with semaphores[urlparse(url).netloc]:
+            try:
+                return fetch_fn(url), None
+            except Exception as e:
+                return None, e
+
+    # Each call runs in a copy of the caller's context, so its spans nest under the caller's
+    contexts = [contextvars.copy_context() for _ in urls]
+    with ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix="fetch") as executor:
+        return list(executor.map(lambda context, url: context.run(fetch, url), contexts, urls))
+
+
+def _get_html_attempt(url, attempt, parse=None, stream=False):
+    """One GET; returns ``(html, status, retry_after)`` with status None if no response came"""
     logging.debug(f"GET {url} (attempt {attempt + 1})")
-    delay = random.uniform(1.0, 3.0) + (attempt * random.uniform(0.5, 1.5))
-    time.sleep(delay)
     headers = _get_request_headers(attempt)
+    stream = stream and getattr(parse, "stream", None) is not None
     try:
         with closing(
             session.get(
@@ -68,24 +227,56 @@ def _get_html_attempt(url, attempt):
                 headers=headers,
                 timeout=REQUEST_TIMEOUT,
                 allow_redirects=True,
-                stream=False,
+                stream=stream,
             )
         ) as resp:
             logging.debug(f"Response status: {resp.status_code}")
             logging.debug(f"Response encoding: {resp.encoding}")
             logging.debug(f"Response headers: {dict(resp.headers)}")
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
             if resp.status_code == 403:
                 logging.warning(f"403 Forbidden on attempt {attempt + 1}")
-                return None
+                return None, resp.status_code, retry_after
+            elif _is_valid_response(resp) and stream:
+                return _parse_stream(url, resp, parse), resp.status_code, None
             elif _is_valid_response(resp):
-                html = BeautifulSoup(resp.text, "html.parser")
-                return html
+                return _parse_html(url, resp.text, parse), resp.status_code, None
             else:
                 logging.error(f"Invalid response: status={resp.status_code}")
-                return None
+                return None, resp.status_code, retry_after
     except RequestException as e:
         logging.error(f"Request failed (attempt {attempt + 1}): {e}")
-        return None
+        return None, None, None
+
+
+def _parse_html(url, text, parse=None):
+    """Parse a page, reusing the last parse of ``url`` when the body hasn't changed"""
+    parse = parse or full_document()
+    with span("parse", step=parse.key, chars=len(text)):
+        return parse_cache.parse(url, parse.key, text, parse)
+
+
+def _parse_stream(url, resp, parse):
+    """Feed the body to a streaming parse step, decoding chunks as they arrive.
+
+    The connection is closed by the caller as soon as the step returns, so the rest of the page
+    is never downloaded.
+    """
+    decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+    received = 0
+
+    def chunks():
+        nonlocal received
+        for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            received += len(chunk)
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    with span("parse.stream", step=parse.key) as stream_span:
+        result = parse.stream(chunks())
+        stream_span.set("bytes", received)
+    logging.debug(f"Streamed {received // 1024}KB of {url}")
+    return result
 
 
 def _get_request_headers(attempt=0):
@@ -119,44 +310,34 @@ def _is_valid_response(resp):
     return resp.status_code == 200 and content_type is not None and "html" in content_type
 
 
-def get_html_selenium(url):
-    """Get HTML using Selenium WebDriver"""
-    options = _get_chrome_options()
-    driver = webdriver.Chrome(options=options)
-    driver.get(url)
-    time.sleep(3)
-    html = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
-    return html
+def get_html_selenium(url, parse=None):
+    """Get HTML using a pooled Selenium WebDriver"""
+    with span("selenium", url=url), browser_pool.driver() as driver:
+        with span("selenium.load"):
+            driver.get(url)
+            time.sleep(3)
+        return _parse_page_source(driver, parse)
 
 
-def get_html_selenium_undetected(url):
+def get_html_selenium_undetected(url, parse=None):
     """Get HTML using undetected-chromedriver if available, fallback to Selenium otherwise"""
     try:
-        import undetected_chromedriver as uc
-
-        options = _get_chrome_options()
-        driver = uc.Chrome(options=options)
-        driver.get(url)
-        time.sleep(3)
-        html = BeautifulSoup(driver.page_source, "html.parser")
-        driver.quit()
-        return html
+        with span("selenium", url=url, undetected=True), undetected_browser_pool.driver() as driver:
+            with span("selenium.load"):
+                driver.get(url)
+                time.sleep(3)
+            return _parse_page_source(driver, parse)
     except ImportError:
         logging.warning("undetected-chromedriver not available, using standard Selenium")
-        return get_html_selenium(url)
-
-
-def _get_chrome_options():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-browser-side-navigation")
-    options.add_argument("--disable-features=VizDisplayCompositor")
-    return options
+        return get_html_selenium(url, parse)
+
+
+def _parse_page_source(driver, parse):
+    parse = parse or full_document()
+    with span("parse", step=parse.key):
+        return parse(driver.page_source)
+
+
+def _sleep(seconds, reason):
+    with span("sleep", reason=reason, seconds=seconds):
+        time.sleep(seconds)
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from app.encoding import compress_variants
+
+logger = logging.getLogger(__name__)
+
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """An immutable, versioned set of flavors grouped by source"""
+
+    version: int
+    date: str
+    sources: MappingProxyType
+    published_at: float = field(default_factory=time.time)
+    data: tuple = field(init=False)
+    calendar_dates: frozenset = field(init=False)  # ISO dates with at least one flavor
+
+    def __post_init__(self):
+        flavors = tuple(flavor for flavors in self.sources.values() for flavor in flavors)
+        object.__setattr__(self, "data", flavors)
+        calendar = {f["date"] for f in flavors if isinstance(f.get("date"), str)}
+        object.__setattr__(self, "calendar_dates", frozenset(filter(ISO_DATE.match, calendar)))
+        object.__setattr__(self, "_views", {})
+        object.__setattr__(self, "_renditions", {})
+
+    def flavors_for(self, date=None):
+        """Flavors to show for ``date`` (default: the snapshot's date).
+
+        Computed once for the snapshot's date and the dates in its calendars. Any other date has
+        nothing to show and is built per call, so requests for arbitrary dates can't grow the
+        cache.
+        """
+        date = date or self.date
+        view = self._views.get(date)
+        if view is None:
+            view = tuple(select_flavors(self.data, date, self.date))
+            if self._cacheable(date):
+                self._views[date] = view
+        return view
+
+    def rendition(self, date=None):
+        """``flavors_for(date)`` serialized once into response-ready bytes.
+
+        Holds the JSON body under ``"identity"``, its ``"gzip"`` and (when brotli is installed)
+        ``"br"`` encodings, and a strong ``"etag"``.
+        """
+        date = date or self.date
+        rendition = self._renditions.get(date)
+        if rendition is None:
+            rendition = _render(self.version, date, self.flavors_for(date))
+            if self._cacheable(date):
+                self._renditions[date] = rendition
+        return rendition
+
+    def etag(self, date=None):
+        """Strong ETag for ``flavors_for(date)``: the snapshot version plus a content digest.
+
+        The digest keeps tags distinct across restarts, when versions start over.
+        """
+        return self.rendition(date)["etag"]
+
+    def _cacheable(self, date):
+        return date == self.date or date in self.calendar_dates
+
+
+def _render(version, date, flavors):
+    # Same separators and escaping as FastAPI's JSONResponse
+    body = json.dumps(
+        list(flavors), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    digest = hashlib.sha256(date.encode() + b":" + body).hexdigest()[:16]
+    return {**compress_variants(body), "etag": f'"{version}-{digest}"'}
+
+
+def select_flavors(flavors, date, snapshot_date):
+    """Pick the flavors to show for ``date``.
+
+    Calendar sources report several dated entries per location; only the entry for ``date`` is
+    kept. When asking for the snapshot's own date and a location has no entry for it, its next
+    upcoming entry (or, failing that, its latest one) is shown instead. Flavors without an ISO
+    date are treated as belonging to the snapshot's date.
+    """
+    by_location = {}
+    for flavor in flavors:
+        by_location.setdefault(flavor.get("location"), []).append(flavor)
+    selected = []
+    for entries in by_location.values():
+        dated = [f for f in entries if isinstance(f.get("date"), str) and ISO_DATE.match(f["date"])]
+        if not dated:
+            if date == snapshot_date:
+                selected.extend(entries)
+            continue
+        exact = [f for f in dated if f["date"] == date]
+        if exact:
+            selected.extend(exact)
+        elif date == snapshot_date:
+            upcoming = sorted((f for f in dated if f["date"] > date), key=lambda f: f["date"])
+            selected.append(upcoming[0] if upcoming else max(dated, key=lambda f: f["date"]))
+    return selected
+
+
+class SnapshotStore:
+    """Holds the current flavor snapshot and coordinates refreshes.
+
+    Readers get the current snapshot with a single reference read and never block. Writers
+    build a complete new snapshot and swap it in, so a reader never sees a half-updated one.
+    At most one refresh runs at a time.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._version = 0
+        self._notified = 0
+        self._publish_lock = threading.Lock()
+        self._notify_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Call ``listener(snapshot)`` after every publish, in publish order.
+
+        Listeners run after the publish lock is released, so a slow one (a disk write, say)
+        never holds up the next publish. If a newer snapshot lands first, the older one is
+        skipped and listeners only see the newer one.
+        """
+        self._listeners.append(listener)
+
+    def current(self):
+        """Return the latest snapshot, or None if nothing has been published yet"""
+        return self._snapshot
+
+    def publish(self, date, sources):
+        """Publish ``sources`` (name -> flavors) for ``date`` as a new snapshot version.
+
+        Returns the current snapshot unchanged, without notifying listeners, when it already
+        holds the same flavors for ``date``.
+        """
+        return self.notify(self.swap(date, sources))
+
+    def swap(self, date, sources):
+        """Like publish() but without notifying listeners; pass the result to notify()"""
+        with self._publish_lock:
+            return self._swap(date, sources)
+
+    def notify(self, snapshot):
+        """Call the listeners for ``snapshot`` unless it was already notified or superseded"""
+        with self._notify_lock:
+            if snapshot is not self._snapshot or snapshot.version <= self._notified:
+                return snapshot
+            self._notified = snapshot.version
+            for listener in self._listeners:
+                try:
+                    listener(snapshot)
+                except Exception as err:
+                    logger.error(f"Snapshot listener {listener!r} failed", exc_info=err)
+        return snapshot
+
+    def update_source(self, date, name, flavors):
+        """Replace a single source's flavors in the current snapshot.
+
+        Ignored (returns None) when the current snapshot is for a different date.
+        """
+        with self._publish_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.date != date:
+                return None
+            sources = dict(snapshot.sources)
+            sources[name] = flavors
+            snapshot = self._swap(date, sources)
+        return self.notify(snapshot)
+
+    def is_refreshing(self):
+        return self._refresh_lock.locked()
+
+    def refresh(self, refresh_fn):
+        """Run ``refresh_fn`` unless a refresh is already in flight; returns whether it ran"""
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("Refresh already in progress, skipping")
+            return False
+        try:
+            refresh_fn()
+        except Exception as err:
+            logger.error("Flavor refresh failed", exc_info=err)
+        finally:
+            self._refresh_lock.release()
+        return True
+
+    def refresh_in_background(self, refresh_fn):
+        """Start ``refresh_fn`` on a background thread unless a refresh is already in flight"""
+        if self.is_refreshing():
+            return False
+        threading.Thread(
+            target=self.refresh, args=(refresh_fn,), name="flavor-refresh", daemon=True
+        ).start()
+        return True
+
+    def _swap(self, date, sources):
+        frozen = {name: tuple(flavors) for name, flavors in sources.items()}
+        current = self._snapshot
+        if current is not None and current.date == date and dict(current.sources) == frozen:
+            # Same flavors: keep the version so ETags, event clients and history stay put
+            logger.debug(f"Snapshot v{current.version} for {date} is unchanged, not republishing")
+            return current
+        self._version += 1
+        snapshot = Snapshot(self._version, date, MappingProxyType(frozen))
+        snapshot.rendition()  # Serialize and compress today's view before anyone reads it
+        self._snapshot = snapshot
+        logger.info(
+            f"Published snapshot v{snapshot.version} for {date} with {len(snapshot.data)} flavor(s)"
+        )
+        return snapshot
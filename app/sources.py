@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+CENTRAL = ZoneInfo("America/Chicago")
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+DEFAULT_RETRY_INTERVAL = 15 * 60  # seconds
+DEFAULT_SCHEDULE = "08:00"
+
+
+def next_central_midnight(now):
+    """Timestamp of the first US Central midnight after ``now``, when "today" changes"""
+    tomorrow = datetime.fromtimestamp(now, CENTRAL).date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=CENTRAL).timestamp()
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    """When one source is scraped again.
+
+    ``ttl`` is how long a successful scrape stays fresh, ``schedule`` holds daily (hour, minute)
+    times in US Central at which it is scraped regardless, and ``retry_interval`` is how long
+    to wait after a failed scrape.
+    """
+
+    ttl: float = DEFAULT_TTL
+    schedule: tuple = ((8, 0),)
+    retry_interval: float = DEFAULT_RETRY_INTERVAL
+
+    def last_scheduled(self, now):
+        """Timestamp of the latest schedule time at or before ``now``, or None"""
+        local = datetime.fromtimestamp(now, CENTRAL)
+        times = []
+        for hour, minute in self.schedule:
+            at = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            times.append(at if at <= local else at - timedelta(days=1))
+        return max(times).timestamp() if times else None
+
+    def next_scheduled(self, now):
+        """Timestamp of the first schedule time after ``now``, or None"""
+        local = datetime.fromtimestamp(now, CENTRAL)
+        times = []
+        for hour, minute in self.schedule:
+            at = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            times.append(at if at > local else at + timedelta(days=1))
+        return min(times).timestamp() if times else None
+
+
+@dataclass(frozen=True)
+class SourceEntry:
+    """The last good flavors from one source and the state of its latest scrape"""
+
+    flavors: tuple = ()
+    date: str | None = None  # Central date of the successful scrape
+    fetched_at: float | None = None
+    expires_at: float = 0.0
+    failed_at: float | None = None  # Set while the latest attempt has failed
+
+    def covers(self, date):
+        """Whether these flavors can be shown for ``date``: scraped that day or dated for it"""
+        return self.date == date or any(f.get("date") == date for f in self.flavors)
+
+
+def _parse_schedule(value):
+    times = [value] if isinstance(value, str) else list(value or [])
+    schedule = []
+    for text in times:
+        hour, minute = map(int, str(text).split(":"))
+        schedule.append((hour, minute))
+    return tuple(schedule)
+
+
+def load_policies(names, settings, default_schedule=DEFAULT_SCHEDULE):
+    """Policies for ``names`` from the ``sources`` section of config.yaml.
+
+    ``sources.defaults`` applies to every source and each source's own section overrides it.
+    ``default_schedule`` (the old ``cache_refresh_time``) is used when neither sets a schedule.
+    """
+    settings = settings or {}
+    unknown = set(settings) - set(names) - {"defaults"}
+    if unknown:
+        logger.warning(f"Ignoring settings for unknown source(s): {', '.join(sorted(unknown))}")
+    defaults = {"schedule": default_schedule, **(settings.get("defaults") or {})}
+    policies = {}
+    for name in names:
+        merged = {**defaults, **(settings.get(name) or {})}
+        policies[name] = SourcePolicy(
+            ttl=float(merged.get("ttl", DEFAULT_TTL)),
+            schedule=_parse_schedule(merged.get("schedule")),
+            retry_interval=float(merged.get("retry_interval", DEFAULT_RETRY_INTERVAL)),
+        )
+    return policies
+
+
+class SourceCache:
+    """Per-source flavors with independent freshness, merged into snapshots on demand.
+
+    A source is due for scraping when it has never succeeded, its TTL has run out, one of its
+    schedule times has passed since it was fetched, or its flavors don't cover today; a failed
+    source is due again once its retry interval has passed. Failed scrapes keep serving the
+    last good flavors as long as they cover the day.
+    """
+
+    def __init__(self, policies):
+        self.policies = dict(policies)
+        self._entries = {name: SourceEntry() for name in self.policies}
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Call ``listener(name, entry)`` after every successful scrape is recorded"""
+        self._listeners.append(listener)
+
+    def entry(self, name):
+        return self._entries[name]
+
+    def is_due(self, name, today, now=None):
+        now = time.time() if now is None else now
+        entry = self._entries[name]
+        policy = self.policies[name]
+        if entry.failed_at is not None:
+            return now >= entry.failed_at + policy.retry_interval
+        if entry.fetched_at is None or now >= entry.expires_at:
+            return True
+        scheduled = policy.last_scheduled(now)
+        if scheduled is not None and entry.fetched_at < scheduled:
+            return True
+        return not entry.covers(today)
+
+    def due(self, today, now=None):
+        """Names of the sources to scrape now, in configured order"""
+        return [name for name in self.policies if self.is_due(name, today, now)]
+
+    def next_due(self, now=None):
+        """Earliest timestamp at which a source becomes due, or None.
+
+        Never later than the next Central midnight: a new day can make sources due (their
+        flavors no longer cover it) and needs a snapshot of its own.
+        """
+        now = time.time() if now is None else now
+        times = []
+        for name, policy in self.policies.items():
+            entry = self._entries[name]
+            if entry.failed_at is not None:
+                times.append(entry.failed_at + policy.retry_interval)
+                continue
+            times.append(entry.expires_at)
+            scheduled = policy.next_scheduled(now)
+            if scheduled is not None:
+                times.append(scheduled)
+        return min(times + [next_central_midnight(now)]) if times else None
+
+    def record_success(self, name, flavors, date, now=None):
+        now = time.time() if now is None else now
+        entry = SourceEntry(
+            tuple(flavors), date, now, now + self.policies[name].ttl, failed_at=None
+        )
+        with self._lock:
+            self._entries[name] = entry
+        for listener in self._listeners:
+            try:
+                listener(name, entry)
+            except Exception as err:
+                logger.error(f"Source listener {listener!r} failed", exc_info=err)
+        return entry
+
+    def record_failure(self, name, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entries[name] = replace(self._entries[name], failed_at=now)
+        retry = self.policies[name].retry_interval
+        logger.warning(
+            f"Source {name} failed, keeping its last flavors and retrying in {retry:.0f}s"
+        )
+
+    def restore(self, name, flavors, date, fetched_at):
+        """Seed a source from storage without notifying listeners; unknown names are ignored"""
+        if name not in self.policies:
+            return
+        entry = SourceEntry(tuple(flavors), date, fetched_at, fetched_at + self.policies[name].ttl)
+        with self._lock:
+            self._entries[name] = entry
+
+    def expire(self, names=None):
+        """Make sources (default: all) due on the next refresh"""
+        with self._lock:
+            for name in names or list(self._entries):
+                self._entries[name] = replace(self._entries[name], expires_at=0.0, failed_at=None)
+
+    def sources_for(self, date):
+        """{name: flavors} for every source with flavors covering ``date``, in configured order"""
+        with self._lock:
+            return self._merge(date)
+
+    def publish(self, store, date):
+        """Publish the merged sources for ``date`` to ``store`` as a new snapshot.
+
+        Merged and swapped under this cache's lock so concurrent publishes can't swap in an older
+        merge; the store's listeners run after it is released.
+        """
+        with self._lock:
+            snapshot = store.swap(date, self._merge(date))
+        return store.notify(snapshot)
+
+    def _merge(self, date):
+        return {
+            name: entry.flavors
+            for name, entry in self._entries.items()
+            if entry.flavors and entry.covers(date)
+        }
@@ -0,0 +1,260 @@
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICE_NAME = "daily-flavors"
+DEFAULT_PATH = "data/traces.jsonl"
+DEFAULT_ENDPOINT = "http://localhost:4318/v1/traces"
+FLUSH_INTERVAL = 5  # Seconds between OTLP batch posts
+MAX_BATCH = 512  # Spans per OTLP post; a full batch is posted right away
+EXPORT_TIMEOUT = 5
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation; children started inside it share its trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start_ns", "end_ns")
+
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.span = Span(name, _current_span.get(), attributes)
+        self.token = None
+
+    def __enter__(self):
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end_ns = time.time_ns()
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            self.span.set("error", f"{exc_type.__name__}: {exc}")
+        self.tracer.export(self.span)
+        return False
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per finished span to a local file (relative to the project root)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", buffering=1, encoding="utf-8")  # Line-buffered
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class OtlpExporter:
+    """Posts spans as OTLP/HTTP JSON to a collector, batched on a background thread.
+
+    Spans are only appended to a buffer on the traced thread, so a slow or missing collector
+    never delays a scrape; a failed post drops its batch.
+    """
+
+    def __init__(self, endpoint=DEFAULT_ENDPOINT, flush_interval=FLUSH_INTERVAL):
+        self.endpoint = endpoint
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+        self._thread.start()
+
+    def export(self, span):
+        with self._lock:
+            self._buffer.append(span)
+            full = len(self._buffer) >= MAX_BATCH
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        while True:
+            with self._lock:
+                batch, self._buffer = self._buffer[:MAX_BATCH], self._buffer[MAX_BATCH:]
+            if not batch:
+                return
+            try:
+                requests.post(self.endpoint, json=otlp_payload(batch), timeout=EXPORT_TIMEOUT)
+            except requests.RequestException as err:
+                logger.warning(f"Dropped {len(batch)} span(s), collector unavailable: {err}")
+
+    def shutdown(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(EXPORT_TIMEOUT)
+        self.flush()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+class Tracer:
+    """Creates spans when an exporter is set; otherwise ``span`` costs one attribute check"""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    def span(self, name, **attributes):
+        """Context manager timing ``name`` as a child of the current span"""
+        if self.exporter is None:
+            return _NOOP
+        return _ActiveSpan(self, name, attributes)
+
+    def export(self, span):
+        exporter = self.exporter
+        if exporter is None:
+            return
+        try:
+            exporter.export(span)
+        except Exception as err:
+            logger.warning(f"Could not export span {span.name}: {err}")
+
+    def set_exporter(self, exporter):
+        previous, self.exporter = self.exporter, exporter
+        if previous is not None:
+            previous.shutdown()
+
+    def shutdown(self):
+        """Flush and close the exporter; spans are no-ops afterwards"""
+        self.set_exporter(None)
+
+
+tracer = Tracer()
+span = tracer.span
+
+
+def current_span():
+    return _current_span.get()
+
+
+def otlp_payload(spans):
+    """OTLP/JSON ExportTraceServiceRequest for ``spans``"""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [_otlp_span(s) for s in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def _otlp_span(s):
+    attributes = {key: value for key, value in s.attributes.items() if key != "error"}
+    return {
+        "traceId": s.trace_id,
+        "spanId": s.span_id,
+        "parentSpanId": s.parent_id or "",
+        "name": s.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in attributes.items()],
+        "status": (
+            {"code": 2, "message": s.attributes["error"]}
+            if "error" in s.attributes
+            else {"code": 1}
+        ),
+    }
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def configure_tracing(settings):
+    """Apply the ``tracing`` section of config.yaml"""
+    if not settings.get("enabled", False):
+        tracer.set_exporter(None)
+        return
+    kind = settings.get("exporter", "jsonl")
+    if kind == "jsonl":
+        exporter = JsonLinesExporter(settings.get("path", DEFAULT_PATH))
+    elif kind == "otlp":
+        exporter = OtlpExporter(
+            settings.get("endpoint", DEFAULT_ENDPOINT),
+            settings.get("flush_interval", FLUSH_INTERVAL),
+        )
+    else:
+        raise ValueError(f"Unknown tracing exporter {kind!r}, expected 'jsonl' or 'otlp'")
+    tracer.set_exporter(exporter)
+    logger.info(f"Tracing enabled with the {kind} exporter")
@@ -0,0 +1,91 @@
+"""Requests/sec for /api/flavors: per-request JSON encoding vs. pre-serialized snapshot bytes.
+
+Run from the project root:
+
+    python -m benchmarks.api_benchmark [--seconds 3]
+
+Requests go through the full ASGI app in-process (no sockets), so the numbers isolate the
+application's own cost. "before" is a route returning the flavor list for FastAPI to encode on
+every request, the way /api/flavors used to. The gzip case includes the client's own
+decompression.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from unittest.mock import patch
+
+import httpx
+
+from app.main import create_app
+from app.scrapers.utils import get_central_date_string
+
+
+def sample_sources(locations=40, days=30):
+    """A snapshot about the size of a full day's scrape with Culver's calendars"""
+    today = get_central_date_string()
+    return {
+        "culvers": [
+            {
+                "location": f"Culvers ({i})",
+                "flavor": f"Flavor {i}-{day}",
+                "description": "Vanilla Fresh Frozen Custard swirled with caramel and pecans.",
+                "date": today if day == 0 else f"2999-01-{day:02d}",
+                "url": f"https://www.culvers.com/restaurants/location-{i}",
+            }
+            for i in range(locations)
+            for day in range(days)
+        ]
+    }
+
+
+def build_app():
+    app = create_app({})
+    store = app.state.flavors_store
+    store.publish(get_central_date_string(), sample_sources())
+
+    @app.get("/bench/flavors-encoded")
+    async def encoded():
+        return list(store.current().flavors_for())
+
+    return app
+
+
+async def measure(client, path, headers, seconds):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        count += 1
+    return count / seconds
+
+
+async def run(seconds):
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    cases = [
+        ("before: encoded per request", "/bench/flavors-encoded", {}),
+        ("after: identity bytes", "/api/flavors", {"Accept-Encoding": "identity"}),
+        ("after: gzip bytes", "/api/flavors", {"Accept-Encoding": "gzip"}),
+    ]
+    # No lifespan: nothing is scraped or scheduled while measuring
+    with patch.object(app.state.flavors_store, "refresh_in_background"):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, path, headers in cases:
+                await measure(client, path, headers, 0.2)  # Warm up
+                rate = await measure(client, path, headers, seconds)
+                print(f"{label:<30} {rate:>8.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(run(args.seconds))
+
+
+if __name__ == "__main__":
+    main()
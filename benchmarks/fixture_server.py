@@ -0,0 +1,212 @@
+"""A local HTTP server that serves stand-in upstream pages, so scrapers can run offline.
+
+    with FixtureServer() as server, redirect_scrapers(server.url):
+        flavors = scrape_kopps()
+
+Fixtures live in ``benchmarks/fixtures`` and are served on the same paths as the real sites.
+They are synthetic, written by generate_fixtures.py: the markup each scraper reads, padded with
+filler, rather than recordings of the sites. Today's date is written into them as placeholders
+(``{{date}}``, ``{{weekday}}``, ...) that are filled in when the server starts, so the scrapers'
+"today" filters match on any day. Change generate_fixtures.py and rerun it to update them.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+from app.scrapers import bubbas, culvers, kopps, murfs, oscars
+from app.scrapers.http_cache import parse_cache, response_cache
+from app.scrapers.throttle import HostThrottle
+from app.scrapers.utils import get_central_time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BUILD_ID = "bench-build"  # The Next.js build ID in the Culver's fixtures
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json"
+SITES = ("culvers", "kopps", "murfs", "oscars", "bubbas")
+# (site, method, path pattern, fixture, content type)
+ROUTES = [
+    ("culvers", "GET", r"/restaurants/[\w-]+", "culvers_restaurant.html", HTML),
+    (
+        "culvers",
+        "GET",
+        rf"/_next/data/{BUILD_ID}/restaurants/[\w-]+\.json",
+        "culvers_data_route.json",
+        JSON,
+    ),
+    ("kopps", "GET", r"/", "kopps.html", HTML),
+    ("murfs", "GET", r"/flavorForecast", "murfs.html", HTML),
+    ("oscars", "GET", r"/index\.php/flavors", "oscars.html", HTML),
+    ("bubbas", "POST", r"/graphql", "bubbas_graphql.json", JSON),
+]
+
+
+def placeholders(now=None):
+    """Values for the date placeholders in the fixtures"""
+    now = now or get_central_time()
+    return {
+        "date": now.strftime("%Y-%m-%d"),
+        "utc_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "weekday": now.strftime("%a"),
+        "weekday_long": now.strftime("%A"),
+        "month_long": now.strftime("%B"),
+        "month_abbr": now.strftime("%b") + ".",
+        "day": str(now.day),
+        "day2": now.strftime("%d"),
+    }
+
+
+def render(text, values):
+    return re.sub(r"\{\{(\w+)\}\}", lambda match: values[match.group(1)], text)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Streaming scrapers hang up once they have what they need
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FixtureServer:
+    """Serves the fixtures on 127.0.0.1 from a background thread.
+
+    ``latency`` adds a fixed delay (seconds) to every response to stand in for the network.
+    ``sites`` limits the routes to some of ``SITES``. ``requests`` counts the requests served
+    per path. Subclasses change what is sent by overriding ``respond``.
+    """
+
+    def __init__(self, latency=0.0, fixtures_dir=FIXTURES_DIR, sites=SITES):
+        values = placeholders()
+        self.latency = latency
+        self.requests = {}
+        self._routes = []
+        for site, method, pattern, name, content_type in ROUTES:
+            if site not in sites:
+                continue
+            with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+                body = render(f.read(), values).encode("utf-8")
+            self._routes.append((method, re.compile(pattern + r"\Z"), body, content_type))
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fixture-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def match(self, method, path):
+        """``(body, content type)`` for a request, or None"""
+        for route_method, pattern, body, content_type in self._routes:
+            if route_method == method and pattern.match(path):
+                return body, content_type
+        return None
+
+    def respond(self, handler, method, path):
+        """Send the response for one request"""
+        if self.latency:
+            time.sleep(self.latency)
+        found = self.match(method, path)
+        if found is None:
+            send(handler, 404, b"Not Found", "text/plain")
+        else:
+            send(handler, 200, *found)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real sites
+
+            def do_GET(self):
+                self._reply("GET")
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._reply("POST")
+
+            def _reply(self, method):
+                path = urlparse(self.path).path
+                with server._lock:
+                    server.requests[path] = server.requests.get(path, 0) + 1
+                server.respond(self, method, path)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def send(handler, status, body, content_type, headers=None):
+    handler.send_response(status)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(len(body)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+@contextmanager
+def redirect_scrapers(base_url, paced=False):
+    """Point every scraper at ``base_url`` (or a ``{site: base_url}`` dict) with empty caches.
+
+    Unless ``paced``, the app's per-host rate limiters and circuit breakers are swapped for
+    unlimited ones: the numbers should measure this code rather than the politeness delays.
+    """
+    urls = base_url if isinstance(base_url, dict) else dict.fromkeys(SITES, base_url)
+    locations = [
+        (name, urls["culvers"] + urlparse(url).path) for name, url in culvers.CULVERS_LOCATIONS
+    ]
+    patches = [
+        patch.object(culvers, "CULVERS_LOCATIONS", locations),
+        patch.object(culvers, "_build_id", None),
+        patch.object(kopps, "KOPPS_URL", urls["kopps"] + "/"),
+        patch.object(murfs, "MURFS_URL", urls["murfs"] + "/flavorForecast"),
+        patch.object(oscars, "OSCARS_URL", urls["oscars"] + "/index.php/flavors"),
+        patch.object(bubbas, "BUBBAS_URL", urls["bubbas"]),
+        patch.object(bubbas, "BUBBAS_GRAPHQL_ENDPOINT", urls["bubbas"] + "/graphql"),
+    ]
+    if not paced:
+        host_throttle = HostThrottle()
+        host_throttle.configure(rate=1e9, burst=1e9)
+        patches.append(patch("app.scrapers.utils.throttle", host_throttle))
+        patches.append(patch("app.scrapers.async_utils.throttle", host_throttle))
+    with ExitStack() as stack:
+        for p in patches:
+            stack.enter_context(p)
+        clear_caches()
+        try:
+            yield
+        finally:
+            clear_caches()
+
+
+def clear_caches():
+    """Forget cached responses, parses and the Culver's build ID between runs"""
+    response_cache.clear()
+    parse_cache.clear()
+    culvers._build_id = None
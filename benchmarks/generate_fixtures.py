@@ -0,0 +1,249 @@
+"""Generate the synthetic pages and API responses in benchmarks/fixtures.
+
+Run from the project root:
+
+    python -m benchmarks.generate_fixtures
+
+The fixtures are not recordings of the shops' sites. Each one reproduces only the markup its
+scraper reads: the Culver's ``__NEXT_DATA__`` script and data route, Kopp's "Today's Flavors"
+block, Murf's flavor-of-the-day spans, Oscar's calendar table with its Divi overlays and Bubba's
+GraphQL calendar. That markup is wrapped in generated filler (script tags, a navigation menu and
+repeated content cards) to bring each page to a plausible size. Benchmarks that use them measure
+the scrapers' code paths on pages of that size, not parse times on the sites' real DOM.
+
+Output is deterministic, so regenerating leaves the files unchanged unless this script changes.
+Today's date is written as placeholders that fixture_server.py fills in.
+"""
+
+import json
+import os
+
+from benchmarks.fixture_server import BUILD_ID, FIXTURES_DIR
+
+FLAVORS = [
+    "Turtle",
+    "Butter Pecan",
+    "Mint Explosion",
+    "Caramel Cashew",
+    "Devil's Food Cake",
+    "Raspberry Cheesecake",
+    "Chocolate Covered Strawberry",
+    "Georgia Peach",
+    "Salted Double Caramel Pecan",
+    "Oreo Cookie Overload",
+    "Andes Mint Avalanche",
+    "Cookie Dough Craving",
+    "Crazy for Cookie Dough",
+    "Snickers Swirl",
+    "Blackberry Cobbler",
+    "Dulce de Leche Cheesecake",
+    "Chocolate Volcano",
+    "Really Reese's",
+    "Red Raspberry",
+    "Mint Chip",
+    "Bananas Foster",
+    "Lemon Berry Layer Cake",
+    "Toffee Pecan",
+    "Double Strawberry",
+    "Espresso Toffee Bar",
+    "Caramel Fudge Cookie Dough",
+    "Coconut Cream Pie",
+    "Black Forest",
+    "Peanut Butter Cup",
+    "Key Lime Custard Pie",
+    "Pumpkin Pecan",
+]
+DESCRIPTION = "Vanilla Fresh Frozen Custard swirled with {} pieces and a ribbon of caramel."
+
+
+def _slug(name):
+    return name.lower().replace(" ", "-").replace("'", "")
+
+
+def _nav(items=60):
+    links = "".join(
+        f'<li class="menu-item menu-item-{i}"><a href="/page-{i}"><span>Menu item {i}</span></a></li>'
+        for i in range(items)
+    )
+    return f'<header class="site-header"><nav><ul class="menu">{links}</ul></nav></header>'
+
+
+def _cards(count):
+    return (
+        "<main>"
+        + "".join(
+            f'<section class="card"><h3 class="card-title">Section {i}</h3>'
+            '<p class="card-body">Fresh frozen custard made in small batches every day, served in '
+            f"cones, cups and sundaes {i}.</p>"
+            f'<img src="/wp-content/uploads/{i}.jpg" alt="Photo {i}" loading="lazy"></section>'
+            for i in range(count)
+        )
+        + "</main>"
+    )
+
+
+def _scripts(count, prefix):
+    return "".join(f'<script src="{prefix}/chunk-{i:03d}.js" defer></script>' for i in range(count))
+
+
+def culvers_page_props():
+    calendar = []
+    for i, flavor in enumerate(FLAVORS):
+        calendar.append(
+            {
+                "onDate": "{{date}}T00:00:00" if i == 0 else f"2999-01-{i:02d}T00:00:00",
+                "title": flavor,
+                "description": DESCRIPTION.format(flavor.lower()),
+                "flavorId": 100 + i,
+                "urlSlug": _slug(flavor),
+                "image": {
+                    "src": f"https://cdn.culverscdn.com/Menu/flavor-{100 + i}.png",
+                    "width": 400,
+                    "height": 400,
+                },
+            }
+        )
+    hours = [{"day": day, "open": "10:30", "close": "22:00"} for day in range(7)]
+    return {
+        "restaurantCalendar": {"flavors": calendar},
+        "restaurant": {"name": "Culver's of Example", "address": "123 Main St", "hours": hours},
+    }
+
+
+def culvers_restaurant(page_props):
+    next_data = {
+        "props": {"pageProps": page_props, "__N_SSP": True},
+        "page": "/restaurants/[slug]",
+        "query": {"slug": "example"},
+        "buildId": BUILD_ID,
+        "isFallback": False,
+        "gssp": True,
+        "scriptLoader": [],
+    }
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        "<title>Culver's Flavor of the Day</title>"
+        + _scripts(30, "/_next/static/chunks")
+        + '<script id="__NEXT_DATA__" type="application/json">'
+        + json.dumps(next_data)
+        + "</script></head><body>"
+        + _nav()
+        + _cards(400)
+        + "</body></html>\n"
+    )
+
+
+def kopps():
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        "<title>Kopp's Frozen Custard</title>"
+        + _scripts(12, "/wp-includes/js")
+        + "</head><body>"
+        + _nav()
+        + _cards(250)
+        + '<div class="wp-block-todays-flavors">'
+        + "<h2>Today's Flavors – {{weekday_long}}, {{month_long}} {{day}}</h2>"
+        + "<h3>Butter Pecan</h3><p>Buttery custard loaded with roasted pecans.</p>"
+        + "<h3>Grasshopper Fudge</h3><p>Mint custard with fudge and chocolate cookie pieces.</p>"
+        + "<h3>Shake of the Month</h3><p>Strawberry shortcake shake.</p></div>"
+        + _cards(100)
+        + "</body></html>\n"
+    )
+
+
+def murfs():
+    forecast = "".join(
+        f'<div class="forecastDay"><span class="forecastDate">Day {i}</span>'
+        f'<span class="forecastFlavor">{flavor}</span></div>'
+        for i, flavor in enumerate(FLAVORS)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        "<title>Flavor Forecast | Murf's Frozen Custard</title>"
+        + _scripts(8, "/js")
+        + "</head><body>"
+        + _nav(30)
+        + '<div class="flavorOfDay">'
+        + '<span class="subDateSpan">{{weekday_long}}, {{month_abbr}} {{day2}}</span>'
+        + '<span class="flavorOfDayWhiteSpan">Turtle Sundae</span>'
+        + '<span class="flavorDescriptionSpan">Vanilla custard with caramel, fudge and pecans.</span>'
+        + "</div>"
+        + forecast
+        + _cards(200)
+        + "</body></html>\n"
+    )
+
+
+def oscars():
+    later = list(enumerate(FLAVORS[1:], 1))
+    rows = "".join(
+        f'<tr><td>Day {i}</td><td><a id="overlay_unique_id_3{i:05d}" class="overlay-3{i:05d}">'
+        f"{flavor}</a></td></tr>"
+        for i, flavor in later
+    )
+    overlays = "".join(
+        f'<div id="divioverlay-3{i:05d}" class="divioverlay"><div class="et_pb_module">'
+        f"<h4>{flavor.upper()}</h4><p>{DESCRIPTION.format(flavor.lower())}</p></div></div>"
+        for i, flavor in later
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        "<title>Flavors | Oscar's Frozen Custard</title>"
+        + _scripts(15, "/wp-content/themes/Divi/js")
+        + "</head><body>"
+        + _nav()
+        + '<table class="flavor-calendar"><tr><th>Date</th><th>Flavor</th></tr>'
+        + '<tr><td>{{weekday}} {{day}}</td><td><a id="overlay_unique_id_300000" '
+        + 'class="overlay-300000">Turtle</a></td></tr>'
+        + rows
+        + "</table>"
+        + _cards(150)
+        + '<div id="divioverlay-300000" class="divioverlay"><div class="et_pb_module">'
+        + "<h4>TURTLE</h4><p>Vanilla custard with pecans, caramel and fudge.</p></div></div>"
+        + overlays
+        + "</body></html>\n"
+    )
+
+
+def bubbas_graphql():
+    events = [
+        {
+            "id": 9000 + i,
+            "name": flavor,
+            "description": DESCRIPTION.format(flavor.lower()),
+            # Today is the second event, after one dated far in the future
+            "startAt": "{{utc_date}}" if i == 1 else f"2999-01-{i or 31:02d}",
+            "calendarEventPageUrl": f"/events/{_slug(flavor)}",
+            "__typename": "CalendarEvent",
+        }
+        for i, flavor in enumerate(FLAVORS[:4])
+    ]
+    section = {
+        "id": 1332549,
+        "upcomingCalendarEvents": events,
+        "__typename": "CustomPageSection",
+    }
+    return {"data": {"customPageSection": section}}
+
+
+def generate(fixtures_dir=FIXTURES_DIR):
+    """Write every fixture to ``fixtures_dir``"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    page_props = culvers_page_props()
+    pages = {
+        "culvers_restaurant.html": culvers_restaurant(page_props),
+        "kopps.html": kopps(),
+        "murfs.html": murfs(),
+        "oscars.html": oscars(),
+    }
+    for name, text in pages.items():
+        with open(os.path.join(fixtures_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+    with open(os.path.join(fixtures_dir, "culvers_data_route.json"), "w", encoding="utf-8") as f:
+        json.dump({"pageProps": page_props, "__N_SSP": True}, f)
+    with open(os.path.join(fixtures_dir, "bubbas_graphql.json"), "w", encoding="utf-8") as f:
+        json.dump(bubbas_graphql(), f, indent=1)
+
+
+if __name__ == "__main__":
+    generate()
@@ -0,0 +1,301 @@
+"""Load test: the whole app, served by uvicorn, against simulated shop sites.
+
+Run from the project root:
+
+    python -m benchmarks.load_test [--scenario slow] [--site kopps:error_rate=0.5,error_status=403]
+        [--refreshes 3] [--clients 8] [--output results.json]
+
+The app runs with config.yaml's refresh, scraping and throttle settings (storage and tracing
+off). Every scraper is pointed at its simulated site (see upstream_simulator.py), shaped by
+``--scenario`` and per-site ``--site`` settings. After the startup warmup, refreshes are forced
+one after another while ``--clients`` concurrent clients read /api/flavors over HTTP. Reported:
+the warmup and each refresh's duration and sources, API latency percentiles, and the requests
+and faults each site saw.
+
+Without ``--browser``, Oscar's is left out and the Selenium fallback gives up at once instead of
+launching Chrome. The clients share the app's process, so compare runs with each other rather
+than reading the latencies as absolutes.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import httpx
+import uvicorn
+
+from app import main as app_main
+from app.metrics import SELENIUM_FALLBACKS
+from benchmarks.fixture_server import clear_caches, redirect_scrapers
+from benchmarks.upstream_simulator import SCENARIOS, Profile, UpstreamSimulator
+
+POLL_INTERVAL = 0.05  # seconds
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Nearest-rank percentiles of ``samples``, plus the maximum"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {f"p{p}": ordered[max(0, -(-len(ordered) * p // 100) - 1)] for p in points}
+    result["max"] = ordered[-1]
+    return result
+
+
+def parse_sites(specs, default):
+    """``--site name:key=value,...`` options as {site: Profile}"""
+    profiles = {}
+    for spec in specs:
+        site, sep, settings = spec.partition(":")
+        if not sep:
+            raise ValueError(f"Expected site:key=value,..., got {spec!r}")
+        profiles[site] = Profile.parse(settings, base=profiles.get(site, default))
+    return profiles
+
+
+def app_config(budget=None, scraper_timeout=None, browser=False):
+    config = app_main.load_config()
+    config.pop("storage", None)
+    config["tracing"] = {"enabled": False}
+    refresh = config.setdefault("refresh", {})
+    if budget is not None:
+        refresh["budget"] = budget
+    if scraper_timeout is not None:
+        refresh["scraper_timeout"] = scraper_timeout
+    pool = config.setdefault("scraping", {}).setdefault("browser_pool", {})
+    pool["prewarm"] = pool.get("prewarm", False) and browser
+    return config
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def selenium_fallbacks():
+    return int(sum(child.value for child in SELENIUM_FALLBACKS._children.values()))
+
+
+class AppServer:
+    """Runs an app under uvicorn on a background thread, lifespan included"""
+
+    def __init__(self, app):
+        self.url = f"http://127.0.0.1:{free_port()}"
+        port = int(self.url.rsplit(":", 1)[1])
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="load-test-app", daemon=True)
+
+    def start(self, timeout=30):
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("The app did not start")
+            time.sleep(POLL_INTERVAL)
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(10)
+
+
+async def read_flavors(client, stop, latencies, failures):
+    """One closed-loop client: request /api/flavors again as soon as the last answer arrives"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            response = await client.get("/api/flavors")
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            failures.append(time.perf_counter() - start)
+
+
+def wait_for_refresh(store, started):
+    """Seconds from ``started`` until the store has a snapshot and no refresh running"""
+    while store.current() is None or store.is_refreshing():
+        time.sleep(POLL_INTERVAL)
+    return time.perf_counter() - started
+
+
+def forced_refreshes(app, count):
+    store = app.state.flavors_store
+    results = []
+    for _ in range(count):
+        clear_caches()
+        app.state.sources.expire()  # Otherwise only stale or failed sources are scraped
+        start = time.perf_counter()
+        store.refresh(app.state.refresh)
+        snapshot = store.current()
+        results.append(
+            {
+                "seconds": round(time.perf_counter() - start, 3),
+                "sources": sorted(name for name, flavors in snapshot.sources.items() if flavors),
+            }
+        )
+    return results
+
+
+async def drive(app, server_url, clients, refreshes):
+    store = app.state.flavors_store
+    stop = asyncio.Event()
+    latencies, failures = [], []
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=server_url, timeout=30) as client:
+        readers = [
+            asyncio.create_task(read_flavors(client, stop, latencies, failures))
+            for _ in range(clients)
+        ]
+        warmup = await asyncio.to_thread(wait_for_refresh, store, started)
+        forced = await asyncio.to_thread(forced_refreshes, app, refreshes)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*readers)
+    durations = [result["seconds"] for result in forced]
+    return {
+        "refresh": {
+            "warmup_seconds": round(warmup, 3),
+            "runs": forced,
+            **percentiles(durations),
+        },
+        "api": {
+            "requests": len(latencies) + len(failures),
+            "failures": len(failures),
+            "requests_per_second": round((len(latencies) + len(failures)) / elapsed, 1),
+            **{f"{key}_ms": round(value, 2) for key, value in percentiles(latencies).items()},
+        },
+    }
+
+
+def run(
+    profiles,
+    default,
+    clients=8,
+    refreshes=3,
+    browser=False,
+    budget=None,
+    scraper_timeout=None,
+    request_timeout=None,
+    seed=None,
+):
+    config = app_config(budget, scraper_timeout, browser)
+    fallbacks_before = selenium_fallbacks()
+    with ExitStack() as stack:
+        upstream = stack.enter_context(UpstreamSimulator(profiles, default, seed))
+        # Each simulated site has its own port, so the app's real per-host pacing applies
+        stack.enter_context(redirect_scrapers(upstream.urls, paced=True))
+        if not browser:
+            scrapers = [(name, fn) for name, fn in app_main.SCRAPERS if name != "oscars"]
+            stack.enter_context(patch.object(app_main, "SCRAPERS", scrapers))
+            stack.enter_context(patch("app.scrapers.utils.get_html_selenium", return_value=None))
+            stack.enter_context(
+                patch("app.scrapers.async_utils.get_html_selenium", return_value=None)
+            )
+        if request_timeout is not None:
+            stack.enter_context(patch("app.scrapers.utils.REQUEST_TIMEOUT", request_timeout))
+            stack.enter_context(patch("app.scrapers.async_utils.REQUEST_TIMEOUT", request_timeout))
+        app = app_main.create_app(config)
+        # create_app applied config.yaml's INFO logging; keep the output to the report
+        for name in ("", "app", "httpx"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+        server = AppServer(app)
+        server.start()
+        try:
+            results = asyncio.run(drive(app, server.url, clients, refreshes))
+        finally:
+            server.stop()
+        results["upstream"] = upstream.stats()
+    results["upstream"]["selenium_fallbacks"] = selenium_fallbacks() - fallbacks_before
+    return results
+
+
+def report(results):
+    refresh = results["refresh"]
+    print(f"Warmup refresh: {refresh['warmup_seconds']:.2f}s")
+    for i, result in enumerate(refresh["runs"], 1):
+        print(f"Refresh {i}: {result['seconds']:.2f}s, sources: {', '.join(result['sources'])}")
+    if "p50" in refresh:
+        print(
+            f"Refresh p50 {refresh['p50']:.2f}s, p90 {refresh['p90']:.2f}s, max {refresh['max']:.2f}s"
+        )
+    api = results["api"]
+    print(
+        f"\n/api/flavors: {api['requests']} requests ({api['failures']} failed), "
+        f"{api['requests_per_second']:.0f}/s"
+    )
+    if "p50_ms" in api:
+        print(
+            f"Latency p50 {api['p50_ms']:.1f}ms, p90 {api['p90_ms']:.1f}ms, "
+            f"p99 {api['p99_ms']:.1f}ms, max {api['max_ms']:.1f}ms"
+        )
+    upstream = dict(results["upstream"])
+    print(f"\nSelenium fallbacks: {upstream.pop('selenium_fallbacks')}")
+    print(f"{'site':<10} {'requests':>9} {'hang':>6} {'429':>6} {'error':>6} {'truncated':>10}")
+    for site, stats in upstream.items():
+        print(
+            f"{site:<10} {stats['requests']:>9} {stats['hang']:>6} {stats['rate_limited']:>6} "
+            f"{stats['error']:>6} {stats['truncated']:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="healthy")
+    parser.add_argument(
+        "--site",
+        action="append",
+        default=[],
+        metavar="SITE:KEY=VALUE,...",
+        help="override the scenario for one site, e.g. kopps:error_rate=0.5,error_status=403",
+    )
+    parser.add_argument("--clients", type=int, default=8, help="concurrent /api/flavors readers")
+    parser.add_argument("--refreshes", type=int, default=3, help="refreshes forced after warmup")
+    parser.add_argument("--browser", action="store_true", help="include Oscar's and Selenium")
+    parser.add_argument("--budget", type=float, help="override refresh.budget (seconds)")
+    parser.add_argument("--scraper-timeout", type=float, help="override refresh.scraper_timeout")
+    parser.add_argument("--request-timeout", type=float, help="upstream request timeout (seconds)")
+    parser.add_argument("--seed", type=int, help="make the injected faults repeatable")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    default = Profile(**SCENARIOS[args.scenario])
+    try:
+        profiles = parse_sites(args.site, default)
+    except (TypeError, ValueError) as err:
+        parser.error(str(err))
+    results = run(
+        profiles,
+        default,
+        clients=args.clients,
+        refreshes=args.refreshes,
+        browser=args.browser,
+        budget=args.budget,
+        scraper_timeout=args.scraper_timeout,
+        request_timeout=args.request_timeout,
+        seed=args.seed,
+    )
+    results["meta"] = {
+        "scenario": args.scenario,
+        "sites": {site: vars(profile) for site, profile in profiles.items()},
+        "clients": args.clients,
+        "browser": args.browser,
+    }
+    report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Offline benchmarks for scrapers, the full refresh, parsing, serialization and /api/flavors.
+
+Run from the project root:
+
+    python -m benchmarks.offline_benchmark [--rounds 5] [--output results.json]
+    python -m benchmarks.offline_benchmark --compare benchmarks/baseline.json [--max-regression 0.25]
+
+Scrapers fetch synthetic pages from a local fixture server (see fixture_server.py) with empty
+caches every round, so the numbers are reproducible and need no network. The pages carry the
+markup each scraper reads inside generated filler (see generate_fixtures.py), not the sites'
+real DOM, so use the results to compare runs of this code, not to predict production parse
+times. Oscar's needs Chrome and only runs with ``--browser``; its page-source parse is measured
+either way. Timings are in milliseconds (lower is better), throughput in requests per second
+(higher is better).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+import httpx
+
+from app import main as app_main
+from app.encoding import brotli
+from app.scrapers import bubbas, culvers, kopps, murfs, oscars
+from app.scrapers.parsing import HTML_PARSER
+from app.scrapers.utils import get_central_date_string, get_central_time
+from app.snapshot import SnapshotStore
+from benchmarks.api_benchmark import measure
+from benchmarks.fixture_server import BUILD_ID, FixtureServer, clear_caches, redirect_scrapers
+
+SCRAPERS = [
+    ("culvers", culvers.scrape_culvers),
+    ("kopps", kopps.scrape_kopps),
+    ("murfs", murfs.scrape_murfs),
+    ("bubbas", bubbas.scrape_bubbas),
+]
+
+
+def time_rounds(fn, rounds):
+    """Median and fastest of ``rounds`` calls, in milliseconds; caches are cleared before each"""
+    samples = []
+    for _ in range(rounds):
+        clear_caches()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def check(name, fn):
+    """Run ``fn`` once and fail loudly if the fixtures no longer produce flavors"""
+    clear_caches()
+    result = fn()
+    if not result:
+        raise RuntimeError(f"{name} returned nothing from the fixtures; are they out of date?")
+    return result
+
+
+def parse_stages(server):
+    """Each site's parse work on its fixture page, without any I/O"""
+    today = get_central_time()
+
+    def body(method, path):
+        return server.match(method, path)[0].decode("utf-8")
+
+    culvers_page = body("GET", "/restaurants/sussex")
+    data_route = body("GET", f"/_next/data/{BUILD_ID}/restaurants/sussex.json")
+    kopps_page = body("GET", "/")
+    murfs_page = body("GET", "/flavorForecast")
+    oscars_page = body("GET", "/index.php/flavors")
+    return [
+        (
+            "parse.culvers_page",
+            lambda: culvers._parse_culvers_calendar(
+                json.loads(culvers.NEXT_DATA_PARSE(culvers_page))
+            ),
+        ),
+        (
+            "parse.culvers_data_route",
+            lambda: culvers._parse_culvers_calendar({"props": json.loads(data_route)}),
+        ),
+        ("parse.kopps", lambda: kopps._parse_kopps(kopps.KOPPS_PARSE(kopps_page))),
+        ("parse.murfs", lambda: murfs._parse_murfs(murfs.MURFS_PARSE(murfs_page))),
+        ("parse.oscars", lambda: oscars._extract_flavors_from_page_source(oscars_page, today)),
+    ]
+
+
+def api_throughput(sources, seconds):
+    """Requests per second for /api/flavors over in-process ASGI, by encoding"""
+    app = app_main.create_app({})
+    app.state.flavors_store.publish(get_central_date_string(), sources)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for encoding in ("identity", "gzip"):
+                headers = {"Accept-Encoding": encoding}
+                await measure(client, "/api/flavors", headers, 0.2)  # Warm up
+                rate = await measure(client, "/api/flavors", headers, seconds)
+                results[f"api.flavors.{encoding}"] = {"requests_per_second": round(rate, 1)}
+
+    with patch.object(app.state.flavors_store, "refresh_in_background"):
+        asyncio.run(run())
+    return results
+
+
+def run(rounds, api_seconds, browser):
+    scrapers = SCRAPERS + ([("oscars", oscars.scrape_oscars)] if browser else [])
+    results = {}
+    with FixtureServer() as server, redirect_scrapers(server.url):
+        sources = {}
+        for name, scrape in scrapers:
+            sources[name] = check(name, scrape)
+            results[f"scraper.{name}"] = time_rounds(scrape, rounds)
+
+        with patch.object(app_main, "SCRAPERS", scrapers):
+            check("scrape_all", lambda: app_main.scrape_all({}))
+            results["scrape_all"] = time_rounds(lambda: app_main.scrape_all({}), rounds)
+
+        for name, stage in parse_stages(server):
+            check(name, stage)
+            results[name] = time_rounds(stage, rounds * 4)
+
+    today = get_central_date_string()
+    results["serialize.snapshot"] = time_rounds(
+        lambda: SnapshotStore().publish(today, sources), rounds * 4
+    )
+    results.update(api_throughput(sources, api_seconds))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "html_parser": HTML_PARSER,
+            "brotli": brotli is not None,
+            "rounds": rounds,
+            "browser": browser,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, max_regression):
+    """Print each metric against the baseline; return the names that regressed too far"""
+    regressions = []
+    print(f"\n{'metric':<28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, values in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        if "median_ms" in values:
+            old, new = before["median_ms"], values["median_ms"]
+            worse = (new - old) / old if old else 0.0
+        else:
+            old, new = before["requests_per_second"], values["requests_per_second"]
+            worse = (old - new) / old if old else 0.0
+        flag = "  <-- regression" if worse > max_regression else ""
+        print(f"{name:<28} {old:>12.2f} {new:>12.2f} {-worse:>+8.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--api-seconds", type=float, default=2)
+    parser.add_argument("--browser", action="store_true", help="also run Oscar's in Chrome")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="with --compare, exit non-zero if a metric is this much worse (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+    # Importing app.main applied config.yaml's INFO logging; keep the output to the results
+    for name in ("", "app", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    results = run(args.rounds, args.api_seconds, args.browser)
+    for name, values in results["results"].items():
+        unit, value = next(iter(values.items()))
+        print(f"{name:<28} {value:>12.2f} {unit}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print(f"\nRegressed by more than {args.max_regression:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
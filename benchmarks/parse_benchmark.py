@@ -0,0 +1,119 @@
+"""Per-site parse time and peak memory: full html.parser documents vs. the scrapers' parse steps.
+
+Run from the project root:
+
+    python -m benchmarks.parse_benchmark [--rounds 20]
+
+The fixture pages are synthetic but sized and shaped like the real ones: the target content is a
+small part of a page full of navigation, markup and scripts.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.culvers import NEXT_DATA_PARSE
+from app.scrapers.kopps import KOPPS_PARSE
+from app.scrapers.murfs import MURFS_PARSE
+from app.scrapers.parsing import HTML_PARSER
+
+
+def _filler(sections=400):
+    """Navigation, cards and footer markup that the scrapers don't need"""
+    items = "".join(
+        f'<li class="menu-item"><a href="/page-{i}"><span>Menu item {i}</span></a></li>'
+        for i in range(60)
+    )
+    cards = "".join(
+        f'<div class="card"><h3 class="card-title">Card {i}</h3>'
+        f'<p class="card-body">Lorem ipsum dolor sit amet, consectetur adipiscing elit {i}.</p>'
+        f'<img src="/img/{i}.jpg" alt="Image {i}"></div>'
+        for i in range(sections)
+    )
+    return f"<header><nav><ul>{items}</ul></nav></header><main>{cards}</main>"
+
+
+def culvers_page():
+    calendar = [
+        {
+            "onDate": f"2025-07-{day:02d}T00:00:00",
+            "title": f"Flavor {day}",
+            "description": "Vanilla Fresh Frozen Custard swirled with caramel and pecans. " * 3,
+            "image": {"src": f"/images/{day}.png", "width": 400, "height": 400},
+        }
+        for day in range(1, 32)
+    ]
+    next_data = {"props": {"pageProps": {"restaurantCalendar": {"flavors": calendar}}}}
+    return (
+        "<html><head><title>Culver's</title>"
+        + "".join(f'<script src="/_next/static/chunk-{i}.js"></script>' for i in range(30))
+        + f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+        + f"</head><body>{_filler()}</body></html>"
+    )
+
+
+def kopps_page():
+    flavors = (
+        '<div class="wp-block-todays-flavors"><h2>Today\'s Flavors – Tuesday, July 15</h2>'
+        "<h3>Butter Pecan</h3><p>Buttery custard loaded with roasted pecans.</p>"
+        "<h3>Grasshopper Fudge</h3><p>Mint custard with fudge and cookie pieces.</p></div>"
+    )
+    return f"<html><body>{_filler()}{flavors}{_filler(100)}</body></html>"
+
+
+def murfs_page():
+    flavor = (
+        '<span class="subDateSpan">Tuesday, Jul. 15</span>'
+        '<span class="flavorOfDayWhiteSpan">Turtle Sundae</span>'
+        '<span class="flavorDescriptionSpan">Vanilla custard with caramel, fudge and pecans.</span>'
+    )
+    return f"<html><body>{_filler()}<div>{flavor}</div></body></html>"
+
+
+SITES = [
+    ("culvers", culvers_page, NEXT_DATA_PARSE),
+    ("kopps", kopps_page, KOPPS_PARSE),
+    ("murfs", murfs_page, MURFS_PARSE),
+]
+
+
+def measure(fn, text, rounds):
+    """Return (mean seconds, peak traced bytes) for ``fn(text)``"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    elapsed = (time.perf_counter() - start) / rounds
+    tracemalloc.start()
+    result = fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Parse steps use: {HTML_PARSER}")
+    print(
+        f"{'site':<8} {'size':>8} {'before ms':>10} {'after ms':>9} {'before MB':>10} {'after MB':>9}"
+    )
+    for name, page, step in SITES:
+        text = page()
+        before_time, before_peak = measure(
+            lambda t: BeautifulSoup(t, "html.parser"), text, args.rounds
+        )
+        after_time, after_peak = measure(step, text, args.rounds)
+        print(
+            f"{name:<8} {len(text) // 1024:>6}KB {before_time * 1000:>10.1f} "
+            f"{after_time * 1000:>9.2f} {before_peak / 2**20:>10.2f} {after_peak / 2**20:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Stand-ins for the shop sites that misbehave on purpose: slow, failing, rate limited or hung.
+
+    profiles = {"kopps": Profile(error_rate=0.5, error_status=403)}
+    with UpstreamSimulator(profiles) as upstream, redirect_scrapers(upstream.urls, paced=True):
+        flavors = scrape_kopps()
+
+Each site gets its own fixture server (see fixture_server.py) on its own port, so the app's
+per-host rate limiters and circuit breakers treat them as separate hosts, as they would the
+real sites. Run ``python -m benchmarks.load_test`` to drive the whole app against them.
+"""
+
+import math
+import random
+import threading
+import time
+
+from benchmarks.fixture_server import SITES, FixtureServer, send
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+# Named fault mixes for every site; per-site settings are applied on top
+SCENARIOS = {
+    "healthy": {},
+    "slow": {"latency": 0.8, "jitter": 0.6, "distribution": "lognormal"},
+    "flaky": {"latency": 0.1, "jitter": 0.05, "error_rate": 0.3, "truncate_rate": 0.1},
+    "forbidden": {"error_rate": 1.0, "error_status": 403},
+    "rate_limited": {"rate_limit": 1.0, "burst": 2},
+    "hanging": {"hang_rate": 0.5, "hang": 60.0},
+}
+
+
+class Profile:
+    """How one simulated site behaves. Times are in seconds; rates are per-request probabilities.
+
+    - ``latency``, ``jitter`` and ``distribution`` shape the delay before each response:
+      ``fixed`` (always ``latency``), ``uniform`` (``latency`` ± ``jitter``), ``normal`` (mean
+      ``latency``, standard deviation ``jitter``), ``lognormal`` (median ``latency``, ``jitter``
+      as sigma of the log) or ``exponential`` (mean ``latency``)
+    - ``error_rate`` of responses are ``error_status`` with a short body
+    - ``rate_limit`` requests per second (with ``burst``) are served; the rest get 429 with a
+      ``Retry-After`` header
+    - ``truncate_rate`` of responses announce the full length, send part of the body and close
+    - ``hang_rate`` of requests wait ``hang`` seconds before anything else happens
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        distribution="fixed",
+        error_rate=0.0,
+        error_status=503,
+        rate_limit=None,
+        burst=1,
+        truncate_rate=0.0,
+        hang_rate=0.0,
+        hang=60.0,
+    ):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {distribution!r}, expected {DISTRIBUTIONS}"
+            )
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.distribution = distribution
+        self.error_rate = float(error_rate)
+        self.error_status = int(error_status)
+        self.rate_limit = None if rate_limit in (None, "", "none") else float(rate_limit)
+        self.burst = float(burst)
+        self.truncate_rate = float(truncate_rate)
+        self.hang_rate = float(hang_rate)
+        self.hang = float(hang)
+
+    @classmethod
+    def parse(cls, spec, base=None):
+        """Profile from ``"key=value,key=value"``, starting from ``base``'s settings"""
+        settings = dict(vars(base)) if base is not None else {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            key, sep, value = item.partition("=")
+            if not sep or key not in vars(cls()):
+                raise ValueError(f"Expected key=value with a Profile setting, got {item!r}")
+            settings[key] = value
+        return cls(**settings)
+
+    def delay(self, rng):
+        """One latency sample, in seconds"""
+        if self.distribution == "uniform":
+            value = rng.uniform(self.latency - self.jitter, self.latency + self.jitter)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.latency, self.jitter)
+        elif self.distribution == "lognormal":
+            value = rng.lognormvariate(math.log(self.latency), self.jitter) if self.latency else 0
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1 / self.latency) if self.latency else 0
+        else:
+            value = self.latency
+        return max(0.0, value)
+
+
+class _Limiter:
+    """Token bucket that refuses, rather than delays, requests over the rate"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def retry_after(self):
+        return max(1, math.ceil(1 / self.rate))
+
+
+class SimulatedSite(FixtureServer):
+    """One site's fixtures, served through a fault ``profile``; ``faults`` counts what was injected"""
+
+    def __init__(self, site, profile, seed=None):
+        super().__init__(sites=(site,))
+        self.site = site
+        self.profile = profile
+        self.faults = {"hang": 0, "rate_limited": 0, "error": 0, "truncated": 0}
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._limiter = _Limiter(profile.rate_limit, profile.burst) if profile.rate_limit else None
+
+    def respond(self, handler, method, path):
+        profile = self.profile
+        with self._rng_lock:
+            hang = self._rng.random() < profile.hang_rate
+            delay = profile.delay(self._rng)
+            error = self._rng.random() < profile.error_rate
+            truncate = self._rng.random() < profile.truncate_rate
+            cut = self._rng.random()
+        if hang:
+            self._count("hang")
+            time.sleep(profile.hang)
+        time.sleep(delay)
+        if self._limiter is not None and not self._limiter.allow():
+            self._count("rate_limited")
+            headers = {"Retry-After": str(self._limiter.retry_after())}
+            send(handler, 429, b"Too Many Requests", "text/plain", headers)
+            return
+        if error:
+            self._count("error")
+            send(handler, profile.error_status, b"Simulated failure", "text/plain")
+            return
+        found = self.match(method, path)
+        if found is None:
+            send(handler, 404, b"Not Found", "text/plain")
+        elif truncate:
+            self._count("truncated")
+            body, content_type = found
+            handler.send_response(200)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body[: int(len(body) * cut)])
+            handler.close_connection = True
+        else:
+            send(handler, 200, *found)
+
+    def _count(self, fault):
+        with self._lock:
+            self.faults[fault] += 1
+
+
+class UpstreamSimulator:
+    """A simulated site per shop; ``urls`` maps each site to its base URL.
+
+    ``profiles`` maps site names to a Profile; sites without one use ``default``.
+    """
+
+    def __init__(self, profiles=None, default=None, seed=None):
+        profiles = profiles or {}
+        unknown = set(profiles) - set(SITES)
+        if unknown:
+            raise ValueError(f"Unknown site(s) {sorted(unknown)}, expected some of {SITES}")
+        default = default or Profile()
+        self.sites = {
+            site: SimulatedSite(
+                site, profiles.get(site, default), None if seed is None else seed + i
+            )
+            for i, site in enumerate(SITES)
+        }
+        self.urls = {site: server.url for site, server in self.sites.items()}
+
+    def start(self):
+        for server in self.sites.values():
+            server.start()
+        return self
+
+    def stop(self):
+        for server in self.sites.values():
+            server.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self):
+        """Requests served and faults injected per site"""
+        return {
+            site: {"requests": sum(server.requests.values()), **server.faults}
+            for site, server in self.sites.items()
+        }
@@ -10,6 +10,8 @@ TIMEOUT = 60  # seconds
 
 
 def pytest_sessionstart(session):
+    if session.config.getoption("--no-docker"):
+        return
     # Start docker-compose up in detached mode
     subprocess.run(["docker", "compose", "up", "--build", "-d"], check=True)
     # Wait for the app to be ready
@@ -34,12 +36,30 @@ def pytest_sessionstart(session):
 
 
 def pytest_sessionfinish(session, exitstatus):
+    if session.config.getoption("--no-docker"):
+        return
     # Tear down docker-compose after tests
     subprocess.run(["docker", "compose", "down"], check=False)
 
 
 def pytest_addoption(parser):
     parser.addoption("--ecosystem", action="store_true", help="run ecosystem tests")
+    parser.addoption(
+        "--no-docker",
+        action="store_true",
+        help="don't bring up the app in Docker; skips the Selenium UI tests that need it",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--no-docker"):
+        return
+    import pytest
+
+    skip_ui = pytest.mark.skip(reason="needs the app running in Docker (drop --no-docker)")
+    for item in items:
+        if item.path.name == "test_scraper_ui.py":
+            item.add_marker(skip_ui)
 
 
 def ecosystem(test_func):
@@ -8,11 +8,38 @@ const errorMessageEl = document.getElementById('errorMessage');
 const flavorsGridEl = document.getElementById('flavorsGrid');
 const currentDateEl = document.getElementById('currentDate');
 
+// ETag of the snapshot on screen; update events carrying a different one trigger a fetch
+let currentEtag = null;
+
 // Initialize the app
 document.addEventListener('DOMContentLoaded', () => {
-    loadFlavors();
+    const flavors = readBootstrapFlavors();
+    if (flavors) {
+        // Rendered from the flavors embedded in the page, without another request
+        setCurrentDateToLocal();
+        displayFlavors(flavors);
+    } else {
+        loadFlavors();
+    }
+    subscribeToUpdates();
 });
 
+// Flavors the server embedded in the page, or null if there are none
+function readBootstrapFlavors() {
+    const bootstrapEl = document.getElementById('flavors-bootstrap');
+    if (!bootstrapEl) {
+        return null;
+    }
+    try {
+        const flavors = JSON.parse(bootstrapEl.textContent);
+        currentEtag = bootstrapEl.dataset.etag || null;
+        return Array.isArray(flavors) && flavors.length > 0 ? flavors : null;
+    } catch (error) {
+        console.error('Error reading embedded flavors:', error);
+        return null;
+    }
+}
+
 // Set current date in header
 function setCurrentDateToLocal() {
     // Use US Central time for consistency with backend
@@ -26,18 +53,24 @@ function setCurrentDateToLocal() {
     currentDateEl.textContent = `${yyyy}-${mm}-${dd}`;
 }
 
-// Load flavors from API
-async function loadFlavors() {
+// Responses tag each encoding separately ("v-digest-gz"); events carry the snapshot's own tag
+function snapshotEtag(etag) {
+    return etag ? etag.replace(/^W\//, '').replace(/-(gz|br)"$/, '"') : null;
+}
+
+// Load flavors from API; fresh skips the browser cache after the server announces new data
+async function loadFlavors(fresh = false) {
     showLoading();
     
     try {
-        const response = await fetch(`${API_BASE_URL}/api/flavors`);
+        const response = await fetch(`${API_BASE_URL}/api/flavors`, fresh ? { cache: 'no-cache' } : {});
         
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
         
         const flavors = await response.json();
+        currentEtag = snapshotEtag(response.headers.get('ETag'));
         
         if (!Array.isArray(flavors)) {
             throw new Error('Invalid response format - expected array');
@@ -151,14 +184,26 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-// Auto-refresh functionality (optional)
+// Reload only when the server publishes a snapshot we aren't showing
+function subscribeToUpdates() {
+    if (!window.EventSource) {
+        startAutoRefresh();
+        return;
+    }
+    const events = new EventSource(`${API_BASE_URL}/api/flavors/events`);
+    events.addEventListener('snapshot', (event) => {
+        const snapshot = JSON.parse(event.data);
+        if (snapshot.etag !== currentEtag) {
+            console.log(`New flavors published (v${snapshot.version}), reloading...`);
+            loadFlavors(true);
+        }
+    });
+}
+
+// Fallback for browsers without EventSource: poll every 30 minutes
 function startAutoRefresh() {
-    // Refresh every 30 minutes
     setInterval(() => {
         console.log('Auto-refreshing flavors...');
-        loadFlavors();
+        loadFlavors(true);
     }, 30 * 60 * 1000);
 }
-
-// Start auto-refresh after initial load
-setTimeout(startAutoRefresh, 5000);
@@ -0,0 +1,116 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.assets import IMMUTABLE, AssetPipeline
+from app.main import create_app
+from app.snapshot import SnapshotStore
+
+INDEX = """<html><head>
+<link rel="icon" href="/static/favicon.svg">
+<link rel="stylesheet" href="/static/styles.css">
+<link rel="stylesheet" href="https://cdn.example/all.css">
+</head><body><script src="/static/script.js"></script><img src="/static/missing.png"></body></html>
+"""
+
+
+class TestAssetPipeline(unittest.TestCase):
+    """Unit tests for fingerprinted, precompressed static assets."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.static_dir = tmpdir.name
+        files = {
+            "index.html": INDEX,
+            "styles.css": "body { color: red; }" * 20,
+            "script.js": "console.log('hi');",
+            "favicon.svg": "<svg></svg>",
+        }
+        for name, content in files.items():
+            with open(os.path.join(self.static_dir, name), "w") as f:
+                f.write(content)
+        self.pipeline = AssetPipeline(self.static_dir)
+
+    def test_index_references_are_fingerprinted(self):
+        html = self.pipeline.index().variants["identity"].decode()
+
+        css_url = self.pipeline.url_for("styles.css")
+        self.assertRegex(css_url, r"^/assets/styles\.[0-9a-f]{10}\.css$")
+        self.assertIn(f'href="{css_url}"', html)
+        self.assertIn(f'src="{self.pipeline.url_for("script.js")}"', html)
+        self.assertIn('href="https://cdn.example/all.css"', html)
+        self.assertIn('src="/static/missing.png"', html)
+
+    def test_hash_changes_with_content(self):
+        before = self.pipeline.url_for("styles.css")
+        with open(os.path.join(self.static_dir, "styles.css"), "w") as f:
+            f.write("body { color: blue; }")
+        self.assertNotEqual(AssetPipeline(self.static_dir).url_for("styles.css"), before)
+
+    def test_assets_are_precompressed(self):
+        name = self.pipeline.url_for("styles.css").rsplit("/", 1)[1]
+        asset = self.pipeline.get(name)
+        self.assertEqual(gzip.decompress(asset.variants["gzip"]), asset.variants["identity"])
+        self.assertTrue(asset.media_type.startswith("text/css"))
+        self.assertIsNone(self.pipeline.get("styles.css"))
+
+    def test_index_embeds_snapshot_once_per_version(self):
+        store = SnapshotStore()
+        flavor = {"location": "Kopps", "flavor": "</script><b>Turtle</b>"}
+        first = store.publish("2025-07-15", {"kopps": [flavor]})
+
+        page = self.pipeline.index_for(first)
+        html = page.variants["identity"].decode()
+        match = re.search(
+            r'<script id="flavors-bootstrap" type="application/json" '
+            r"data-etag='(.*?)'>(.*?)</script>",
+            html,
+        )
+
+        self.assertEqual(match.group(1), first.etag())
+        self.assertEqual(json.loads(match.group(2)), [flavor])
+        self.assertLess(html.index("flavors-bootstrap"), html.index("</body>"))
+        self.assertIs(self.pipeline.index_for(first), page)
+        second = store.publish("2025-07-15", {"kopps": []})
+        self.assertIsNot(self.pipeline.index_for(second), page)
+        self.assertIs(self.pipeline.index_for(None), self.pipeline.index())
+
+    def test_index_is_rendered_when_a_snapshot_is_published(self):
+        app = create_app({})
+        app.state.assets = self.pipeline
+        with patch.object(self.pipeline, "index_for", wraps=self.pipeline.index_for) as index_for:
+            snapshot = app.state.flavors_store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+
+        index_for.assert_called_once_with(snapshot)
+        self.assertEqual(self.pipeline._rendered[0], snapshot.etag())
+
+    def test_routes(self):
+        app = create_app({})
+        app.state.assets = self.pipeline
+        app.state.flavors_store.publish("2025-07-15", {"kopps": [{"flavor": "Turtle"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                ui = client.get("/ui", headers={"Accept-Encoding": "gzip"})
+                revalidated = client.get("/ui", headers={"If-None-Match": ui.headers["etag"]})
+                asset = client.get(self.pipeline.url_for("script.js"))
+                missing = client.get("/assets/script.0000000000.js")
+
+        self.assertEqual(ui.headers["content-encoding"], "gzip")
+        self.assertEqual(ui.headers["cache-control"], "no-cache")
+        self.assertIn(self.pipeline.url_for("script.js"), ui.text)
+        self.assertIn('[{"flavor":"Turtle"}]</script>', ui.text)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(asset.text, "console.log('hi');")
+        self.assertEqual(asset.headers["cache-control"], IMMUTABLE)
+        self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
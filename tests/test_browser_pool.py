@@ -0,0 +1,161 @@
+import unittest
+from unittest.mock import Mock, call, patch
+
+from app.scrapers import browser
+from app.scrapers.browser import WebDriverPool
+
+
+class TestWebDriverPool(unittest.TestCase):
+    """Unit tests for the reusable Selenium driver pool."""
+
+    def setUp(self):
+        self.launched = []
+        self.pool = WebDriverPool(factory=self._launch, size=1, max_uses=3)
+
+    def _launch(self):
+        driver = Mock()
+        driver.window_handles = ["main"]
+        driver.current_url = "https://www.example.com/flavors"
+        driver.service = None
+        self.launched.append(driver)
+        return driver
+
+    def test_driver_is_reused_and_reset(self):
+        with self.pool.driver() as first:
+            pass
+        with self.pool.driver() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.launched), 1)
+        first.get.assert_called_with("about:blank")
+        first.quit.assert_not_called()
+
+    def test_reset_clears_cookies_and_storage_before_leaving_the_page(self):
+        with self.pool.driver() as driver:
+            pass
+
+        calls = [c for c in driver.mock_calls if c[0] in ("execute_cdp_cmd", "get")]
+        self.assertEqual(
+            calls,
+            [
+                call.execute_cdp_cmd("Network.clearBrowserCookies", {}),
+                call.execute_cdp_cmd("Network.clearBrowserCache", {}),
+                call.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": "https://www.example.com", "storageTypes": "all"},
+                ),
+                call.get("about:blank"),
+            ],
+        )
+
+    def test_reset_clears_storage_for_every_open_window(self):
+        with self.pool.driver() as driver:
+            driver.window_handles = ["main", "popup"]
+            urls = {"main": "https://shop.example.com/", "popup": "http://other.example.com:8080/x"}
+            driver.switch_to.window.side_effect = lambda handle: setattr(
+                driver, "current_url", urls[handle]
+            )
+
+        origins = [
+            c.args[1]["origin"]
+            for c in driver.execute_cdp_cmd.call_args_list
+            if c.args[0] == "Storage.clearDataForOrigin"
+        ]
+        self.assertEqual(origins, ["http://other.example.com:8080", "https://shop.example.com"])
+        driver.close.assert_called_once()
+        driver.switch_to.window.assert_called_with("main")
+
+    def test_driver_is_recycled_after_max_uses(self):
+        drivers = []
+        for _ in range(4):
+            with self.pool.driver() as driver:
+                drivers.append(driver)
+
+        self.assertEqual(len(self.launched), 2)
+        self.assertIs(drivers[2], drivers[0])
+        self.assertIsNot(drivers[3], drivers[0])
+        drivers[0].quit.assert_called_once()
+
+    def test_driver_is_discarded_when_scrape_fails(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.driver() as failed:
+                raise RuntimeError("page crashed")
+        with self.pool.driver() as driver:
+            pass
+
+        failed.quit.assert_called_once()
+        self.assertIsNot(driver, failed)
+
+    def test_driver_that_cannot_be_reset_is_discarded(self):
+        with self.pool.driver() as broken:
+            broken.execute_cdp_cmd.side_effect = Exception("session gone")
+        with self.pool.driver() as driver:
+            pass
+
+        broken.quit.assert_called_once()
+        self.assertIsNot(driver, broken)
+
+    def test_checkout_gives_up_when_every_browser_is_busy(self):
+        pool = WebDriverPool(factory=self._launch, size=1, acquire_timeout=0.05)
+        with pool.driver():
+            with self.assertRaises(TimeoutError):
+                with pool.driver():
+                    pass
+        with pool.driver() as driver:
+            self.assertIs(driver, self.launched[0])
+
+    def test_replacing_a_browser_respects_size(self):
+        """A recycled browser is replaced without exceeding size while others are in use."""
+        pool = WebDriverPool(factory=self._launch, size=2, max_uses=1)
+        with pool.driver():
+            with pool.driver():
+                pass  # Recycled after one use; the other browser is still checked out
+            pool.warm()  # What the replacement thread runs
+            self.assertEqual(len(self.launched), 3)
+            live = [d for d in self.launched if not d.quit.called]
+            self.assertEqual(len(live), 2)
+
+    def test_warm_and_close(self):
+        self.pool.warm()
+        self.assertEqual(len(self.launched), 1)
+        with self.pool.driver() as driver:
+            self.assertIs(driver, self.launched[0])
+
+        self.pool.close()
+        driver.quit.assert_called_once()
+
+
+class TestLaunchDriver(unittest.TestCase):
+    """Launched browsers are configured so a hung page can't hold them forever."""
+
+    def test_page_loads_time_out(self):
+        with patch("app.scrapers.browser.resolve_driver_path", return_value="/opt/chromedriver"):
+            with (
+                patch("app.scrapers.browser.Service"),
+                patch("app.scrapers.browser.webdriver.Chrome") as chrome,
+            ):
+                driver = browser.launch_driver()
+
+        self.assertIs(driver, chrome.return_value)
+        driver.set_page_load_timeout.assert_called_once_with(browser.PAGE_LOAD_TIMEOUT)
+
+
+class TestDriverPathResolution(unittest.TestCase):
+    """The chromedriver lookup happens once per process."""
+
+    def setUp(self):
+        patcher = patch.multiple(browser, _driver_path=None, _driver_path_resolved=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_driver_path_is_resolved_once(self):
+        with patch("app.scrapers.browser.shutil.which", return_value="/opt/chromedriver") as which:
+            with patch("app.scrapers.browser.os.path.exists", return_value=True):
+                self.assertEqual(browser.resolve_driver_path(), "/opt/chromedriver")
+                self.assertEqual(browser.resolve_driver_path(), "/opt/chromedriver")
+        which.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+from app.scrapers import culvers
+from app.scrapers.culvers import _parse_culvers_calendar, scrape_culvers
+
+
+def _next_data(flavors, path=("restaurantCalendar", "flavors")):
+    page_props = {}
+    node = page_props
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    node[path[-1]] = flavors
+    return {"props": {"pageProps": page_props}}
+
+
+CALENDAR = [
+    {"onDate": "2025-07-16T00:00:00", "title": "Mint Explosion", "description": "Mint"},
+    {"onDate": "2025-07-15T00:00:00", "title": "Turtle", "description": "Pecans"},
+    {"calendarDate": "2025-07-17", "name": "Oreo Overload"},
+    {"title": "No date"},
+    {"onDate": "not-a-date", "title": "Bad date"},
+]
+
+
+class TestCulversScraper(unittest.TestCase):
+    """Unit tests for Culver's calendar parsing."""
+
+    def test_parses_every_dated_entry_in_order(self):
+        entries = _parse_culvers_calendar(_next_data(CALENDAR))
+        self.assertEqual(
+            entries,
+            [
+                ("2025-07-15", "Turtle", "Pecans"),
+                ("2025-07-16", "Mint Explosion", "Mint"),
+                ("2025-07-17", "Oreo Overload", ""),
+            ],
+        )
+
+    def test_alternate_calendar_paths(self):
+        data = _next_data(CALENDAR[:1], path=("page", "customData", "flavorDetails", "flavors"))
+        self.assertEqual(len(_parse_culvers_calendar(data)), 1)
+
+    def test_missing_calendar(self):
+        self.assertEqual(_parse_culvers_calendar({"props": {"pageProps": {"other": 1}}}), [])
+
+    @patch("app.scrapers.culvers.CULVERS_LOCATIONS", [("Culvers (Test)", "https://c.example/r/t")])
+    @patch("app.scrapers.culvers.get_html")
+    def test_scrape_returns_whole_calendar(self, mock_get_html):
+        mock_get_html.return_value = json.dumps(_next_data(CALENDAR))
+        flavors = scrape_culvers()
+
+        self.assertEqual([f["date"] for f in flavors], ["2025-07-15", "2025-07-16", "2025-07-17"])
+        self.assertTrue(all(f["location"] == "Culvers (Test)" for f in flavors))
+
+
+@patch("app.scrapers.culvers.FETCH_MODE", "next_data")
+@patch("app.scrapers.culvers._build_id", None)
+@patch("app.scrapers.culvers._discovery", None)
+class TestCulversDataRoute(unittest.TestCase):
+    """Unit tests for fetching Culver's calendars from the Next.js data route."""
+
+    URL = "https://c.example/restaurants/sussex"
+
+    def _page(self, build_id):
+        return json.dumps({**_next_data(CALENDAR), "buildId": build_id})
+
+    def test_data_route_url(self):
+        self.assertEqual(
+            culvers._data_route_url(self.URL + "/", "abc123"),
+            "https://c.example/_next/data/abc123/restaurants/sussex.json",
+        )
+
+    @patch("app.scrapers.culvers.get_json")
+    @patch("app.scrapers.culvers.get_html")
+    def test_build_id_is_learned_then_reused(self, mock_get_html, mock_get_json):
+        mock_get_html.return_value = self._page("build-1")
+        mock_get_json.return_value = _next_data(CALENDAR)["props"]
+
+        first = culvers._scrape_culvers_location(self.URL)
+        second = culvers._scrape_culvers_location(self.URL)
+
+        self.assertEqual(first, second)
+        mock_get_html.assert_called_once()
+        mock_get_json.assert_called_once_with(
+            "https://c.example/_next/data/build-1/restaurants/sussex.json"
+        )
+
+    @patch("app.scrapers.culvers.get_json", return_value=None)
+    @patch("app.scrapers.culvers.get_html")
+    def test_stale_build_id_falls_back_and_is_rediscovered(self, mock_get_html, mock_get_json):
+        culvers._build_id = "old-build"
+        mock_get_html.return_value = self._page("new-build")
+
+        calendar = culvers._scrape_culvers_location(self.URL)
+
+        self.assertEqual(len(calendar), 3)
+        mock_get_html.assert_called_once()
+        self.assertEqual(culvers._build_id, "new-build")
+
+    @patch("app.scrapers.culvers.get_json")
+    @patch("app.scrapers.culvers.get_html")
+    def test_other_locations_wait_for_the_build_id(self, mock_get_html, mock_get_json):
+        mock_get_html.return_value = self._page("build-1")
+        mock_get_json.return_value = _next_data(CALENDAR)["props"]
+        urls = [f"https://c.example/restaurants/{i}" for i in range(4)]
+
+        results = culvers.fetch_concurrently(culvers._scrape_culvers_location, urls)
+
+        self.assertTrue(all(len(calendar) == 3 for calendar, _ in results))
+        mock_get_html.assert_called_once()
+        self.assertEqual(mock_get_json.call_count, 3)
+
+    @patch("app.scrapers.culvers.BUILD_ID_WAIT", 0.05)
+    @patch("app.scrapers.culvers.get_json")
+    @patch("app.scrapers.culvers.get_html")
+    def test_slow_discovery_does_not_block_other_locations(self, mock_get_html, mock_get_json):
+        release = threading.Event()
+        pages = []
+
+        def get_html(url, **kwargs):
+            pages.append(url)
+            if len(pages) == 1:
+                # The discovering location is stuck until the other one has loaded its page
+                self.assertTrue(release.wait(5))
+            else:
+                release.set()
+            return self._page("build-1")
+
+        mock_get_html.side_effect = get_html
+        urls = [f"https://c.example/restaurants/{i}" for i in range(2)]
+
+        results = culvers.fetch_concurrently(culvers._scrape_culvers_location, urls)
+
+        self.assertTrue(all(error is None for _, error in results))
+        self.assertEqual(len(pages), 2)
+        mock_get_json.assert_not_called()
+
+    @patch("app.scrapers.culvers.CULVERS_LOCATIONS", [("Culvers (Test)", "https://c.example/r/t")])
+    @patch("app.scrapers.culvers.get_json")
+    @patch("app.scrapers.culvers.get_html")
+    def test_failed_discovery_is_retried_next_refresh(self, mock_get_html, mock_get_json):
+        mock_get_html.side_effect = [Exception("blocked"), self._page("build-1")]
+
+        self.assertEqual(scrape_culvers(), [])
+        self.assertEqual(len(scrape_culvers()), 3)
+        self.assertEqual(culvers._build_id, "build-1")
+
+    @patch("app.scrapers.culvers.get_json")
+    @patch("app.scrapers.culvers.get_html")
+    def test_html_mode_downloads_the_whole_page(self, mock_get_html, mock_get_json):
+        culvers.configure_culvers({"fetch_mode": "html"})
+        mock_get_html.return_value = self._page("build-1")
+        culvers._scrape_culvers_location(self.URL)
+
+        self.assertFalse(mock_get_html.call_args.kwargs["stream"])
+        mock_get_json.assert_not_called()
+        self.assertIsNone(culvers._build_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
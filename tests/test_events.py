@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.events import SnapshotBroadcaster, snapshot_events
+from app.main import create_app
+from app.snapshot import SnapshotStore
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+def parse_event(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+class TestSnapshotEvents(unittest.TestCase):
+    """Unit tests for the snapshot Server-Sent Events stream."""
+
+    def setUp(self):
+        self.store = SnapshotStore()
+        self.broadcaster = SnapshotBroadcaster()
+        self.store.add_listener(self.broadcaster.publish)
+
+    def test_stream_sends_current_then_published_snapshots(self):
+        first = self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+
+        async def run():
+            stream = snapshot_events(FakeRequest(), self.store, self.broadcaster)
+            retry = await anext(stream)
+            current = await anext(stream)
+            # Published from a worker thread, like the scheduled refresh
+            publisher = threading.Thread(
+                target=self.store.update_source, args=("2025-07-15", "murfs", [{"flavor": "M"}])
+            )
+            publisher.start()
+            update = await asyncio.wait_for(anext(stream), 5)
+            publisher.join()
+            await stream.aclose()
+            return retry, current, update
+
+        retry, current, update = asyncio.run(run())
+
+        self.assertTrue(retry.startswith("retry: "))
+        self.assertEqual(parse_event(current), ("snapshot", _event(first)))
+        second = self.store.current()
+        self.assertEqual(parse_event(update), ("snapshot", _event(second)))
+        self.assertNotEqual(second.etag(), first.etag())
+        self.assertEqual(self.broadcaster.subscriber_count(), 0)
+
+    def test_slow_subscriber_only_keeps_latest_event(self):
+        async def run():
+            queue = self.broadcaster.subscribe()
+            for day in ("2025-07-15", "2025-07-16", "2025-07-17"):
+                self.store.publish(day, {})
+            await asyncio.sleep(0)  # Let the loop run the threadsafe callbacks
+            return queue.qsize(), queue.get_nowait()
+
+        size, event = asyncio.run(run())
+
+        self.assertEqual(size, 1)
+        self.assertEqual(event["date"], "2025-07-17")
+
+    def test_stream_sends_keepalives_and_ends(self):
+        async def run():
+            with patch("app.events.KEEPALIVE_INTERVAL", 0.01):
+                stream = snapshot_events(
+                    FakeRequest(), self.store, self.broadcaster, max_seconds=0.05
+                )
+                return [chunk async for chunk in stream]
+
+        chunks = asyncio.run(run())
+
+        # No snapshot yet, so only the retry hint and keep-alive comments
+        self.assertTrue(chunks[0].startswith("retry: "))
+        self.assertIn(": keep-alive\n\n", chunks[1:])
+        self.assertEqual(self.broadcaster.subscriber_count(), 0)
+
+    @patch("app.events.MAX_STREAM_SECONDS", 0.05)
+    def test_route_streams_snapshot_events(self):
+        app = create_app({})
+        snapshot = app.state.flavors_store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                response = client.get("/api/flavors/events")
+
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+        self.assertIn(f"data: {json.dumps(_event(snapshot))}", response.text)
+
+
+def _event(snapshot):
+    return {"version": snapshot.version, "date": snapshot.date, "etag": snapshot.etag()}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+
+from app.scrapers import async_utils, bubbas, culvers, kopps, murfs
+from benchmarks.fixture_server import FixtureServer, redirect_scrapers
+
+
+class TestFixtureReplay(unittest.TestCase):
+    """Scrapers against the synthetic pages the offline benchmark serves."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FixtureServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.enterContext(redirect_scrapers(self.server.url))
+
+    def assert_flavors(self, flavors, location):
+        self.assertTrue(flavors, "no flavors parsed from the fixture")
+        self.assertEqual({location}, {f["location"] for f in flavors})
+        self.assertTrue(all(f["flavor"] for f in flavors))
+
+    def test_culvers(self):
+        flavors = culvers.scrape_culvers()
+        self.assertEqual(len(culvers.CULVERS_LOCATIONS), len({f["location"] for f in flavors}))
+        self.assertTrue(all(f["flavor"] for f in flavors))
+
+    def test_kopps(self):
+        self.assert_flavors(kopps.scrape_kopps(), "Kopps")
+
+    def test_murfs(self):
+        self.assert_flavors(murfs.scrape_murfs(), "Murfs")
+
+    def test_bubbas(self):
+        self.assert_flavors(bubbas.scrape_bubbas(), "Bubbas")
+
+    def test_async_scrapers(self):
+        async def scrape():
+            try:
+                return await kopps.scrape_kopps_async(), await murfs.scrape_murfs_async()
+            finally:
+                await async_utils.close_async_client()
+
+        kopps_flavors, murfs_flavors = asyncio.run(scrape())
+        self.assert_flavors(kopps_flavors, "Kopps")
+        self.assert_flavors(murfs_flavors, "Murfs")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.scrapers.http_cache import CachingAdapter, ParseCache, ResponseCache
+
+
+def make_response(status, content=b"", headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = content
+    resp._content_consumed = True
+    resp.headers.update(headers or {})
+    resp.encoding = "utf-8"
+    return resp
+
+
+class TestCachingAdapter(unittest.TestCase):
+    """Unit tests for conditional GETs through the session adapter."""
+
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.session = requests.Session()
+        self.session.mount("https://", CachingAdapter(self.cache))
+        self.sent = []
+        self.responses = []
+
+        def send(adapter, request, **kwargs):
+            self.sent.append(dict(request.headers))
+            return self.responses.pop(0)
+
+        patcher = patch.object(HTTPAdapter, "send", send)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_304_returns_cached_body(self):
+        headers = {"ETag": '"v1"', "Last-Modified": "Tue, 15 Jul 2025 08:00:00 GMT"}
+        self.responses = [
+            make_response(200, b"<p>Turtle</p>", {**headers, "Content-Type": "text/html"}),
+            make_response(304),
+        ]
+
+        first = self.session.get("https://shop.example/flavors")
+        second = self.session.get("https://shop.example/flavors")
+
+        self.assertNotIn("If-None-Match", self.sent[0])
+        self.assertEqual(self.sent[1]["If-None-Match"], '"v1"')
+        self.assertEqual(self.sent[1]["If-Modified-Since"], headers["Last-Modified"])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(second.headers["Content-Type"], "text/html")
+        self.assertTrue(second.from_cache)
+
+    def test_responses_without_validators_are_not_cached(self):
+        self.responses = [make_response(200, b"a"), make_response(200, b"b")]
+        self.session.get("https://shop.example/")
+        self.session.get("https://shop.example/")
+        self.assertNotIn("If-None-Match", self.sent[1])
+        self.assertIsNone(self.cache.get("https://shop.example/"))
+
+    def test_streamed_requests_bypass_cache(self):
+        self.cache.store("https://shop.example/", 200, {"ETag": '"v1"'}, b"a")
+        self.responses = [make_response(200, b"b", {"ETag": '"v2"'})]
+        self.session.get("https://shop.example/", stream=True)
+        self.assertNotIn("If-None-Match", self.sent[0])
+        self.assertEqual(self.cache.get("https://shop.example/").etag, '"v1"')
+
+
+class TestParseCache(unittest.TestCase):
+    """Unit tests for skipping re-parses of identical bodies."""
+
+    def test_unchanged_body_is_not_parsed_again(self):
+        cache = ParseCache()
+        parse = Mock(side_effect=lambda text: {"parsed": text})
+
+        first = cache.parse("https://shop.example/", "html.parser", "<p>a</p>", parse)
+        second = cache.parse("https://shop.example/", "html.parser", "<p>a</p>", parse)
+        third = cache.parse("https://shop.example/", "html.parser", "<p>b</p>", parse)
+
+        self.assertIs(first, second)
+        self.assertEqual(third, {"parsed": "<p>b</p>"})
+        self.assertEqual(parse.call_count, 2)
+
+    def test_entries_are_bounded(self):
+        cache = ParseCache(max_entries=2)
+        for i in range(3):
+            cache.parse(f"https://shop.example/{i}", "html.parser", "x", str)
+        self.assertEqual(len(cache._entries), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,351 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.persistence import FlavorDatabase
+from app.scrapers.utils import get_central_date_string
+from app.sources import next_central_midnight
+
+TEST_CONFIG = {"refresh": {"max_workers": 2, "scraper_timeout": 5, "budget": 5}}
+
+
+class TestApp(unittest.TestCase):
+    """Unit tests for the app factory, lifespan and API endpoints."""
+
+    def setUp(self):
+        self.release = threading.Event()
+
+        def scrape_shop():
+            self.release.wait(timeout=5)
+            return [{"location": "Shop", "flavor": "Vanilla", "description": "", "date": None}]
+
+        async def scrape_async_shop():
+            return [{"location": "Async", "flavor": "Mint", "description": "", "date": None}]
+
+        scrapers = [("shop", scrape_shop), ("async_shop", scrape_async_shop)]
+        patcher = patch("app.main.SCRAPERS", scrapers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.release.set)
+
+    def _wait_until_ready(self, client):
+        for _ in range(100):
+            if client.get("/readyz").status_code == 200:
+                return
+            time.sleep(0.05)
+        self.fail("App never became ready")
+
+    def test_create_app_has_no_side_effects(self):
+        """Building the app doesn't scrape or publish anything."""
+        app = create_app(TEST_CONFIG)
+        self.assertIsNone(app.state.flavors_store.current())
+        self.assertFalse(app.state.flavors_store.is_refreshing())
+
+    def test_serves_immediately_while_warming_up(self):
+        """Probes and the API answer while the first scrape is still running."""
+        app = create_app(TEST_CONFIG)
+        with TestClient(app) as client:
+            self.assertEqual(client.get("/healthz").json(), {"status": "ok"})
+            self.assertEqual(client.get("/readyz").status_code, 503)
+            self.assertEqual(client.get("/api/flavors").json(), [])
+
+            self.release.set()
+            self._wait_until_ready(client)
+            flavors = client.get("/api/flavors").json()
+
+        self.assertEqual([f["flavor"] for f in flavors], ["Vanilla", "Mint"])
+
+    def test_stale_snapshot_served_while_refreshing(self):
+        """A stale snapshot is returned as-is and triggers one background refresh."""
+        app = create_app(TEST_CONFIG)
+        store = app.state.flavors_store
+        store.publish("2000-01-01", {"shop": [{"flavor": "Old"}]})
+        with patch.object(store, "refresh_in_background") as mock_refresh:
+            with TestClient(app) as client:
+                response = client.get("/api/flavors")
+
+        self.assertEqual(response.json(), [{"flavor": "Old"}])
+        # Once for warmup, once for the stale request
+        self.assertEqual(mock_refresh.call_count, 2)
+
+    def test_warmup_uses_todays_saved_snapshot(self):
+        """A complete snapshot on disk is served without scraping."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "flavors.db")
+            saved = FlavorDatabase(path)
+            saved.save_snapshot(
+                get_central_date_string(),
+                {"shop": [{"flavor": "Saved"}], "async_shop": [{"flavor": "Saved too"}]},
+            )
+            saved.close()
+
+            app = create_app({**TEST_CONFIG, "storage": {"path": path}})
+            with patch("app.main.refresh_flavors_cache") as mock_refresh:
+                with TestClient(app) as client:
+                    self._wait_until_ready(client)
+                    flavors = client.get("/api/flavors").json()
+
+        mock_refresh.assert_not_called()
+        self.assertEqual([f["flavor"] for f in flavors], ["Saved", "Saved too"])
+
+    def test_published_snapshots_are_saved(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "flavors.db")
+            app = create_app({**TEST_CONFIG, "storage": {"path": path}})
+            self.release.set()
+            with TestClient(app) as client:
+                self._wait_until_ready(client)
+
+            saved = FlavorDatabase(path)
+            self.addCleanup(saved.close)
+            sources = saved.load_snapshot(get_central_date_string())
+
+        self.assertEqual(sorted(sources), ["async_shop", "shop"])
+
+    def test_history_endpoint(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            app = create_app({**TEST_CONFIG, "storage": {"path": os.path.join(tmpdir, "h.db")}})
+            app.state.flavors_store.publish(
+                "2025-07-15", {"kopps": [{"location": "Kopps", "flavor": "Turtle"}]}
+            )
+            with patch.object(app.state.flavors_store, "refresh_in_background"):
+                with TestClient(app) as client:
+                    found = client.get("/api/flavors/history", params={"location": "Kopps"})
+                    invalid = client.get("/api/flavors/history", params={"start": "July 1"})
+                    impossible = client.get("/api/flavors/history", params={"end": "2025-02-30"})
+
+        self.assertEqual(found.json()[0]["flavor"], "Turtle")
+        self.assertEqual(found.json()[0]["date"], "2025-07-15")
+        self.assertEqual(invalid.status_code, 422)
+        self.assertEqual(impossible.status_code, 422)
+
+    def test_impossible_dates_are_rejected(self):
+        app = create_app(TEST_CONFIG)
+        app.state.flavors_store.publish(get_central_date_string(), {"shop": [{"flavor": "A"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                response = client.get("/api/flavors", params={"date": "9999-99-99"})
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_flavors_for_other_dates(self):
+        """Future days come from the cached calendar and past days from history."""
+        today = get_central_date_string()
+        calendar = [
+            {"location": "Culvers", "flavor": "Today", "date": today},
+            {"location": "Culvers", "flavor": "Tomorrow", "date": "2999-01-01"},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            app = create_app({**TEST_CONFIG, "storage": {"path": os.path.join(tmpdir, "h.db")}})
+            app.state.database.save_history(
+                "2000-01-01", {"culvers": [{"location": "Culvers", "flavor": "Past"}]}
+            )
+            app.state.flavors_store.publish(today, {"culvers": calendar})
+            with patch.object(app.state.flavors_store, "refresh_in_background") as mock_refresh:
+                with TestClient(app) as client:
+                    current = client.get("/api/flavors").json()
+                    future = client.get("/api/flavors", params={"date": "2999-01-01"}).json()
+                    past = client.get("/api/flavors", params={"date": "2000-01-01"}).json()
+
+        self.assertEqual([f["flavor"] for f in current], ["Today"])
+        self.assertEqual([f["flavor"] for f in future], ["Tomorrow"])
+        self.assertEqual([f["flavor"] for f in past], ["Past"])
+        # Only the lifespan warmup; date lookups never trigger a scrape
+        self.assertEqual(mock_refresh.call_count, 1)
+
+    def test_past_dates_merge_history_with_calendar(self):
+        """A calendar entry for a past day doesn't hide the other shops' history."""
+        today = get_central_date_string()
+        calendar = [
+            {"location": "Culvers", "flavor": "Yesterday", "date": "2000-01-01"},
+            {"location": "Culvers", "flavor": "Today", "date": today},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            app = create_app({**TEST_CONFIG, "storage": {"path": os.path.join(tmpdir, "h.db")}})
+            app.state.database.save_history(
+                "2000-01-01", {"kopps": [{"location": "Kopps", "flavor": "Turtle"}]}
+            )
+            app.state.flavors_store.publish(today, {"culvers": calendar})
+            with patch.object(app.state.flavors_store, "refresh_in_background"):
+                with TestClient(app) as client:
+                    past = client.get("/api/flavors", params={"date": "2000-01-01"}).json()
+
+        self.assertEqual(sorted(f["flavor"] for f in past), ["Turtle", "Yesterday"])
+
+    def test_flavors_are_cacheable_until_next_refresh(self):
+        """Responses carry an ETag, max-age runs to the next refresh, and a match gets a 304."""
+        app = create_app(TEST_CONFIG)
+        app.state.flavors_store.publish(get_central_date_string(), {"shop": [{"flavor": "A"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                first = client.get("/api/flavors")
+                etag = first.headers["etag"]
+                cached = client.get("/api/flavors", headers={"If-None-Match": f"W/{etag}"})
+                other_day = client.get("/api/flavors", params={"date": "2999-01-01"})
+                app.state.flavors_store.publish(get_central_date_string(), {"shop": []})
+                changed = client.get("/api/flavors", headers={"If-None-Match": etag})
+
+        max_age = int(first.headers["cache-control"].split("max-age=")[1])
+        self.assertTrue(0 <= max_age <= 24 * 60 * 60)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.headers["etag"], etag)
+        self.assertNotEqual(other_day.headers["etag"], etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_max_age_ends_at_midnight(self):
+        """Sources fresh for days still can't make clients keep today's flavors past midnight."""
+        app = create_app(TEST_CONFIG)
+        app.state.flavors_store.publish(get_central_date_string(), {"shop": [{"flavor": "A"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with patch.object(app.state.sources, "next_due", return_value=time.time() + 3 * 86400):
+                with TestClient(app) as client:
+                    response = client.get("/api/flavors")
+
+        max_age = int(response.headers["cache-control"].split("max-age=")[1])
+        self.assertLessEqual(max_age, next_central_midnight(time.time()) - time.time() + 1)
+
+    def test_any_encodings_etag_revalidates(self):
+        """A tag cached for the gzip body still matches when the client now gets identity."""
+        app = create_app(TEST_CONFIG)
+        app.state.flavors_store.publish(get_central_date_string(), {"shop": [{"flavor": "A"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                gzipped = client.get("/api/flavors", headers={"Accept-Encoding": "gzip"})
+                revalidated = client.get(
+                    "/api/flavors",
+                    headers={
+                        "Accept-Encoding": "identity",
+                        "If-None-Match": gzipped.headers["etag"],
+                    },
+                )
+
+        self.assertTrue(gzipped.headers["etag"].endswith('-gz"'))
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["etag"][:-1] + '-gz"', gzipped.headers["etag"])
+
+    def test_flavors_are_served_pre_compressed(self):
+        app = create_app(TEST_CONFIG)
+        snapshot = app.state.flavors_store.publish(
+            get_central_date_string(), {"shop": [{"flavor": "Crème Brûlée"}]}
+        )
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                compressed = client.get("/api/flavors", headers={"Accept-Encoding": "gzip"})
+                plain = client.get("/api/flavors", headers={"Accept-Encoding": "identity"})
+                refused = client.get("/api/flavors", headers={"Accept-Encoding": "gzip;q=0"})
+
+        self.assertEqual(compressed.headers["content-encoding"], "gzip")
+        self.assertEqual(compressed.headers["vary"], "Accept-Encoding")
+        self.assertEqual(compressed.headers["etag"], snapshot.etag()[:-1] + '-gz"')
+        self.assertEqual(plain.headers["etag"], snapshot.etag())
+        self.assertEqual(compressed.json(), [{"flavor": "Crème Brûlée"}])
+        self.assertNotIn("content-encoding", plain.headers)
+        self.assertEqual(plain.content, snapshot.rendition()["identity"])
+        self.assertNotIn("content-encoding", refused.headers)
+
+    def test_stale_snapshot_is_not_cacheable(self):
+        app = create_app(TEST_CONFIG)
+        app.state.flavors_store.publish("2000-01-01", {"shop": [{"flavor": "Old"}]})
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                response = client.get("/api/flavors")
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+
+    def test_root_redirects_to_ui(self):
+        app = create_app(TEST_CONFIG)
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                response = client.get("/", follow_redirects=False)
+        self.assertEqual(response.headers["location"], "/ui")
+
+
+class TestPerSourceRefresh(unittest.TestCase):
+    """Only stale or failed sources are scraped, and their entries are merged on publish."""
+
+    def setUp(self):
+        self.calls = []
+        self.results = {"shop": [[{"location": "Shop", "flavor": "Vanilla"}]]}
+
+        def scraper(name):
+            def scrape():
+                self.calls.append(name)
+                queued = self.results.get(name)
+                return queued.pop(0) if queued else [{"location": name, "flavor": "Mint"}]
+
+            return scrape
+
+        scrapers = [("shop", scraper("shop")), ("other", scraper("other"))]
+        patcher = patch("app.main.SCRAPERS", scrapers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fresh_sources_are_not_scraped(self):
+        app = create_app(TEST_CONFIG)
+        today = get_central_date_string()
+        app.state.sources.record_success("other", [{"location": "Other", "flavor": "Kept"}], today)
+        app.state.refresh()
+
+        self.assertEqual(self.calls, ["shop"])
+        flavors = app.state.flavors_store.current().flavors_for()
+        self.assertEqual([f["flavor"] for f in flavors], ["Vanilla", "Kept"])
+
+        app.state.refresh()  # Nothing is due, so nothing is scraped or published
+        self.assertEqual(self.calls, ["shop"])
+        self.assertEqual(app.state.flavors_store.current().version, 1)
+
+    def test_failed_source_is_retried_alone(self):
+        config = {**TEST_CONFIG, "sources": {"shop": {"retry_interval": 0}}}
+        app = create_app(config)
+        self.results["shop"] = [[], [{"location": "Shop", "flavor": "Retried"}]]
+        app.state.refresh()
+        self.assertEqual(list(app.state.flavors_store.current().sources), ["other"])
+
+        app.state.refresh()
+        self.assertEqual(self.calls, ["shop", "other", "shop"])
+        flavors = app.state.flavors_store.current().flavors_for()
+        self.assertEqual([f["flavor"] for f in flavors], ["Retried", "Mint"])
+
+    def test_failed_retry_keeps_the_etag(self):
+        """A retry that fails again changes nothing, so clients keep getting 304s."""
+        config = {**TEST_CONFIG, "sources": {"shop": {"retry_interval": 0}}}
+        app = create_app(config)
+        self.results["shop"] = [[], []]
+        app.state.refresh()
+        before = app.state.flavors_store.current()
+
+        app.state.refresh()
+        self.assertEqual(self.calls, ["shop", "other", "shop"])
+        self.assertIs(app.state.flavors_store.current(), before)
+        self.assertEqual(app.state.flavors_store.current().etag(), before.etag())
+
+    def test_warmup_reuses_saved_multi_day_source(self):
+        """A calendar saved on an earlier day still covers today, so only the other source runs."""
+        today = get_central_date_string()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "flavors.db")
+            saved = FlavorDatabase(path)
+            calendar = [{"location": "Shop", "flavor": "Calendar", "date": today}]
+            saved.save_snapshot("2000-01-01", {"shop": calendar}, time.time())
+            saved.close()
+
+            app = create_app({**TEST_CONFIG, "storage": {"path": path}})
+            app.state.warmup()
+            reopened = FlavorDatabase(path)
+            self.addCleanup(reopened.close)
+            latest = reopened.load_latest_sources()
+
+        self.assertEqual(self.calls, ["other"])
+        flavors = app.state.flavors_store.current().flavors_for()
+        self.assertEqual([f["flavor"] for f in flavors], ["Calendar", "Mint"])
+        self.assertEqual(latest["other"][0], today)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.metrics import (
+    API_CACHE_REQUESTS,
+    FETCH_ATTEMPTS,
+    FETCH_FORBIDDEN,
+    SCRAPER_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    observe_fetch,
+    url_label,
+)
+from app.refresh import run_scrapers
+from app.scrapers.utils import get_central_date_string
+
+
+class TestRegistry(unittest.TestCase):
+    """Unit tests for the in-process metrics registry."""
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_renders_counters_and_gauges(self):
+        requests = Counter("requests_total", "Requests", ("path",), registry=self.registry)
+        temperature = Gauge("temperature", "Freezer temperature", registry=self.registry)
+        requests.labels('/a"b').inc()
+        requests.labels('/a"b').inc(2)
+        temperature.set(-5)
+
+        text = self.registry.render()
+
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{path="/a\\"b"} 3.0', text)
+        self.assertIn("# HELP temperature Freezer temperature", text)
+        self.assertIn("temperature -5.0", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        latency = Histogram("latency_seconds", "Latency", buckets=(1, 5), registry=self.registry)
+        for value in (0.5, 1, 3, 10):
+            latency.observe(value)
+
+        text = self.registry.render()
+
+        self.assertIn('latency_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="5.0"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_sum 14.5", text)
+        self.assertIn("latency_seconds_count 4", text)
+
+    def test_rejects_duplicates_and_wrong_labels(self):
+        counter = Counter("hits_total", "Hits", ("source",), registry=self.registry)
+        with self.assertRaises(ValueError):
+            Counter("hits_total", "Hits", registry=self.registry)
+        with self.assertRaises(ValueError):
+            counter.labels("kopps", "extra")
+
+
+class TestInstrumentation(unittest.TestCase):
+    """The app's metrics are recorded where the work happens."""
+
+    def test_observe_fetch_counts_403s_per_host(self):
+        url = "https://metrics.example/menu"
+        forbidden = FETCH_FORBIDDEN.labels("metrics.example").value
+        observe_fetch(url + "?week=1", 403, 0.2)
+        observe_fetch(url, None, 1.0)
+
+        self.assertEqual(FETCH_FORBIDDEN.labels("metrics.example").value, forbidden + 1)
+        self.assertEqual(FETCH_ATTEMPTS.labels(url, "403").value, 1)
+        self.assertEqual(FETCH_ATTEMPTS.labels(url, "error").value, 1)
+
+    def test_build_ids_are_left_out_of_url_labels(self):
+        before = "https://metrics.example/_next/data/build-1/restaurants/sussex.json"
+        after = "https://metrics.example/_next/data/build-2/restaurants/sussex.json"
+        observe_fetch(before, 200, 0.1)
+        observe_fetch(after, 200, 0.1)
+
+        label = "https://metrics.example/_next/data/*/restaurants/sussex.json"
+        self.assertEqual(url_label(before), label)
+        self.assertEqual(FETCH_ATTEMPTS.labels(label, "200").value, 2)
+        self.assertEqual(
+            url_label("https://metrics.example/menu?week=1"), "https://metrics.example/menu"
+        )
+
+    def test_scraper_durations_record_outcome(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        run_scrapers([("metrics_ok", lambda: [{"flavor": "A"}]), ("metrics_bad", broken)])
+
+        self.assertEqual(sum(SCRAPER_SECONDS.labels("metrics_ok", "ok").counts), 1)
+        self.assertEqual(sum(SCRAPER_SECONDS.labels("metrics_bad", "error").counts), 1)
+
+    def test_metrics_route(self):
+        app = create_app({})
+        app.state.flavors_store.publish(get_central_date_string(), {"kopps": [{"flavor": "A"}]})
+        hits = API_CACHE_REQUESTS.labels("hit").value
+        with patch.object(app.state.flavors_store, "refresh_in_background"):
+            with TestClient(app) as client:
+                client.get("/api/flavors")
+                response = client.get("/metrics")
+
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertEqual(API_CACHE_REQUESTS.labels("hit").value, hits + 1)
+        self.assertIn(f'flavors_api_cache_requests_total{{result="hit"}} {hits + 1}', response.text)
+        self.assertIn("flavors_snapshot_age_seconds ", response.text)
+        self.assertIn("# TYPE flavors_scraper_duration_seconds histogram", response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,12 @@ import unittest
 from datetime import datetime
 from unittest.mock import MagicMock, Mock, call, patch
 
-from app.scrapers.oscars import _extract_flavor_from_modal, scrape_oscars
+from app.scrapers.browser import WebDriverPool
+from app.scrapers.oscars import (
+    _extract_flavor_from_modal,
+    _extract_flavors_from_page_source,
+    scrape_oscars,
+)
 
 
 class TestOscarsScraper(unittest.TestCase):
@@ -17,10 +22,14 @@ class TestOscarsScraper(unittest.TestCase):
         self.mock_driver.get = Mock()
         self.mock_driver.quit = Mock()
         self.mock_driver.execute_script = Mock()
+        # A fresh pool per test so no browser is reused between tests
+        pool_patcher = patch("app.scrapers.oscars.browser_pool", WebDriverPool())
+        pool_patcher.start()
+        self.addCleanup(pool_patcher.stop)
 
-    @patch("app.scrapers.oscars.webdriver.Chrome")
+    @patch("app.scrapers.browser.webdriver.Chrome")
     @patch("app.scrapers.oscars.WebDriverWait")
-    @patch("app.scrapers.oscars._get_chrome_options")
+    @patch("app.scrapers.browser._get_chrome_options")
     @patch("app.scrapers.oscars.get_central_time")
     @patch("app.scrapers.oscars.get_central_date_string")
     def test_multiple_flavors_with_or_separator(
@@ -146,9 +155,9 @@ class TestOscarsScraper(unittest.TestCase):
         # Verify modal close was called for both flavors
         self.assertEqual(mock_close.call_count, 2)
 
-    @patch("app.scrapers.oscars.webdriver.Chrome")
+    @patch("app.scrapers.browser.webdriver.Chrome")
     @patch("app.scrapers.oscars.WebDriverWait")
-    @patch("app.scrapers.oscars._get_chrome_options")
+    @patch("app.scrapers.browser._get_chrome_options")
     @patch("app.scrapers.oscars.get_central_time")
     @patch("app.scrapers.oscars.get_central_date_string")
     def test_single_flavor_fallback(
@@ -270,9 +279,9 @@ class TestOscarsScraper(unittest.TestCase):
         self.assertIsNotNone(result)
         mock_daily_flavor.assert_called_once()
 
-    @patch("app.scrapers.oscars.webdriver.Chrome")
+    @patch("app.scrapers.browser.webdriver.Chrome")
     @patch("app.scrapers.oscars.WebDriverWait")
-    @patch("app.scrapers.oscars._get_chrome_options")
+    @patch("app.scrapers.browser._get_chrome_options")
     @patch("app.scrapers.oscars.get_central_time")
     @patch("app.scrapers.oscars.get_central_date_string")
     @patch("app.scrapers.oscars._extract_flavor_from_modal")
@@ -381,8 +390,8 @@ class TestOscarsScraper(unittest.TestCase):
                     # For negative cases, exceptions are acceptable as the scraper may fail
                     # when it can't find the expected day format
 
-    @patch("app.scrapers.oscars.webdriver.Chrome")
-    @patch("app.scrapers.oscars._get_chrome_options")
+    @patch("app.scrapers.browser.webdriver.Chrome")
+    @patch("app.scrapers.browser._get_chrome_options")
     @patch("app.scrapers.oscars.get_central_time")
     @patch("app.scrapers.oscars.get_central_date_string")
     @patch("app.scrapers.oscars._extract_flavor_from_modal")
@@ -527,9 +536,9 @@ class TestOscarsScraper(unittest.TestCase):
                             self.fail(f"Scraper failed unexpectedly for {scenario['name']}: {e}")
                         # For negative cases, exceptions are acceptable
 
-    @patch("app.scrapers.oscars.webdriver.Chrome")
+    @patch("app.scrapers.browser.webdriver.Chrome")
     @patch("app.scrapers.oscars.WebDriverWait")
-    @patch("app.scrapers.oscars._get_chrome_options")
+    @patch("app.scrapers.browser._get_chrome_options")
     @patch("app.scrapers.oscars.get_central_time")
     @patch("app.scrapers.oscars.get_central_date_string")
     @patch("app.scrapers.oscars._extract_flavor_from_modal")
@@ -625,5 +634,69 @@ class TestOscarsScraper(unittest.TestCase):
                 )
 
 
+class TestOscarsPageSource(unittest.TestCase):
+    """Unit tests for reading flavors from one snapshot of the page, without clicking."""
+
+    PAGE = """
+    <html><body>
+    <table>
+      <tr><td>Mon 14</td><td><a id="overlay_unique_id_205001" href="#open-overlay">TURTLE</a></td></tr>
+      <tr><td>Tue 15</td><td><strong><a id="overlay_unique_id_205873" href="#open-overlay">LEMON
+        BERRY</a></strong> -or- <strong><a id="overlay_unique_id_205580"
+        href="#open-overlay">CHOCOLATE CHIP</a></strong></td></tr>
+    </table>
+    <div id="divi-overlay-container-205873" class="overlay-container">
+      <div class="divioverlay" id="overlay-205873">
+        <h4>LEMON BERRY</h4><p>Red, ripe raspberries wrapped into lemon custard.</p>
+      </div>
+    </div>
+    <div id="divi-overlay-container-205580" class="overlay-container">
+      <div class="divioverlay" id="overlay-205580">
+        <h4>CHOCOLATE CHIP</h4><p>Vanilla custard loaded with chocolate chips.</p>
+      </div>
+    </div>
+    </body></html>
+    """
+
+    def setUp(self):
+        date_patcher = patch(
+            "app.scrapers.oscars.get_central_date_string", return_value="2025-07-15"
+        )
+        date_patcher.start()
+        self.addCleanup(date_patcher.stop)
+
+    def test_links_are_matched_to_their_overlays(self):
+        flavors = _extract_flavors_from_page_source(self.PAGE, datetime(2025, 7, 15))
+
+        self.assertEqual([f["flavor"] for f in flavors], ["LEMON BERRY", "CHOCOLATE CHIP"])
+        self.assertEqual(flavors[1]["description"], "Vanilla custard loaded with chocolate chips.")
+
+    def test_row_with_text_before_the_day(self):
+        page = self.PAGE.replace("<td>Tue 15</td>", "<td>Week 29</td><td>Today: Tuesday 15</td>")
+        flavors = _extract_flavors_from_page_source(page, datetime(2025, 7, 15))
+
+        self.assertEqual([f["flavor"] for f in flavors], ["LEMON BERRY", "CHOCOLATE CHIP"])
+        # "Tuesday 15" is not day 1
+        self.assertIsNone(_extract_flavors_from_page_source(page, datetime(2025, 7, 1)))
+
+    def test_missing_overlay_returns_none(self):
+        """A link whose overlay isn't in the page means the click fallback is needed."""
+        self.assertIsNone(_extract_flavors_from_page_source(self.PAGE, datetime(2025, 7, 14)))
+        self.assertIsNone(_extract_flavors_from_page_source(self.PAGE, datetime(2025, 7, 16)))
+
+    @patch("app.scrapers.oscars.WebDriverWait")
+    @patch("app.scrapers.oscars.get_central_time", return_value=datetime(2025, 7, 15))
+    def test_scrape_reads_page_source_without_clicking(self, mock_time, mock_wait):
+        driver = Mock()
+        driver.page_source = self.PAGE
+        with patch("app.scrapers.oscars.browser_pool", WebDriverPool(factory=lambda: driver)):
+            with patch("app.scrapers.oscars.time.sleep") as mock_sleep:
+                flavors = scrape_oscars()
+
+        self.assertEqual(len(flavors), 2)
+        driver.execute_script.assert_not_called()
+        mock_sleep.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
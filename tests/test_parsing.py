@@ -0,0 +1,62 @@
+import unittest
+
+from app.scrapers.parsing import css_subtree, full_document, script_text, strained
+
+PAGE = """
+<html><head>
+<script src="/app.js"></script>
+<script id="__NEXT_DATA__" type="application/json">{"props": {"pageProps": {}}}</script>
+</head><body>
+<nav><a href="/">Home</a></nav>
+<div class="wp-block-todays-flavors"><h2>Today's Flavors - July 15</h2><h3>Turtle</h3></div>
+<span class="flavorOfDayWhiteSpan">Mint</span>
+</body></html>
+"""
+
+
+class TestParseSteps(unittest.TestCase):
+    """Unit tests for the pluggable parse steps used by get_html."""
+
+    def test_full_document(self):
+        self.assertEqual(full_document("html.parser")(PAGE).find("h3").text, "Turtle")
+
+    def test_strained_builds_only_matching_elements(self):
+        soup = strained("div", parser="html.parser", class_="wp-block-todays-flavors")(PAGE)
+        self.assertEqual(soup.find("h3").text, "Turtle")
+        self.assertIsNone(soup.find("nav"))
+        self.assertIsNone(soup.find("span"))
+
+    def test_css_subtree(self):
+        step = css_subtree("div.wp-block-todays-flavors h2", parser="html.parser")
+        self.assertEqual(step(PAGE).text, "Today's Flavors - July 15")
+        self.assertIsNone(css_subtree("table", parser="html.parser")(PAGE))
+
+    def test_script_text(self):
+        self.assertEqual(script_text("__NEXT_DATA__")(PAGE), '{"props": {"pageProps": {}}}')
+        self.assertIsNone(script_text("missing")(PAGE))
+
+    def test_script_text_stream_handles_chunk_boundaries(self):
+        step = script_text("__NEXT_DATA__")
+        for size in (1, 7, 64, len(PAGE)):
+            with self.subTest(chunk_size=size):
+                chunks = (PAGE[i : i + size] for i in range(0, len(PAGE), size))
+                self.assertEqual(step.stream(chunks), '{"props": {"pageProps": {}}}')
+
+    def test_script_text_stream_stops_reading_at_the_end_of_the_script(self):
+        chunks = iter([PAGE[:200], PAGE[200:]])
+        self.assertIsNotNone(script_text("__NEXT_DATA__").stream(chunks))
+        self.assertEqual(list(chunks), [PAGE[200:]])
+        self.assertIsNone(script_text("missing").stream(iter([PAGE])))
+
+    def test_steps_have_distinct_cache_keys(self):
+        keys = {
+            full_document("html.parser").key,
+            strained("div", parser="html.parser", class_="a").key,
+            strained("div", parser="html.parser", class_="b").key,
+            script_text("__NEXT_DATA__").key,
+        }
+        self.assertEqual(len(keys), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+
+from app.persistence import FlavorDatabase
+
+
+class TestFlavorDatabase(unittest.TestCase):
+    """Unit tests for the on-disk snapshot store."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "nested", "flavors.db")
+        self.db = FlavorDatabase(self.path)
+        self.addCleanup(self.db.close)
+
+    def test_construction_does_not_touch_disk(self):
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_snapshot_round_trip(self):
+        sources = {
+            "culvers": [{"location": "Culvers (Sussex)", "flavor": "Turtle"}],
+            "kopps": [
+                {"location": "Kopps", "flavor": "Mint"},
+                {"location": "Kopps", "flavor": "X"},
+            ],
+        }
+        self.db.save_snapshot("2025-07-15", sources)
+
+        reopened = FlavorDatabase(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.load_snapshot("2025-07-15"), sources)
+        self.assertEqual(list(reopened.load_snapshot("2025-07-15")), ["culvers", "kopps"])
+
+    def test_snapshots_are_keyed_by_date_and_source(self):
+        self.db.save_snapshot("2025-07-15", {"kopps": [{"flavor": "Old"}]})
+        self.db.save_snapshot("2025-07-16", {"kopps": [{"flavor": "New"}]})
+        self.db.save_snapshot("2025-07-16", {"murfs": [{"flavor": "Late"}]})
+
+        self.assertEqual(self.db.load_snapshot("2025-07-15"), {"kopps": [{"flavor": "Old"}]})
+        self.assertEqual(
+            self.db.load_snapshot("2025-07-16"),
+            {"kopps": [{"flavor": "New"}], "murfs": [{"flavor": "Late"}]},
+        )
+        self.assertEqual(self.db.load_snapshot("2025-07-17"), {})
+
+    def test_latest_save_per_source(self):
+        self.db.save_snapshot("2025-07-15", {"culvers": [{"flavor": "Calendar"}]}, 100.0)
+        self.db.save_snapshot("2025-07-15", {"kopps": [{"flavor": "Old"}]}, 100.0)
+        self.db.save_snapshot("2025-07-16", {"kopps": [{"flavor": "New"}]}, 200.0)
+
+        self.assertEqual(
+            self.db.load_latest_sources(),
+            {
+                "culvers": ("2025-07-15", [{"flavor": "Calendar"}], 100.0),
+                "kopps": ("2025-07-16", [{"flavor": "New"}], 200.0),
+            },
+        )
+
+
+class TestFlavorHistory(unittest.TestCase):
+    """Unit tests for the indexed flavor history store."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db = FlavorDatabase(os.path.join(self.tmpdir.name, "flavors.db"))
+        self.addCleanup(self.db.close)
+        self.db.save_history(
+            "2025-07-15",
+            {
+                "culvers": [
+                    {"location": "Culvers (Sussex)", "flavor": "Turtle", "date": "2025-07-15"},
+                    {"location": "Culvers (Sussex)", "flavor": "Mint", "date": "2025-07-14"},
+                    {"location": "Culvers (Sussex)", "flavor": "Planned", "date": "2025-07-16"},
+                ],
+                "kopps": [
+                    {"location": "Kopps", "flavor": "Turtle", "date": "Tuesday, July 15"},
+                    {"location": "Kopps", "flavor": "Butter Pecan", "date": None},
+                ],
+            },
+        )
+
+    def test_records_use_iso_date_or_snapshot_date(self):
+        dates = {(r["location"], r["flavor"]): r["date"] for r in self.db.query_history()}
+        self.assertEqual(dates[("Culvers (Sussex)", "Mint")], "2025-07-14")
+        self.assertEqual(dates[("Kopps", "Turtle")], "2025-07-15")
+        self.assertEqual(dates[("Kopps", "Butter Pecan")], "2025-07-15")
+
+    def test_future_calendar_entries_are_not_history(self):
+        self.assertEqual(self.db.query_history(flavor="Planned"), [])
+
+    def test_repeated_saves_do_not_duplicate(self):
+        self.db.save_history(
+            "2025-07-15",
+            {"kopps": [{"location": "Kopps", "flavor": "Turtle", "description": "Updated"}]},
+        )
+        turtles = self.db.query_history(location="Kopps", flavor="Turtle")
+        self.assertEqual(len(turtles), 1)
+        self.assertEqual(turtles[0]["description"], "Updated")
+
+    def test_filters(self):
+        self.assertEqual(
+            [r["location"] for r in self.db.query_history(flavor="turtle")],
+            ["Culvers (Sussex)", "Kopps"],
+        )
+        self.assertEqual(
+            [r["flavor"] for r in self.db.query_history(location="kopps")],
+            ["Butter Pecan", "Turtle"],
+        )
+        self.assertEqual(
+            [r["flavor"] for r in self.db.query_history(end="2025-07-14")],
+            ["Mint"],
+        )
+        self.assertEqual(len(self.db.query_history(end="2025-07-15", limit=2)), 2)
+
+    def test_filtered_queries_use_indexes(self):
+        """Location and flavor filters are answered from an index, not a table scan."""
+        for kwargs in ({"location": "Kopps"}, {"flavor": "Turtle"}, {"start": "2025-07-01"}):
+            with self.subTest(**kwargs):
+                sql, params = self.db._history_query(
+                    kwargs.get("start"), None, kwargs.get("location"), kwargs.get("flavor"), 10
+                )
+                plan = self.db._connection().execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                details = " ".join(row[-1] for row in plan.fetchall())
+                self.assertIn("SEARCH", details)
+                self.assertNotIn("SCAN flavor_history", details)
+
+
+if __name__ == "__main__":
+    unittest.main()
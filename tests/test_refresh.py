@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app.refresh import run_scrapers
+
+
+def _scraper(flavors, delay=0.0):
+    def scrape():
+        time.sleep(delay)
+        return flavors
+
+    return scrape
+
+
+class TestRunScrapers(unittest.TestCase):
+    """Unit tests for the concurrent refresh engine."""
+
+    def test_scrapers_run_concurrently(self):
+        """Wall-clock time should be close to the slowest scraper, not the sum."""
+        scrapers = [(f"shop{i}", _scraper([{"flavor": f"F{i}"}], delay=0.3)) for i in range(4)]
+        start = time.monotonic()
+        results = run_scrapers(scrapers, max_workers=4, scraper_timeout=5, refresh_budget=5)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(list(results), ["shop0", "shop1", "shop2", "shop3"])
+        self.assertLess(elapsed, 1.0)
+
+    def test_results_keep_scraper_order(self):
+        """Results are ordered like the scraper list regardless of completion order."""
+        scrapers = [
+            ("slow", _scraper([{"flavor": "A"}], delay=0.2)),
+            ("fast", _scraper([{"flavor": "B"}])),
+        ]
+        results = run_scrapers(scrapers, max_workers=2, scraper_timeout=5, refresh_budget=5)
+        self.assertEqual(list(results), ["slow", "fast"])
+
+    def test_coroutine_scrapers_run_on_event_loop(self):
+        """Async scrapers are awaited on the scraper loop alongside threaded ones."""
+
+        async def scrape_async():
+            await asyncio.sleep(0.2)
+            return [{"flavor": "ASYNC"}]
+
+        scrapers = [("async", scrape_async), ("sync", _scraper([{"flavor": "SYNC"}], delay=0.2))]
+        start = time.monotonic()
+        results = run_scrapers(scrapers, max_workers=1, scraper_timeout=5, refresh_budget=5)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {"async": [{"flavor": "ASYNC"}], "sync": [{"flavor": "SYNC"}]})
+        self.assertLess(elapsed, 0.39)
+
+    def test_failing_scraper_is_isolated(self):
+        """An exception in one scraper doesn't affect the others."""
+
+        def broken():
+            raise RuntimeError("boom")
+
+        scrapers = [("broken", broken), ("ok", _scraper([{"flavor": "A"}]))]
+        results = run_scrapers(scrapers, max_workers=2, scraper_timeout=5, refresh_budget=5)
+        self.assertEqual(results, {"ok": [{"flavor": "A"}]})
+
+    def test_straggler_reports_late_result(self):
+        """A scraper past its deadline is left behind and reported when it finishes."""
+        late = {}
+        reported = threading.Event()
+
+        def on_late_result(name, flavors):
+            late[name] = flavors
+            reported.set()
+
+        scrapers = [
+            ("fast", _scraper([{"flavor": "A"}])),
+            ("slow", _scraper([{"flavor": "B"}], delay=1.0)),
+        ]
+        start = time.monotonic()
+        results = run_scrapers(
+            scrapers,
+            max_workers=2,
+            scraper_timeout=0.2,
+            refresh_budget=5,
+            on_late_result=on_late_result,
+        )
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {"fast": [{"flavor": "A"}]})
+        self.assertLess(elapsed, 0.9)
+        self.assertTrue(reported.wait(timeout=3))
+        self.assertEqual(late, {"slow": [{"flavor": "B"}]})
+
+    def test_refresh_budget_returns_partial_results(self):
+        """The overall budget caps the refresh even when scrapers are still queued."""
+        scrapers = [
+            ("first", _scraper([{"flavor": "A"}])),
+            ("blocked", _scraper([{"flavor": "B"}], delay=1.0)),
+            ("queued", _scraper([{"flavor": "C"}])),
+        ]
+        start = time.monotonic()
+        results = run_scrapers(scrapers, max_workers=2, scraper_timeout=10, refresh_budget=0.3)
+        elapsed = time.monotonic() - start
+
+        self.assertIn("first", results)
+        self.assertNotIn("blocked", results)
+        self.assertLess(elapsed, 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,301 @@
+import asyncio
+import io
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+import requests
+
+from app.scrapers import bubbas, kopps, murfs
+from app.scrapers.async_utils import get_html_async
+from app.scrapers.parsing import script_text
+from app.scrapers.throttle import HostThrottle
+from app.scrapers.utils import STREAM_CHUNK_SIZE, fetch_concurrently, get_html
+
+
+class TestFetchConcurrently(unittest.TestCase):
+    """Unit tests for the parallel multi-location fetch helper."""
+
+    def test_per_host_limit_is_respected(self):
+        """No more than max_per_host calls hit the same host at once."""
+        active = {"a.example": 0, "b.example": 0}
+        peak = {"a.example": 0, "b.example": 0}
+        lock = threading.Lock()
+
+        def fetch(url):
+            host = url.split("/")[2]
+            with lock:
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+            return url
+
+        urls = [f"https://a.example/{i}" for i in range(6)] + ["https://b.example/0"]
+        results = fetch_concurrently(fetch, urls, max_per_host=2)
+
+        self.assertEqual([result for result, _ in results], urls)
+        self.assertEqual(peak["a.example"], 2)
+        self.assertEqual(peak["b.example"], 1)
+
+    def test_errors_are_isolated_per_url(self):
+        """A failing URL reports its error without affecting the rest."""
+
+        def fetch(url):
+            if url.endswith("bad"):
+                raise ValueError("bad location")
+            return "ok"
+
+        results = fetch_concurrently(fetch, ["https://x.example/good", "https://x.example/bad"])
+
+        self.assertEqual(results[0], ("ok", None))
+        self.assertIsNone(results[1][0])
+        self.assertIsInstance(results[1][1], ValueError)
+
+    def test_empty_url_list(self):
+        self.assertEqual(fetch_concurrently(lambda url: url, []), [])
+
+
+class TestGetHtmlAsync(unittest.TestCase):
+    """Unit tests for the asyncio fetch layer."""
+
+    def setUp(self):
+        # Fresh limiters and breakers so hosts don't carry state between tests
+        throttle_patcher = patch("app.scrapers.async_utils.throttle", HostThrottle())
+        throttle_patcher.start()
+        self.addCleanup(throttle_patcher.stop)
+
+    def _run(self, handler, **kwargs):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch("app.scrapers.async_utils.get_async_client", return_value=client):
+                with patch("app.scrapers.async_utils.asyncio.sleep") as self.mock_sleep:
+                    try:
+                        return await get_html_async("https://shop.example/", **kwargs)
+                    finally:
+                        await client.aclose()
+
+        return asyncio.run(run())
+
+    def test_returns_parsed_html(self):
+        def handler(request):
+            self.assertIn("User-Agent", request.headers)
+            return httpx.Response(
+                200, headers={"Content-Type": "text/html"}, text="<h1>Butter Pecan</h1>"
+            )
+
+        html = self._run(handler)
+        self.assertEqual(html.find("h1").text, "Butter Pecan")
+
+    def test_parsing_runs_off_the_event_loop(self):
+        threads = []
+
+        def parse(text):
+            threads.append(threading.current_thread())
+            return text
+
+        parse.key = "record-thread"
+
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, text="<p>ok</p>")
+
+        self.assertEqual(self._run(handler, parse=parse), "<p>ok</p>")
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_retries_after_403_then_gives_up(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.headers.get("Sec-Fetch-Site"))
+            return httpx.Response(403)
+
+        html = self._run(handler, max_retries=2, use_selenium_fallback=False)
+        self.assertIsNone(html)
+        self.assertEqual(calls, ["none", "cross-site"])
+
+    def test_first_attempt_is_not_delayed(self):
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, text="<p>ok</p>")
+
+        self._run(handler)
+        self.assertEqual([c.args[0] for c in self.mock_sleep.call_args_list], [0])
+
+    def test_retry_after_is_honored(self):
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "7"}),
+            httpx.Response(200, headers={"Content-Type": "text/html"}, text="<p>ok</p>"),
+        ]
+
+        html = self._run(lambda request: responses.pop(0))
+        self.assertEqual(html.find("p").text, "ok")
+        delays = [c.args[0] for c in self.mock_sleep.call_args_list]
+        self.assertIn(7, delays)
+
+    def test_open_circuit_skips_selenium_fallback(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(503)
+
+        with patch(
+            "app.scrapers.async_utils.get_html_selenium", return_value=None
+        ) as mock_selenium:
+            for _ in range(3):
+                self.assertIsNone(self._run(handler))
+
+        # Five consecutive 503s open the circuit; later calls don't reach the host at all
+        self.assertEqual(len(calls), 5)
+        mock_selenium.assert_called_once()
+
+
+def _broken_parse(text):
+    raise ValueError("unexpected markup")
+
+
+_broken_parse.key = "broken"
+
+
+class TestCircuitTrial(unittest.TestCase):
+    """A half-open circuit's trial request is released even when it raises."""
+
+    URL = "https://trial.example/"
+
+    def setUp(self):
+        self.throttle = HostThrottle()
+        self.throttle.configure(failure_threshold=1, reset_timeout=0)
+        self.breaker = self.throttle.breaker(self.URL)
+        self.breaker.record_failure()  # Open; with no reset timeout the next request is a trial
+
+    def test_parse_error_during_sync_trial(self):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers["Content-Type"] = "text/html"
+        resp._content = b"<p>ok</p>"
+        with patch("app.scrapers.utils.throttle", self.throttle):
+            with patch("app.scrapers.utils.session.get", return_value=resp):
+                with self.assertRaises(ValueError):
+                    get_html(self.URL, parse=_broken_parse, use_selenium_fallback=False)
+
+        self.assertTrue(self.breaker.allow())
+
+    def test_parse_error_during_async_trial(self):
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, text="<p>ok</p>")
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch("app.scrapers.async_utils.get_async_client", return_value=client):
+                try:
+                    await get_html_async(self.URL, parse=_broken_parse)
+                finally:
+                    await client.aclose()
+
+        with patch("app.scrapers.async_utils.throttle", self.throttle):
+            with self.assertRaises(ValueError):
+                asyncio.run(run())
+
+        self.assertTrue(self.breaker.allow())
+
+
+class TestPost(unittest.TestCase):
+    """Bubba's GraphQL POSTs go through the host limiter, circuit breaker and metrics."""
+
+    def setUp(self):
+        self.throttle = HostThrottle()
+        self.throttle.configure(failure_threshold=1, reset_timeout=60)
+        self.breaker = self.throttle.breaker(bubbas.BUBBAS_GRAPHQL_ENDPOINT)
+        self.enterContext(patch("app.scrapers.utils.throttle", self.throttle))
+        self.enterContext(patch("app.scrapers.async_utils.throttle", self.throttle))
+
+    def test_server_error_opens_the_circuit(self):
+        resp = requests.Response()
+        resp.status_code = 503
+        resp._content = b""
+        with patch("app.scrapers.utils.session.post", return_value=resp) as mock_post:
+            with patch("app.scrapers.utils.observe_fetch") as mock_observe:
+                self.assertEqual(bubbas.scrape_bubbas(), [])
+                self.assertEqual(bubbas.scrape_bubbas(), [])
+
+        mock_post.assert_called_once()
+        mock_observe.assert_called_once()
+        self.assertEqual(mock_observe.call_args.args[:2], (bubbas.BUBBAS_GRAPHQL_ENDPOINT, 503))
+        self.assertTrue(self.breaker.is_open())
+
+    def test_open_circuit_skips_the_async_request(self):
+        self.breaker.record_failure()
+        with patch("app.scrapers.async_utils.get_async_client") as mock_client:
+            self.assertEqual(asyncio.run(bubbas.scrape_bubbas_async()), [])
+        mock_client.assert_not_called()
+
+
+class TestScrapersWithoutPage(unittest.TestCase):
+    """Scrapers return no flavors when get_html gives up, e.g. with the host's circuit open."""
+
+    def test_sync_scrapers(self):
+        for module, scrape in ((kopps, kopps.scrape_kopps), (murfs, murfs.scrape_murfs)):
+            with self.subTest(module.__name__), patch.object(module, "get_html", return_value=None):
+                with self.assertLogs(module.__name__, "WARNING"):
+                    self.assertEqual(scrape(), [])
+
+    def test_async_scrapers(self):
+        async def no_page(*args, **kwargs):
+            return None
+
+        for module, scrape in (
+            (kopps, kopps.scrape_kopps_async),
+            (murfs, murfs.scrape_murfs_async),
+        ):
+            with self.subTest(module.__name__), patch.object(module, "get_html_async", no_page):
+                with self.assertLogs(module.__name__, "WARNING"):
+                    self.assertEqual(asyncio.run(scrape()), [])
+
+
+class CountingStream(io.BytesIO):
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class TestStreamingGetHtml(unittest.TestCase):
+    """get_html(stream=True) stops downloading once the parse step has its result."""
+
+    def setUp(self):
+        throttle_patcher = patch("app.scrapers.utils.throttle", HostThrottle())
+        throttle_patcher.start()
+        self.addCleanup(throttle_patcher.stop)
+
+    def _response(self, body):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers["Content-Type"] = "text/html; charset=utf-8"
+        resp.encoding = "utf-8"
+        resp.raw = CountingStream(body)
+        return resp
+
+    def test_download_stops_after_script(self):
+        blob = '{"flavor": "Caf\u00e9 Mocha"}'
+        head = f'<html><head><script id="__NEXT_DATA__">{blob}</script></head>'.encode()
+        body = head + b"<body>" + b"<div>padding</div>" * 100_000 + b"</body></html>"
+        resp = self._response(body)
+
+        with patch("app.scrapers.utils.session.get", return_value=resp) as mock_get:
+            result = get_html(
+                "https://c.example/r", parse=script_text("__NEXT_DATA__"), stream=True
+            )
+
+        self.assertEqual(result, blob)
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        self.assertLess(resp.raw.bytes_read, 2 * STREAM_CHUNK_SIZE)
+        self.assertTrue(resp.raw.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import gzip
+import json
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from app.snapshot import SnapshotStore, select_flavors
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Unit tests for the versioned snapshot store."""
+
+    def setUp(self):
+        self.store = SnapshotStore()
+
+    def test_publish_creates_new_versions(self):
+        self.assertIsNone(self.store.current())
+        first = self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+        second = self.store.publish("2025-07-16", {"kopps": [{"flavor": "B"}]})
+
+        self.assertEqual(first.version, 1)
+        self.assertEqual(second.version, 2)
+        self.assertIs(self.store.current(), second)
+        # Earlier snapshots are never modified after publishing
+        self.assertEqual(first.data, ({"flavor": "A"},))
+
+    def test_data_flattens_sources_in_order(self):
+        snapshot = self.store.publish(
+            "2025-07-15",
+            {"culvers": [{"flavor": "A"}, {"flavor": "B"}], "kopps": [{"flavor": "C"}]},
+        )
+        self.assertEqual([f["flavor"] for f in snapshot.data], ["A", "B", "C"])
+        with self.assertRaises(TypeError):
+            snapshot.sources["kopps"] = []
+
+    def test_update_source_replaces_one_source(self):
+        self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}], "murfs": []})
+        updated = self.store.update_source("2025-07-15", "murfs", [{"flavor": "M"}])
+
+        self.assertEqual(updated.version, 2)
+        self.assertEqual([f["flavor"] for f in updated.data], ["A", "M"])
+
+    def test_update_source_ignores_other_dates(self):
+        self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+        self.assertIsNone(self.store.update_source("2025-07-14", "murfs", [{"flavor": "M"}]))
+        self.assertEqual(self.store.current().version, 1)
+
+    def test_refresh_is_single_flight(self):
+        """Concurrent refresh requests start only one refresh."""
+        release = threading.Event()
+        calls = []
+
+        def refresh_fn():
+            calls.append(1)
+            release.wait(timeout=2)
+            self.store.publish("2025-07-15", {"kopps": []})
+
+        started = [self.store.refresh_in_background(refresh_fn) for _ in range(5)]
+        time.sleep(0.1)
+        self.assertFalse(self.store.refresh(refresh_fn))
+        release.set()
+        for _ in range(50):
+            if not self.store.is_refreshing():
+                break
+            time.sleep(0.02)
+
+        self.assertTrue(started[0])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.store.current().version, 1)
+
+    def test_failed_refresh_keeps_last_snapshot(self):
+        self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+
+        def broken():
+            raise RuntimeError("boom")
+
+        self.assertTrue(self.store.refresh(broken))
+        self.assertEqual(self.store.current().version, 1)
+        self.assertFalse(self.store.is_refreshing())
+
+    def test_renditions_are_built_at_publish(self):
+        snapshot = self.store.publish("2025-07-15", {"kopps": [{"flavor": "Café"}]})
+
+        rendition = snapshot._renditions["2025-07-15"]
+        self.assertEqual(json.loads(rendition["identity"]), [{"flavor": "Café"}])
+        self.assertEqual(gzip.decompress(rendition["gzip"]), rendition["identity"])
+        self.assertIs(snapshot.rendition(), rendition)
+        self.assertTrue(rendition["etag"].startswith('"1-'))
+
+    def test_brotli_rendition_when_installed(self):
+        fake_brotli = Mock()
+        fake_brotli.compress.return_value = b"br-bytes"
+        with patch("app.encoding.brotli", fake_brotli):
+            snapshot = self.store.publish("2025-07-15", {"kopps": []})
+        self.assertEqual(snapshot.rendition()["br"], b"br-bytes")
+        with patch("app.encoding.brotli", None):
+            snapshot = self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+        self.assertNotIn("br", snapshot.rendition())
+
+    def test_unchanged_flavors_are_not_republished(self):
+        listener = Mock()
+        first = self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]})
+        self.store.add_listener(listener)
+
+        self.assertIs(self.store.publish("2025-07-15", {"kopps": [{"flavor": "A"}]}), first)
+        listener.assert_not_called()
+        # A new day is published even when the flavors are the same
+        self.assertEqual(self.store.publish("2025-07-16", {"kopps": [{"flavor": "A"}]}).version, 2)
+
+    def test_superseded_snapshot_is_not_notified(self):
+        listener = Mock()
+        self.store.add_listener(listener)
+        older = self.store.swap("2025-07-15", {"kopps": [{"flavor": "A"}]})
+        newer = self.store.swap("2025-07-15", {"kopps": [{"flavor": "B"}]})
+
+        self.store.notify(newer)
+        self.store.notify(older)
+        self.store.notify(newer)
+        listener.assert_called_once_with(newer)
+
+
+class TestSelectFlavors(unittest.TestCase):
+    """Unit tests for picking a day's flavors out of a snapshot."""
+
+    FLAVORS = [
+        {"location": "Culvers (Sussex)", "flavor": "Turtle", "date": "2025-07-15"},
+        {"location": "Culvers (Sussex)", "flavor": "Mint", "date": "2025-07-16"},
+        {"location": "Culvers (Sussex)", "flavor": "Oreo", "date": "2025-07-17"},
+        {"location": "Culvers (124th)", "flavor": "Caramel", "date": "2025-07-17"},
+        {"location": "Kopps", "flavor": "Butter Pecan", "date": "Tuesday, July 15"},
+        {"location": "Kopps", "flavor": "Grasshopper", "date": "Tuesday, July 15"},
+    ]
+
+    def _names(self, date):
+        return [f["flavor"] for f in select_flavors(self.FLAVORS, date, "2025-07-15")]
+
+    def test_today_shows_one_entry_per_calendar_location(self):
+        """Today's view matches the old behavior: today's entry or the next upcoming one."""
+        self.assertEqual(
+            self._names("2025-07-15"), ["Turtle", "Caramel", "Butter Pecan", "Grasshopper"]
+        )
+
+    def test_future_date_comes_from_calendar(self):
+        self.assertEqual(self._names("2025-07-16"), ["Mint"])
+        self.assertEqual(self._names("2025-07-17"), ["Oreo", "Caramel"])
+
+    def test_unknown_date_is_empty(self):
+        self.assertEqual(self._names("2025-08-01"), [])
+
+    def test_views_are_cached_per_snapshot(self):
+        store = SnapshotStore()
+        snapshot = store.publish("2025-07-15", {"culvers": self.FLAVORS})
+        self.assertIs(snapshot.flavors_for(), snapshot.flavors_for("2025-07-15"))
+
+    def test_only_calendar_dates_are_cached(self):
+        store = SnapshotStore()
+        snapshot = store.publish("2025-07-15", {"culvers": self.FLAVORS})
+        snapshot.rendition("2025-07-16")
+        for day in range(1, 29):
+            self.assertEqual(snapshot.rendition(f"2030-02-{day:02d}")["identity"], b"[]")
+
+        self.assertEqual(set(snapshot._renditions), {"2025-07-15", "2025-07-16"})
+        self.assertEqual(set(snapshot._views), {"2025-07-15", "2025-07-16"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+from app.snapshot import SnapshotStore
+from app.sources import CENTRAL, SourceCache, SourcePolicy, load_policies, next_central_midnight
+
+DAY = 24 * 60 * 60
+
+
+def central(text):
+    return datetime.fromisoformat(text).replace(tzinfo=CENTRAL).timestamp()
+
+
+class TestSourcePolicy(unittest.TestCase):
+    """Unit tests for per-source refresh policies."""
+
+    def test_schedule_times_are_central(self):
+        policy = SourcePolicy(schedule=((8, 0), (20, 30)))
+        now = central("2025-07-15T12:00")
+        self.assertEqual(policy.last_scheduled(now), central("2025-07-15T08:00"))
+        self.assertEqual(policy.next_scheduled(now), central("2025-07-15T20:30"))
+        early = central("2025-07-15T07:00")
+        self.assertEqual(policy.last_scheduled(early), central("2025-07-14T20:30"))
+
+    def test_empty_schedule(self):
+        policy = SourcePolicy(schedule=())
+        self.assertIsNone(policy.last_scheduled(central("2025-07-15T12:00")))
+        self.assertIsNone(policy.next_scheduled(central("2025-07-15T12:00")))
+
+    def test_load_policies_merges_defaults(self):
+        settings = {
+            "defaults": {"ttl": 3600, "retry_interval": 60},
+            "culvers": {"ttl": 3 * DAY, "schedule": []},
+            "kopps": {"schedule": ["07:00", "19:15"]},
+        }
+        policies = load_policies(["culvers", "kopps", "murfs"], settings, "08:00")
+
+        self.assertEqual(policies["culvers"], SourcePolicy(3 * DAY, (), 60))
+        self.assertEqual(policies["kopps"], SourcePolicy(3600, ((7, 0), (19, 15)), 60))
+        self.assertEqual(policies["murfs"], SourcePolicy(3600, ((8, 0),), 60))
+        self.assertEqual(load_policies(["kopps"], None)["kopps"], SourcePolicy())
+
+
+class TestSourceCache(unittest.TestCase):
+    """Unit tests for per-source freshness and merging."""
+
+    def setUp(self):
+        self.cache = SourceCache(
+            {
+                "culvers": SourcePolicy(ttl=3 * DAY, schedule=()),
+                "kopps": SourcePolicy(ttl=DAY, schedule=((8, 0),), retry_interval=900),
+            }
+        )
+        self.morning = central("2025-07-15T09:00")
+
+    def test_everything_is_due_at_first(self):
+        self.assertEqual(self.cache.due("2025-07-15", self.morning), ["culvers", "kopps"])
+
+    def test_fresh_sources_are_not_due(self):
+        self.cache.record_success("culvers", [{"date": "2025-07-15"}], "2025-07-15", self.morning)
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+        self.assertEqual(self.cache.due("2025-07-15", self.morning + 60), [])
+
+    def test_schedule_and_day_change(self):
+        calendar = [{"date": "2025-07-15"}, {"date": "2025-07-16"}]
+        self.cache.record_success("culvers", calendar, "2025-07-15", self.morning)
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+
+        # After midnight Kopp's has nothing for the new day; the calendar still covers it
+        midnight = central("2025-07-16T00:30")
+        self.assertEqual(self.cache.due("2025-07-16", midnight), ["kopps"])
+        self.assertEqual(list(self.cache.sources_for("2025-07-16")), ["culvers"])
+        # The calendar runs out after its last day, and Kopp's is rescraped at 08:00 regardless
+        self.assertEqual(
+            self.cache.due("2025-07-17", central("2025-07-17T00:30")), ["culvers", "kopps"]
+        )
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-16", midnight)
+        self.assertEqual(self.cache.due("2025-07-16", central("2025-07-16T08:00")), ["kopps"])
+
+    def test_ttl_expiry(self):
+        self.cache.record_success("culvers", [{"date": "2025-07-18"}], "2025-07-15", self.morning)
+        self.assertNotIn("culvers", self.cache.due("2025-07-18", self.morning + 3 * DAY - 1))
+        self.assertIn("culvers", self.cache.due("2025-07-18", self.morning + 3 * DAY))
+
+    def test_failure_keeps_flavors_and_waits_for_retry(self):
+        self.cache.record_success("culvers", [{"date": "2025-07-15"}], "2025-07-15", self.morning)
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+        self.cache.expire(["kopps"])
+        self.cache.record_failure("kopps", self.morning + 60)
+
+        self.assertFalse(self.cache.is_due("kopps", "2025-07-15", self.morning + 60 + 899))
+        self.assertTrue(self.cache.is_due("kopps", "2025-07-15", self.morning + 60 + 900))
+        self.assertEqual(self.cache.next_due(self.morning + 120), self.morning + 960)
+        self.assertEqual(self.cache.sources_for("2025-07-15")["kopps"], ({"flavor": "Mint"},))
+
+    def test_next_due_is_capped_at_midnight(self):
+        evening = central("2025-07-15T22:00")
+        self.cache.record_success("culvers", [{"date": "2025-07-15"}], "2025-07-15", evening)
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", evening)
+        self.assertEqual(self.cache.next_due(evening + 60), central("2025-07-16T00:00"))
+
+    def test_next_central_midnight(self):
+        self.assertEqual(
+            next_central_midnight(central("2025-07-15T23:59")), central("2025-07-16T00:00")
+        )
+        self.assertEqual(
+            next_central_midnight(central("2025-07-16T00:00")), central("2025-07-17T00:00")
+        )
+        # The night clocks go back is 25 hours long
+        self.assertEqual(
+            next_central_midnight(central("2025-11-02T00:00")) - central("2025-11-02T00:00"),
+            DAY + 3600,
+        )
+
+    def test_listeners_see_successful_scrapes(self):
+        listener = Mock()
+        self.cache.add_listener(listener)
+        self.cache.record_failure("kopps", self.morning)
+        entry = self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+        listener.assert_called_once_with("kopps", entry)
+        self.assertIsNone(entry.failed_at)
+
+    def test_restore_ignores_unknown_sources(self):
+        self.cache.restore("gone", [{"flavor": "X"}], "2025-07-15", self.morning)
+        self.cache.restore("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+        self.assertEqual(self.cache.due("2025-07-15", self.morning + 60), ["culvers"])
+
+    def test_publish_merges_sources_in_order(self):
+        store = SnapshotStore()
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+        self.cache.record_success("culvers", [{"date": "2025-07-15"}], "2025-07-15", self.morning)
+        snapshot = self.cache.publish(store, "2025-07-15")
+
+        self.assertEqual(list(snapshot.sources), ["culvers", "kopps"])
+        self.assertIs(store.current(), snapshot)
+
+    def test_publish_listeners_run_outside_the_locks(self):
+        store = SnapshotStore()
+        held = []
+        store.add_listener(
+            lambda snapshot: held.append((self.cache._lock.locked(), store._publish_lock.locked()))
+        )
+        self.cache.record_success("kopps", [{"flavor": "Mint"}], "2025-07-15", self.morning)
+        self.cache.publish(store, "2025-07-15")
+
+        self.assertEqual(held, [(False, False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
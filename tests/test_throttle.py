@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+from app.scrapers.throttle import CircuitBreaker, TokenBucket, backoff_delay, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Unit tests for the per-host rate limiter."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, burst=2, clock=self.clock)
+
+    def test_burst_then_rate(self):
+        self.assertEqual([self.bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1.0])
+
+    def test_tokens_refill_over_time(self):
+        self.bucket.reserve()
+        self.bucket.reserve()
+        self.clock.now += 0.5
+        self.assertEqual(self.bucket.reserve(), 0)
+
+    def test_pause_delays_every_request(self):
+        self.bucket.pause(5)
+        self.assertEqual(self.bucket.reserve(), 5)
+        self.clock.now += 5
+        self.assertEqual(self.bucket.reserve(), 0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Unit tests for the per-host circuit breaker."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_allows_a_single_trial(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now += 61
+
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+
+        self.clock.now += 61
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.is_open())
+        self.assertTrue(self.breaker.allow())
+
+    def test_released_trial_lets_the_next_request_try(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now += 61
+
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+class TestBackoff(unittest.TestCase):
+    """Unit tests for retry delays."""
+
+    def test_delay_grows_with_attempts(self):
+        with patch("app.scrapers.throttle.random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual([backoff_delay(a) for a in range(3)], [0.5, 1.0, 2.0])
+
+    def test_slow_down_and_retry_after_set_the_floor(self):
+        with patch("app.scrapers.throttle.random.uniform", return_value=0):
+            self.assertEqual(backoff_delay(0), 0)
+            self.assertEqual(backoff_delay(1, status=429), 1.0)
+            self.assertEqual(backoff_delay(0, status=503, retry_after=7), 7)
+            self.assertEqual(backoff_delay(0, retry_after=3600), 30)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("12"), 12)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
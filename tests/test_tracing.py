@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.refresh import run_scrapers
+from app.scrapers.utils import fetch_concurrently
+from app.tracing import (
+    JsonLinesExporter,
+    OtlpExporter,
+    Tracer,
+    configure_tracing,
+    otlp_payload,
+    span,
+    tracer,
+)
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+    def named(self, name):
+        return [s for s in self.spans if s.name == name]
+
+
+class TestTracing(unittest.TestCase):
+    """Unit tests for spans and their exporters."""
+
+    def setUp(self):
+        self.exporter = ListExporter()
+        tracer.set_exporter(self.exporter)
+        self.addCleanup(tracer.set_exporter, None)
+
+    def test_nested_spans_share_a_trace(self):
+        with span("outer", date="2025-07-15") as outer:
+            with span("inner") as inner:
+                inner.set("status", 200)
+
+        self.assertEqual([s.name for s in self.exporter.spans], ["inner", "outer"])
+        self.assertEqual(inner.trace_id, outer.trace_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(inner.attributes, {"status": 200})
+        self.assertGreaterEqual(outer.duration_ms, inner.duration_ms)
+
+    def test_errors_are_recorded_and_raised(self):
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("bad page")
+
+        self.assertEqual(self.exporter.spans[0].attributes["error"], "ValueError: bad page")
+
+    def test_disabled_tracer_records_nothing(self):
+        disabled = Tracer()
+        with disabled.span("ignored", url="https://example.com") as s:
+            s.set("status", 200)
+        self.assertIs(disabled.span("a"), disabled.span("b"))
+
+    def test_spans_nest_across_scraper_threads_and_loops(self):
+        async def scrape_async():
+            with span("async work"):
+                return []
+
+        def fetch(url):
+            with span("location", url=url):
+                return url
+
+        def scrape_threaded():
+            fetch_concurrently(fetch, ["https://a.example/1", "https://a.example/2"])
+            return []
+
+        with span("scrape_all") as root:
+            run_scrapers([("threaded", scrape_threaded), ("async", scrape_async)])
+
+        scrapers = {s.attributes["scraper"]: s for s in self.exporter.named("scraper")}
+        self.assertEqual({s.parent_id for s in scrapers.values()}, {root.span_id})
+        self.assertEqual(self.exporter.named("async work")[0].parent_id, scrapers["async"].span_id)
+        locations = self.exporter.named("location")
+        self.assertEqual({s.parent_id for s in locations}, {scrapers["threaded"].span_id})
+        self.assertTrue(all(s.trace_id == root.trace_id for s in self.exporter.spans))
+
+    def test_jsonl_exporter_writes_one_span_per_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces", "spans.jsonl")
+            tracer.set_exporter(JsonLinesExporter(path))
+            with span("get_html", url="https://example.com"):
+                with span("parse", step="document"):
+                    pass
+            tracer.set_exporter(None)
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual([r["name"] for r in records], ["parse", "get_html"])
+        self.assertEqual(records[0]["parent_id"], records[1]["span_id"])
+        self.assertEqual(records[1]["attributes"], {"url": "https://example.com"})
+
+    def test_otlp_exporter_posts_batches(self):
+        with patch("app.tracing.requests.post") as post:
+            exporter = OtlpExporter("http://collector:4318/v1/traces", flush_interval=60)
+            tracer.set_exporter(exporter)
+            with span("fetch", attempt=1, cached=False):
+                pass
+            tracer.set_exporter(None)  # Flushes on shutdown
+
+        post.assert_called_once()
+        self.assertEqual(post.call_args.args[0], "http://collector:4318/v1/traces")
+        otlp_span = post.call_args.kwargs["json"]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        self.assertEqual(otlp_span["name"], "fetch")
+        self.assertEqual(otlp_span["status"], {"code": 1})
+        self.assertIn({"key": "attempt", "value": {"intValue": "1"}}, otlp_span["attributes"])
+        self.assertIn({"key": "cached", "value": {"boolValue": False}}, otlp_span["attributes"])
+
+    def test_otlp_payload_marks_errors(self):
+        with self.assertRaises(RuntimeError):
+            with span("browser.launch"):
+                raise RuntimeError("no chrome")
+
+        payload = otlp_payload(self.exporter.spans)
+        otlp_span = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        self.assertEqual(otlp_span["status"], {"code": 2, "message": "RuntimeError: no chrome"})
+        self.assertEqual(otlp_span["parentSpanId"], "")
+
+    def test_configure_tracing(self):
+        configure_tracing({"enabled": False})
+        self.assertIsNone(tracer.exporter)
+        with self.assertRaises(ValueError):
+            configure_tracing({"enabled": True, "exporter": "zipkin"})
+
+
+if __name__ == "__main__":
+    unittest.main()
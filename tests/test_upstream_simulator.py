@@ -0,0 +1,111 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from app.scrapers import kopps
+from app.scrapers.utils import get_html
+from benchmarks.fixture_server import redirect_scrapers
+from benchmarks.load_test import percentiles
+from benchmarks.upstream_simulator import Profile, SimulatedSite, UpstreamSimulator
+
+
+class TestProfile(unittest.TestCase):
+    """Unit tests for simulated site profiles."""
+
+    def test_parse_applies_settings_over_base(self):
+        base = Profile(latency=0.5, error_rate=0.1)
+        profile = Profile.parse("error_rate=1, error_status=403", base=base)
+        self.assertEqual(0.5, profile.latency)
+        self.assertEqual(1.0, profile.error_rate)
+        self.assertEqual(403, profile.error_status)
+
+    def test_parse_rejects_unknown_settings(self):
+        with self.assertRaises(ValueError):
+            Profile.parse("latncy=1")
+        with self.assertRaises(ValueError):
+            Profile(distribution="pareto")
+
+    def test_delay_distributions(self):
+        rng = random.Random(1)
+        self.assertEqual(0.2, Profile(latency=0.2).delay(rng))
+        uniform = [
+            Profile(latency=1, jitter=0.5, distribution="uniform").delay(rng) for _ in range(200)
+        ]
+        self.assertTrue(all(0.5 <= d <= 1.5 for d in uniform))
+        normal = [
+            Profile(latency=0.01, jitter=1, distribution="normal").delay(rng) for _ in range(200)
+        ]
+        self.assertEqual(0.0, min(normal))  # Never negative
+        self.assertEqual(0, Profile(distribution="exponential").delay(rng))
+
+
+class TestSimulatedSite(unittest.TestCase):
+    """Fault injection in the simulated sites."""
+
+    def serve(self, **settings):
+        site = SimulatedSite("kopps", Profile(**settings), seed=1).start()
+        self.addCleanup(site.stop)
+        return site
+
+    def test_healthy_site_serves_fixture(self):
+        site = self.serve()
+        response = requests.get(site.url + "/", timeout=5)
+        self.assertEqual(200, response.status_code)
+        self.assertIn("text/html", response.headers["Content-Type"])
+
+    def test_error_rate(self):
+        site = self.serve(error_rate=1, error_status=403)
+        self.assertEqual(403, requests.get(site.url + "/", timeout=5).status_code)
+        self.assertEqual(1, site.faults["error"])
+
+    def test_rate_limit_answers_429_with_retry_after(self):
+        site = self.serve(rate_limit=0.5, burst=2)
+        statuses = [requests.get(site.url + "/", timeout=5).status_code for _ in range(3)]
+        self.assertEqual([200, 200, 429], statuses)
+        response = requests.get(site.url + "/", timeout=5)
+        self.assertEqual("2", response.headers["Retry-After"])
+
+    def test_truncated_response_breaks_the_read(self):
+        site = self.serve(truncate_rate=1)
+        with self.assertRaises(requests.RequestException):
+            requests.get(site.url + "/", timeout=5)
+        self.assertEqual(1, site.faults["truncated"])
+
+    def test_hang_delays_response(self):
+        site = self.serve(hang_rate=1, hang=2)
+        with self.assertRaises(requests.Timeout):
+            requests.get(site.url + "/", timeout=0.2)
+
+
+class TestScrapersAgainstSimulator(unittest.TestCase):
+    """The app's fetchers against misbehaving sites."""
+
+    def setUp(self):
+        # Skip the backoff delays between retries
+        self.enterContext(patch("app.scrapers.utils._sleep"))
+
+    def test_forbidden_site_gives_up_without_selenium(self):
+        profiles = {"kopps": Profile(error_rate=1, error_status=403)}
+        with UpstreamSimulator(profiles) as upstream, redirect_scrapers(upstream.urls):
+            self.assertIsNone(get_html(kopps.KOPPS_URL, use_selenium_fallback=False))
+            self.assertEqual(3, upstream.stats()["kopps"]["error"])
+            self.assertEqual(3, upstream.stats()["kopps"]["requests"])
+
+    def test_recovers_from_transient_errors(self):
+        profiles = {"kopps": Profile(truncate_rate=0.5)}
+        with UpstreamSimulator(profiles, seed=4) as upstream, redirect_scrapers(upstream.urls):
+            self.assertTrue(kopps.scrape_kopps())
+
+
+class TestPercentiles(unittest.TestCase):
+    def test_nearest_rank(self):
+        result = percentiles(range(1, 101))
+        self.assertEqual({"p50": 50, "p90": 90, "p99": 99, "max": 100}, result)
+        self.assertEqual({"p50": 7, "p90": 7, "p99": 7, "max": 7}, percentiles([7]))
+        self.assertEqual({}, percentiles([]))
+
+
+if __name__ == "__main__":
+    unittest.main()